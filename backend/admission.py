@@ -0,0 +1,160 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+import orjson
+
+import metrics
+
+# Admission control: at most `max_concurrency` requests run at once and up to
+# `max_queue` wait for a slot, best priority first. When the queue is full a
+# better-priority request evicts the worst waiter; otherwise the newcomer is
+# turned away with 503 and Retry-After right away, so a spike costs a fast
+# rejection instead of a slow timeout for everyone.
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+PRIORITY_NAMES = {PRIORITY_HIGH: "high", PRIORITY_NORMAL: "normal", PRIORITY_LOW: "low"}
+
+# Probes and scrapes must answer while the app is shedding load
+EXEMPT_PATHS = frozenset({"/metrics", "/health/live", "/health/ready"})
+
+def request_priority(scope) -> int:
+    if scope["method"] in ("GET", "HEAD"):
+        # Conditional requests mostly end as a 304 from a single aggregate query
+        headers = dict(scope["headers"])
+        if scope["path"] == "/" or b"if-none-match" in headers or b"if-modified-since" in headers:
+            return PRIORITY_HIGH
+        return PRIORITY_NORMAL
+    return PRIORITY_LOW
+
+class Rejected(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+class AdmissionController:
+    def __init__(self, max_concurrency: int, max_queue: int, queue_timeout: float):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.rejected = {name: 0 for name in PRIORITY_NAMES.values()}
+        # (priority, arrival, future); resolved futures are skipped when popped
+        self._waiters = []
+        self._arrivals = itertools.count()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _reject(self, priority: int, reason: str):
+        self.rejected[PRIORITY_NAMES[priority]] += 1
+        metrics.ADMISSION_REJECTED.labels(PRIORITY_NAMES[priority], reason).inc()
+        raise Rejected(reason)
+
+    def _evict_worst(self, priority: int) -> bool:
+        # Turns away the lowest-priority, latest waiter if it ranks below `priority`
+        live = [waiter for waiter in self._waiters if not waiter[2].done()]
+        if not live:
+            return False
+        worst = max(live, key=lambda waiter: (waiter[0], waiter[1]))
+        if worst[0] <= priority:
+            return False
+        worst[2].set_result(False)
+        return True
+
+    async def acquire(self, priority: int):
+        if self.in_flight < self.max_concurrency and not self.queued:
+            self.in_flight += 1
+            return
+        if self.queued >= self.max_queue and not self._evict_worst(priority):
+            self._reject(priority, "queue_full")
+
+        # Resolved by release() with True (slot handed over) or by an eviction with False
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._arrivals), future))
+        self._update_gauges()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait((future,), timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # The client went away while queued; pass the slot on if it was already granted
+            if future.done() and future.result():
+                self.release()
+            future.cancel()
+            raise
+        finally:
+            metrics.ADMISSION_QUEUE_WAIT.labels(PRIORITY_NAMES[priority]).observe(time.perf_counter() - started)
+            self._update_gauges()
+
+        if not future.done():
+            future.cancel()
+            self._reject(priority, "timeout")
+        if not future.result():
+            self._reject(priority, "evicted")
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                # The slot passes straight to the waiter, so in_flight stays the same
+                future.set_result(True)
+                self._update_gauges()
+                return
+        self.in_flight -= 1
+        self._update_gauges()
+
+    def _update_gauges(self):
+        metrics.ADMISSION_IN_FLIGHT.set(self.in_flight)
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                depth[PRIORITY_NAMES[priority]] += 1
+        for name, count in depth.items():
+            metrics.ADMISSION_QUEUE_DEPTH.labels(name).set(count)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "rejected": dict(self.rejected),
+        }
+
+class AdmissionControlMiddleware:
+    def __init__(self, app, controller: AdmissionController, retry_after: int = 1):
+        self.app = app
+        self.controller = controller
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await self.controller.acquire(request_priority(scope))
+        except Rejected:
+            await self._overloaded(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release()
+
+    async def _overloaded(self, send):
+        body = orjson.dumps({"detail": "Server is overloaded, retry later"})
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(self.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -14,13 +14,13 @@ load_dotenv()
 
 # Import your models
 from models.workout import Base
+from database import get_database_urls
 
 # this is the Alembic Config object
 config = context.config
 
-# Set the database URL in the alembic.ini file
-config.set_main_option('sqlalchemy.url', 
-    f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}")
+# Use the same database as the app (SQLite locally/in tests, PostgreSQL otherwise)
+config.set_main_option('sqlalchemy.url', get_database_urls()[0].replace('%', '%%'))
 
 # Interpret the config file for Python logging
 if config.config_file_name is not None:
@@ -52,7 +52,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite"
         )
 
         with context.begin_transaction():
@@ -0,0 +1,151 @@
+"""baseline schema
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_baseline'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('email', sa.String(), nullable=True),
+        sa.Column('hashed_password', sa.String(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('is_superuser', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+    op.create_index('ix_users_id', 'users', ['id'], unique=False)
+
+    op.create_table(
+        'workouts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('scheduled_date', sa.DateTime(), nullable=True),
+        sa.Column('is_completed', sa.Boolean(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_workouts_id', 'workouts', ['id'], unique=False)
+    op.create_index('ix_workouts_name', 'workouts', ['name'], unique=False)
+
+    op.create_table(
+        'muscle_groups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('workout_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['workout_id'], ['workouts.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_muscle_groups_id', 'muscle_groups', ['id'], unique=False)
+    # Not unique: every workout has its own muscle groups, so names repeat across workouts
+    op.create_index('ix_muscle_groups_name', 'muscle_groups', ['name'], unique=False)
+
+    op.create_table(
+        'exercises',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('description', sa.String(), nullable=True),
+        sa.Column('muscle_group_id', sa.Integer(), nullable=True),
+        sa.Column('sets', sa.Integer(), nullable=True),
+        sa.Column('reps', sa.Integer(), nullable=True),
+        sa.Column('current_weight', sa.Float(), nullable=True),
+        sa.Column('last_weight', sa.Float(), nullable=True),
+        sa.Column('record_weight', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['muscle_group_id'], ['muscle_groups.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_exercises_id', 'exercises', ['id'], unique=False)
+    op.create_index('ix_exercises_name', 'exercises', ['name'], unique=False)
+
+    op.create_table(
+        'weight_history',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=True),
+        sa.Column('weight', sa.Float(), nullable=True),
+        sa.Column('date', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_weight_history_id', 'weight_history', ['id'], unique=False)
+
+    op.create_table(
+        'exercise_progress',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=True),
+        sa.Column('weight', sa.Integer(), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_exercise_progress_id', 'exercise_progress', ['id'], unique=False)
+
+    op.create_table(
+        'workout_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('total_workouts', sa.Integer(), nullable=False),
+        sa.Column('completed_workouts', sa.Integer(), nullable=False),
+        sa.Column('week_start', sa.Date(), nullable=False),
+        sa.Column('this_week', sa.Integer(), nullable=False),
+        sa.Column('month_start', sa.Date(), nullable=False),
+        sa.Column('this_month', sa.Integer(), nullable=False),
+        sa.Column('most_frequent_exercise', sa.String(), nullable=True),
+        sa.Column('personal_bests', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    op.create_table(
+        'exercise_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_name', sa.String(), nullable=False),
+        sa.Column('exercise_count', sa.Integer(), nullable=False),
+        sa.Column('record_weight', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id', 'exercise_name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('exercise_stats')
+    op.drop_table('workout_stats')
+    op.drop_index('ix_exercise_progress_id', table_name='exercise_progress')
+    op.drop_table('exercise_progress')
+    op.drop_index('ix_weight_history_id', table_name='weight_history')
+    op.drop_table('weight_history')
+    op.drop_index('ix_exercises_name', table_name='exercises')
+    op.drop_index('ix_exercises_id', table_name='exercises')
+    op.drop_table('exercises')
+    op.drop_index('ix_muscle_groups_name', table_name='muscle_groups')
+    op.drop_index('ix_muscle_groups_id', table_name='muscle_groups')
+    op.drop_table('muscle_groups')
+    op.drop_index('ix_workouts_name', table_name='workouts')
+    op.drop_index('ix_workouts_id', table_name='workouts')
+    op.drop_table('workouts')
+    op.drop_index('ix_users_id', table_name='users')
+    op.drop_index('ix_users_email', table_name='users')
+    op.drop_table('users')
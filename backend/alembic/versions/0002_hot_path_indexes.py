@@ -0,0 +1,50 @@
+"""hot path composite indexes
+
+Revision ID: 0002_hot_path_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_hot_path_indexes'
+down_revision: Union[str, None] = '0001_baseline'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_weight_history_exercise_id_date', 'weight_history', ['exercise_id', 'date']),
+    ('ix_exercise_progress_exercise_id_date', 'exercise_progress', ['exercise_id', 'date']),
+    ('ix_workouts_user_id_created_at', 'workouts', ['user_id', 'created_at']),
+    ('ix_workouts_user_id_scheduled_date', 'workouts', ['user_id', 'scheduled_date']),
+    ('ix_muscle_groups_workout_id', 'muscle_groups', ['workout_id']),
+    ('ix_exercises_muscle_group_id', 'exercises', ['muscle_group_id']),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block, so on
+    # Postgres these are built outside the migration transaction without
+    # locking writes. SQLite has no concurrent builds and takes the plain path.
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+    else:
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name, table, _ in reversed(INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+    else:
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,54 @@
+"""workout recurrence rules
+
+Revision ID: 0003_workout_recurrence
+Revises: 0002_hot_path_indexes
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_workout_recurrence'
+down_revision: Union[str, None] = '0002_hot_path_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RECURRING = sa.text('recurrence_rule IS NOT NULL')
+
+
+def upgrade() -> None:
+    # Nullable columns without defaults are a catalog-only change on Postgres
+    with op.batch_alter_table('workouts') as batch_op:
+        batch_op.add_column(sa.Column('recurrence_rule', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('recurrence_until', sa.DateTime(), nullable=True))
+
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_workouts_user_id_recurring', 'workouts', ['user_id'],
+                postgresql_where=RECURRING, postgresql_concurrently=True, if_not_exists=True
+            )
+    else:
+        op.create_index(
+            'ix_workouts_user_id_recurring', 'workouts', ['user_id'],
+            sqlite_where=RECURRING, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                'ix_workouts_user_id_recurring', table_name='workouts',
+                postgresql_concurrently=True, if_exists=True
+            )
+    else:
+        op.drop_index('ix_workouts_user_id_recurring', table_name='workouts', if_exists=True)
+
+    with op.batch_alter_table('workouts') as batch_op:
+        batch_op.drop_column('recurrence_until')
+        batch_op.drop_column('recurrence_rule')
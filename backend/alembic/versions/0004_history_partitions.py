@@ -0,0 +1,130 @@
+"""monthly history partitions and progress archive
+
+Revision ID: 0004_history_partitions
+Revises: 0003_workout_recurrence
+Create Date: 2026-10-18 16:00:00.000000
+
+On PostgreSQL this rewrites exercise_progress and weight_history into tables
+range-partitioned by month, which copies every row and holds an exclusive lock
+on both tables for the duration: run it in a maintenance window. SQLite keeps
+single tables; only the archive table is added there.
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_history_partitions'
+down_revision: Union[str, None] = '0003_workout_recurrence'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+# Rows without a date need one to be routed to a partition
+PARTITIONED_TABLES = {
+    'exercise_progress': 'now()',
+    'weight_history': 'COALESCE(created_at, now())',
+}
+
+
+def _add_months(month: datetime, months: int) -> datetime:
+    index = month.month - 1 + months
+    return month.replace(year=month.year + index // 12, month=index % 12 + 1)
+
+
+def _restore_table_objects(table: str) -> None:
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id')
+    op.create_foreign_key(f'{table}_exercise_id_fkey', table, 'exercises', ['exercise_id'], ['id'])
+    op.create_index(f'ix_{table}_id', table, ['id'])
+    op.create_index(f'ix_{table}_exercise_id_date', table, ['exercise_id', 'date'])
+
+
+def _partition_table(table: str, fallback_date: str) -> None:
+    old = f'{table}_unpartitioned'
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'UPDATE {old} SET date = {fallback_date} WHERE date IS NULL')
+    op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS) PARTITION BY RANGE (date)')
+    op.execute(f'ALTER TABLE {table} ALTER COLUMN date SET NOT NULL')
+
+    oldest = op.get_bind().execute(sa.text(f'SELECT min(date) FROM {old}')).scalar()
+    now = datetime.utcnow()
+    month = (oldest or now).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last = _add_months(now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_add_months(month, 1):%Y-%m-%d}')"
+        )
+        month = _add_months(month, 1)
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    # The id sequence belongs to the old table; detach it so it survives the drop
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY NONE')
+    op.execute(f'DROP TABLE {old}')
+    # The partition key has to be part of the primary key
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id, date)')
+    _restore_table_objects(table)
+
+
+def _unpartition_table(table: str) -> None:
+    old = f'{table}_partitioned'
+    op.execute(f'ALTER TABLE {table} RENAME TO {old}')
+    op.execute(f'CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS)')
+    op.execute(f'ALTER TABLE {table} ALTER COLUMN date DROP NOT NULL')
+    op.execute(f'INSERT INTO {table} SELECT * FROM {old}')
+    op.execute(f'ALTER SEQUENCE {table}_id_seq OWNED BY NONE')
+    op.execute(f'DROP TABLE {old}')
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)')
+    _restore_table_objects(table)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'exercise_progress_archive',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.DateTime(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('max_entry_id', sa.Integer(), nullable=False),
+        sa.Column('entries', sa.JSON(), nullable=False),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('exercise_id', 'month', name='uq_exercise_progress_archive_exercise_id_month')
+    )
+
+    if op.get_context().dialect.name == 'postgresql':
+        for table, fallback_date in PARTITIONED_TABLES.items():
+            _partition_table(table, fallback_date)
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        for table in PARTITIONED_TABLES:
+            _unpartition_table(table)
+
+    # Put archived entries back before the archive goes away
+    bind = op.get_bind()
+    archive = sa.table(
+        'exercise_progress_archive',
+        sa.column('exercise_id', sa.Integer()),
+        sa.column('entries', sa.JSON())
+    )
+    progress = sa.table(
+        'exercise_progress',
+        sa.column('id', sa.Integer()),
+        sa.column('exercise_id', sa.Integer()),
+        sa.column('weight', sa.Integer()),
+        sa.column('date', sa.DateTime())
+    )
+    rows = [
+        {'id': entry_id, 'exercise_id': exercise_id, 'weight': weight, 'date': datetime.fromisoformat(date)}
+        for exercise_id, entries in bind.execute(sa.select(archive.c.exercise_id, archive.c.entries))
+        for entry_id, date, weight in entries
+    ]
+    if rows:
+        bind.execute(sa.insert(progress), rows)
+    op.drop_table('exercise_progress_archive')
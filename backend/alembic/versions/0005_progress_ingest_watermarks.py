@@ -0,0 +1,32 @@
+"""write-behind progress ingest watermarks
+
+Revision ID: 0005_progress_ingest_watermarks
+Revises: 0004_history_partitions
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_progress_ingest_watermarks'
+down_revision: Union[str, None] = '0004_history_partitions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'progress_ingest_watermarks',
+        sa.Column('journal_id', sa.String(), nullable=False),
+        sa.Column('last_seq', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('journal_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('progress_ingest_watermarks')
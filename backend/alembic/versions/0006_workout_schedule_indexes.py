@@ -0,0 +1,51 @@
+"""workout schedule indexes
+
+Revision ID: 0006_workout_schedule_indexes
+Revises: 0005_progress_ingest_watermarks
+Create Date: 2026-10-19 10:00:00.000000
+
+The calendar range query in routes/workouts.py filters on scheduled_date
+alone; the (user_id, ...) indexes from 0002/0003 only serve the api/ package.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_workout_schedule_indexes'
+down_revision: Union[str, None] = '0005_progress_ingest_watermarks'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+RECURRING = sa.text('recurrence_rule IS NOT NULL')
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.create_index(
+                'ix_workouts_scheduled_date', 'workouts', ['scheduled_date'],
+                postgresql_concurrently=True, if_not_exists=True
+            )
+            op.create_index(
+                'ix_workouts_recurring_scheduled_date', 'workouts', ['scheduled_date'],
+                postgresql_where=RECURRING, postgresql_concurrently=True, if_not_exists=True
+            )
+    else:
+        op.create_index('ix_workouts_scheduled_date', 'workouts', ['scheduled_date'], if_not_exists=True)
+        op.create_index(
+            'ix_workouts_recurring_scheduled_date', 'workouts', ['scheduled_date'],
+            sqlite_where=RECURRING, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            for name in ('ix_workouts_recurring_scheduled_date', 'ix_workouts_scheduled_date'):
+                op.drop_index(name, table_name='workouts', postgresql_concurrently=True, if_exists=True)
+    else:
+        for name in ('ix_workouts_recurring_scheduled_date', 'ix_workouts_scheduled_date'):
+            op.drop_index(name, table_name='workouts', if_exists=True)
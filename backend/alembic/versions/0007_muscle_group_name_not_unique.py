@@ -0,0 +1,31 @@
+"""muscle group names not unique
+
+Revision ID: 0007_muscle_group_name_not_unique
+Revises: 0006_workout_schedule_indexes
+Create Date: 2026-10-20 09:00:00.000000
+
+Databases that predate the chain were created by create_all from models that
+declared ix_muscle_groups_name unique, and stamping them onto 0001_baseline
+kept that index. Every workout has its own muscle groups, so the names repeat;
+rebuild the index as a plain one.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_muscle_group_name_not_unique'
+down_revision: Union[str, None] = '0006_workout_schedule_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index('ix_muscle_groups_name', table_name='muscle_groups', if_exists=True)
+    op.create_index('ix_muscle_groups_name', 'muscle_groups', ['name'], unique=False)
+
+
+def downgrade() -> None:
+    # 0001_baseline already creates the index non-unique; nothing to restore
+    pass
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -9,7 +9,7 @@ class Exercise(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     description = Column(String)
-    muscle_group_id = Column(Integer, ForeignKey("muscle_groups.id"))
+    muscle_group_id = Column(Integer, ForeignKey("muscle_groups.id"), index=True)
     sets = Column(Integer, default=3)
     reps = Column(Integer, default=10)
     current_weight = Column(Float, default=0)
@@ -24,6 +24,9 @@ class Exercise(Base):
 
 class WeightHistory(Base):
     __tablename__ = "weight_history"
+    __table_args__ = (
+        Index("ix_weight_history_exercise_id_date", "exercise_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     exercise_id = Column(Integer, ForeignKey("exercises.id"))
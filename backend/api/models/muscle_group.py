@@ -8,7 +8,7 @@ class MuscleGroup(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
     description = Column(String)
-    workout_id = Column(Integer, ForeignKey("workouts.id"))
+    workout_id = Column(Integer, ForeignKey("workouts.id"), index=True)
 
     # Relationships
     workout = relationship("Workout", back_populates="muscle_groups")
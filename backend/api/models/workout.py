@@ -1,10 +1,20 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Boolean, Index, text
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
 
 class Workout(Base):
     __tablename__ = "workouts"
+    __table_args__ = (
+        Index("ix_workouts_user_id_created_at", "user_id", "created_at"),
+        Index("ix_workouts_user_id_scheduled_date", "user_id", "scheduled_date"),
+        # Recurring series are few per user; the calendar reads them all from this partial index
+        Index(
+            "ix_workouts_user_id_recurring", "user_id",
+            postgresql_where=text("recurrence_rule IS NOT NULL"),
+            sqlite_where=text("recurrence_rule IS NOT NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
@@ -18,6 +28,11 @@ class Workout(Base):
     is_completed = Column(Boolean, default=False)
     completed_at = Column(DateTime, nullable=True)
 
+    # Recurring workouts: a recurrence rule anchored at scheduled_date, expanded per
+    # requested window. recurrence_until is the last occurrence (NULL when open-ended)
+    recurrence_rule = Column(String, nullable=True)
+    recurrence_until = Column(DateTime, nullable=True)
+
     # Relationships
     user = relationship("User", back_populates="workouts")
     muscle_groups = relationship("MuscleGroup", back_populates="workout", cascade="all, delete-orphan")
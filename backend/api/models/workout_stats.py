@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Date, Float, JSON
+from database import Base
+from datetime import datetime
+
+class WorkoutStatsSummary(Base):
+    __tablename__ = "workout_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_workouts = Column(Integer, default=0, nullable=False)
+    completed_workouts = Column(Integer, default=0, nullable=False)
+    week_start = Column(Date, nullable=False)
+    this_week = Column(Integer, default=0, nullable=False)
+    month_start = Column(Date, nullable=False)
+    this_month = Column(Integer, default=0, nullable=False)
+    most_frequent_exercise = Column(String, nullable=True)
+    personal_bests = Column(JSON, default=list, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ExerciseStatsSummary(Base):
+    __tablename__ = "exercise_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    exercise_name = Column(String, primary_key=True)
+    exercise_count = Column(Integer, default=0, nullable=False)
+    record_weight = Column(Float, default=0, nullable=False)
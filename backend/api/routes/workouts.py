@@ -1,17 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import datetime, timedelta
-from typing import List
+from sqlalchemy import func, insert, or_, select, union_all, update
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+import json
+import recurrence
+from http_cache import make_etag, not_modified_response, set_validators
 from ..database import get_db
 from ..models.workout import Workout
+from ..models.muscle_group import MuscleGroup
 from ..models.exercise import Exercise, WeightHistory
+from ..services.workout_stats import (
+    get_user_stats,
+    period_starts,
+    record_workout_created,
+    record_workout_completed,
+    record_workout_deleted,
+    refresh_exercise_stats
+)
 from ..schemas.workout import WorkoutCreate, Workout as WorkoutSchema, WorkoutStats, ScheduledWorkout
 from ..schemas.exercise import WeightHistory as WeightHistorySchema
 from ..dependencies.auth import get_current_user
 
 router = APIRouter()
 
+HISTORY_STREAM_BATCH_SIZE = 1000
+MAX_BATCH_PROGRESS = 200
+MAX_SCHEDULE_WINDOW_DAYS = 366
+
+def _recurrence_until(workout: WorkoutCreate) -> Optional[datetime]:
+    # Stored so the calendar query can skip series that ended before the window
+    if workout.recurrence_rule is None:
+        return None
+    if workout.scheduled_date is None:
+        raise HTTPException(status_code=422, detail="A recurring workout needs a scheduled_date")
+    return recurrence.last_occurrence(recurrence.parse_rule(workout.recurrence_rule), workout.scheduled_date)
+
+def _workout_validators(db: Session, user_id: int, workout_id: Optional[int] = None):
+    # Cheap aggregates over the rows a workout tree is built from; exercises and
+    # weight history change without touching the workout row itself
+    workout_filter = [Workout.user_id == user_id]
+    if workout_id is not None:
+        workout_filter.append(Workout.id == workout_id)
+
+    count, workouts_updated_at = db.query(
+        func.count(Workout.id),
+        func.max(Workout.updated_at)
+    ).filter(*workout_filter).one()
+
+    exercise_ids = select(Exercise.id).join(
+        MuscleGroup, Exercise.muscle_group_id == MuscleGroup.id
+    ).join(
+        Workout, MuscleGroup.workout_id == Workout.id
+    ).filter(*workout_filter)
+    exercises_updated_at, exercise_count = db.query(
+        func.max(Exercise.updated_at),
+        func.count(Exercise.id)
+    ).filter(Exercise.id.in_(exercise_ids)).one()
+    history_id, history_created_at = db.query(
+        func.max(WeightHistory.id),
+        func.max(WeightHistory.created_at)
+    ).filter(WeightHistory.exercise_id.in_(exercise_ids)).one()
+
+    etag = make_etag("workouts", user_id, workout_id, count, workouts_updated_at,
+                     exercise_count, exercises_updated_at, history_id)
+    last_modified = max(
+        filter(None, (workouts_updated_at, exercises_updated_at, history_created_at)),
+        default=None
+    )
+    return etag, last_modified
+
 @router.post("/workouts/", response_model=WorkoutSchema)
 def create_workout(
     workout: WorkoutCreate,
@@ -20,33 +79,142 @@ def create_workout(
 ):
     db_workout = Workout(
         **workout.dict(),
-        user_id=current_user.id
+        user_id=current_user.id,
+        recurrence_until=_recurrence_until(workout)
     )
     db.add(db_workout)
+    db.flush()
+    exercise_names = [exercise.name for muscle_group in db_workout.muscle_groups for exercise in muscle_group.exercises]
+    record_workout_created(db, db_workout, exercise_names)
     db.commit()
     db.refresh(db_workout)
     return db_workout
 
 @router.get("/workouts/", response_model=List[WorkoutSchema])
 def get_workouts(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
+    etag, last_modified = _workout_validators(db, current_user.id)
+    cached = not_modified_response(request, etag, last_modified)
+    if cached:
+        return cached
+
     workouts = db.query(Workout).filter(Workout.user_id == current_user.id).all()
+    set_validators(response, etag, last_modified)
     return workouts
 
+def _naive_utc(value: datetime) -> datetime:
+    # Stored datetimes are naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _schedule_window(date_from: Optional[datetime], date_to: Optional[datetime]):
+    # Missing bounds default to the calendar month around the other bound (or now)
+    if date_from is None:
+        anchor = date_to - timedelta(microseconds=1) if date_to else datetime.utcnow()
+        date_from = anchor.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if date_to is None:
+        date_to = (date_from.replace(day=1) + timedelta(days=32)).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+    return date_from, date_to
+
+@router.get("/workouts/scheduled", response_model=List[ScheduledWorkout])
+def get_scheduled_workouts(
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    date_from, date_to = _schedule_window(
+        _naive_utc(date_from) if date_from else None,
+        _naive_utc(date_to) if date_to else None
+    )
+    if date_to <= date_from:
+        raise HTTPException(status_code=422, detail="`to` must be after `from`")
+    if date_to - date_from > timedelta(days=MAX_SCHEDULE_WINDOW_DAYS):
+        raise HTTPException(status_code=422, detail=f"Windows are limited to {MAX_SCHEDULE_WINDOW_DAYS} days")
+
+    # One statement: a range scan on (user_id, scheduled_date) for one-off
+    # workouts plus the user's recurring series from the partial index
+    columns = (Workout.id, Workout.name, Workout.scheduled_date, Workout.is_completed, Workout.recurrence_rule)
+    one_off = select(*columns).filter(
+        Workout.user_id == current_user.id,
+        Workout.scheduled_date >= date_from,
+        Workout.scheduled_date < date_to,
+        Workout.recurrence_rule.is_(None)
+    )
+    series = select(*columns).filter(
+        Workout.user_id == current_user.id,
+        Workout.recurrence_rule.isnot(None),
+        Workout.scheduled_date < date_to,
+        or_(Workout.recurrence_until.is_(None), Workout.recurrence_until >= date_from)
+    )
+
+    scheduled = []
+    for row in db.execute(union_all(one_off, series)):
+        if row.recurrence_rule is None:
+            scheduled.append({
+                "id": row.id, "name": row.name,
+                "scheduled_date": row.scheduled_date, "is_completed": row.is_completed
+            })
+            continue
+        # Occurrences exist only for the requested window; none are stored
+        rule = recurrence.parse_rule(row.recurrence_rule)
+        for occurrence in recurrence.occurrences(rule, row.scheduled_date, date_from, date_to):
+            scheduled.append({
+                "id": row.id, "name": row.name, "scheduled_date": occurrence,
+                "is_completed": False, "is_recurring": True
+            })
+
+    scheduled.sort(key=lambda workout: (workout["scheduled_date"], workout["id"]))
+    return scheduled
+
+# Registered ahead of /workouts/{workout_id}, which would otherwise match "stats"
+@router.get("/workouts/stats", response_model=WorkoutStats)
+def get_workout_stats(
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    # Single primary-key lookup; the summary is maintained by the write endpoints
+    stats = get_user_stats(db, current_user.id)
+
+    # Counters from a previous week/month have not been rolled over yet
+    week_start, month_start = period_starts()
+
+    return WorkoutStats(
+        total_workouts=stats.total_workouts,
+        this_week=stats.this_week if stats.week_start == week_start else 0,
+        this_month=stats.this_month if stats.month_start == month_start else 0,
+        completed_workouts=stats.completed_workouts,
+        most_frequent_exercise=stats.most_frequent_exercise or "No exercises yet",
+        personal_bests=stats.personal_bests
+    )
+
 @router.get("/workouts/{workout_id}", response_model=WorkoutSchema)
 def get_workout(
     workout_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
+    etag, last_modified = _workout_validators(db, current_user.id, workout_id)
+    cached = not_modified_response(request, etag, last_modified)
+    if cached:
+        return cached
+
     workout = db.query(Workout).filter(
         Workout.id == workout_id,
         Workout.user_id == current_user.id
     ).first()
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
+    set_validators(response, etag, last_modified)
     return workout
 
 @router.put("/workouts/{workout_id}", response_model=WorkoutSchema)
@@ -65,6 +233,7 @@ def update_workout(
     
     for key, value in workout.dict().items():
         setattr(db_workout, key, value)
+    db_workout.recurrence_until = _recurrence_until(workout)
     
     db.commit()
     db.refresh(db_workout)
@@ -83,7 +252,14 @@ def delete_workout(
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
     
+    exercise_names = [
+        exercise.name
+        for muscle_group in workout.muscle_groups
+        for exercise in muscle_group.exercises
+    ]
     db.delete(workout)
+    db.flush()
+    record_workout_deleted(db, workout, exercise_names)
     db.commit()
     return {"message": "Workout deleted successfully"}
 
@@ -100,60 +276,14 @@ def complete_workout(
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
     
+    was_completed = workout.is_completed
     workout.complete()
+    db.flush()
+    record_workout_completed(db, workout, was_completed)
     db.commit()
     db.refresh(workout)
     return workout
 
-@router.get("/workouts/stats", response_model=WorkoutStats)
-def get_workout_stats(
-    db: Session = Depends(get_db),
-    current_user = Depends(get_current_user)
-):
-    # Get total workouts
-    total_workouts = db.query(func.count(Workout.id)).filter(
-        Workout.user_id == current_user.id
-    ).scalar()
-
-    # Get workouts this week
-    week_start = datetime.utcnow() - timedelta(days=datetime.utcnow().weekday())
-    this_week = db.query(func.count(Workout.id)).filter(
-        Workout.user_id == current_user.id,
-        Workout.created_at >= week_start
-    ).scalar()
-
-    # Get workouts this month
-    month_start = datetime.utcnow().replace(day=1)
-    this_month = db.query(func.count(Workout.id)).filter(
-        Workout.user_id == current_user.id,
-        Workout.created_at >= month_start
-    ).scalar()
-
-    # Get most frequent exercise
-    most_frequent = db.query(
-        Exercise.name,
-        func.count(Exercise.id).label('count')
-    ).join(Workout).filter(
-        Workout.user_id == current_user.id
-    ).group_by(Exercise.name).order_by('count DESC').first()
-
-    # Get personal bests
-    personal_bests = db.query(
-        Exercise.name,
-        func.max(Exercise.record_weight).label('max_weight')
-    ).join(Workout).filter(
-        Workout.user_id == current_user.id,
-        Exercise.record_weight > 0
-    ).group_by(Exercise.name).all()
-
-    return WorkoutStats(
-        total_workouts=total_workouts,
-        this_week=this_week,
-        this_month=this_month,
-        most_frequent_exercise=most_frequent[0] if most_frequent else "No exercises yet",
-        personal_bests=[{"exercise": name, "weight": weight} for name, weight in personal_bests]
-    )
-
 @router.post("/exercises/{exercise_id}/history", response_model=WeightHistorySchema)
 def add_weight_history(
     exercise_id: int,
@@ -184,6 +314,8 @@ def add_weight_history(
 @router.get("/exercises/{exercise_id}/history", response_model=List[WeightHistorySchema])
 def get_weight_history(
     exercise_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -196,9 +328,68 @@ def get_weight_history(
     if not exercise:
         raise HTTPException(status_code=404, detail="Exercise not found")
 
-    return db.query(WeightHistory).filter(
+    # Weight history is append-only, so count + newest row identify the list
+    count, max_id, last_modified = db.query(
+        func.count(WeightHistory.id),
+        func.max(WeightHistory.id),
+        func.max(WeightHistory.created_at)
+    ).filter(WeightHistory.exercise_id == exercise_id).one()
+    etag = make_etag("weight-history", exercise_id, count, max_id)
+    cached = not_modified_response(request, etag, last_modified)
+    if cached:
+        return cached
+
+    history = db.query(WeightHistory).filter(
         WeightHistory.exercise_id == exercise_id
     ).order_by(WeightHistory.date.desc()).all()
+    set_validators(response, etag, last_modified)
+    return history
+
+@router.get("/exercises/{exercise_id}/history/stream")
+def stream_weight_history(
+    exercise_id: int,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    # Verify exercise belongs to user
+    exercise = db.query(Exercise.id).join(Workout).filter(
+        Exercise.id == exercise_id,
+        Workout.user_id == current_user.id
+    ).first()
+
+    if not exercise:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+
+    def generate():
+        # get_db has already exited by the time this runs; the stream owns the session
+        try:
+            result = db.execute(
+                select(
+                    WeightHistory.id,
+                    WeightHistory.exercise_id,
+                    WeightHistory.weight,
+                    WeightHistory.date,
+                    WeightHistory.created_at
+                )
+                .filter(WeightHistory.exercise_id == exercise_id)
+                .order_by(WeightHistory.date.desc())
+                .execution_options(yield_per=HISTORY_STREAM_BATCH_SIZE)
+            )
+            for rows in result.partitions():
+                yield "".join(
+                    json.dumps({
+                        "id": row.id,
+                        "exercise_id": row.exercise_id,
+                        "weight": row.weight,
+                        "date": row.date.isoformat() if row.date else None,
+                        "created_at": row.created_at.isoformat() if row.created_at else None
+                    }) + "\n"
+                    for row in rows
+                )
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 @router.put("/workouts/{workout_id}/exercises/{exercise_id}/progress")
 def update_exercise_progress(
@@ -222,6 +413,8 @@ def update_exercise_progress(
     exercise.current_weight = progress_data.get('current_weight', exercise.current_weight)
     exercise.last_weight = progress_data.get('last_weight', exercise.last_weight)
     exercise.record_weight = progress_data.get('record_weight', exercise.record_weight)
+    db.flush()
+    refresh_exercise_stats(db, current_user.id, [exercise.name])
 
     # Add to weight history
     weight_history = WeightHistory(
@@ -233,4 +426,70 @@ def update_exercise_progress(
     db.add(weight_history)
     db.commit()
     db.refresh(exercise)
-    return exercise 
\ No newline at end of file
+    return exercise 
+
+@router.put("/workouts/{workout_id}/progress")
+def update_workout_progress(
+    workout_id: int,
+    progress_entries: List[dict],
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_user)
+):
+    if len(progress_entries) > MAX_BATCH_PROGRESS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Cannot log more than {MAX_BATCH_PROGRESS} entries per request"
+        )
+    if any(not isinstance(entry.get('exercise_id'), int) for entry in progress_entries):
+        raise HTTPException(status_code=422, detail="Every entry needs an exercise_id")
+    if not progress_entries:
+        return {"message": "Progress updated successfully", "updated": 0}
+
+    # Verify all exercises belong to the user's workout in one query
+    exercise_ids = {entry['exercise_id'] for entry in progress_entries}
+    exercises = {
+        row.id: {
+            "id": row.id,
+            "name": row.name,
+            "current_weight": row.current_weight,
+            "last_weight": row.last_weight,
+            "record_weight": row.record_weight
+        }
+        for row in db.query(
+            Exercise.id, Exercise.name, Exercise.current_weight, Exercise.last_weight, Exercise.record_weight
+        ).join(
+            MuscleGroup, Exercise.muscle_group_id == MuscleGroup.id
+        ).join(
+            Workout, MuscleGroup.workout_id == Workout.id
+        ).filter(
+            Exercise.id.in_(exercise_ids),
+            Workout.id == workout_id,
+            Workout.user_id == current_user.id
+        )
+    }
+    missing = sorted(exercise_ids - exercises.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Exercises not found: {missing}")
+
+    # Same rules as update_exercise_progress, applied in order
+    now = datetime.utcnow()
+    history_rows = []
+    for entry in progress_entries:
+        exercise = exercises[entry['exercise_id']]
+        for key in ('current_weight', 'last_weight', 'record_weight'):
+            exercise[key] = entry.get(key, exercise[key])
+        history_rows.append({
+            "exercise_id": exercise["id"],
+            "weight": exercise["current_weight"],
+            "date": now,
+            "created_at": now
+        })
+
+    db.execute(update(Exercise), [
+        {key: value for key, value in exercise.items() if key != "name"}
+        for exercise in exercises.values()
+    ])
+    db.execute(insert(WeightHistory), history_rows)
+    refresh_exercise_stats(db, current_user.id, [exercise["name"] for exercise in exercises.values()])
+    db.commit()
+    return {"message": "Progress updated successfully", "updated": len(exercises)}
@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
 from typing import List, Optional
+import recurrence
 
 class WeightHistoryBase(BaseModel):
     weight: float
@@ -52,6 +53,14 @@ class WorkoutBase(BaseModel):
     name: str
     description: Optional[str] = None
     scheduled_date: Optional[datetime] = None
+    recurrence_rule: Optional[str] = None
+
+    @field_validator("recurrence_rule")
+    @classmethod
+    def check_recurrence_rule(cls, value):
+        if value is not None:
+            recurrence.parse_rule(value)
+        return value
 
 class WorkoutCreate(WorkoutBase):
     pass
@@ -72,6 +81,7 @@ class WorkoutStats(BaseModel):
     total_workouts: int
     this_week: int
     this_month: int
+    completed_workouts: int = 0
     most_frequent_exercise: str
     personal_bests: List[dict]
 
@@ -80,6 +90,7 @@ class ScheduledWorkout(BaseModel):
     name: str
     scheduled_date: datetime
     is_completed: bool
+    is_recurring: bool = False
 
     class Config:
         from_attributes = True 
\ No newline at end of file
@@ -0,0 +1,175 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from datetime import datetime, date, time, timedelta
+from typing import Iterable, Optional, Tuple
+from ..models.workout import Workout
+from ..models.muscle_group import MuscleGroup
+from ..models.exercise import Exercise
+from ..models.workout_stats import WorkoutStatsSummary, ExerciseStatsSummary
+
+# Summary rows are kept in step with the workout tables inside the caller's
+# transaction. Callers flush their own change first and then call the matching
+# record_* function; a user without a summary row gets a full rebuild instead.
+
+def period_starts(now: Optional[datetime] = None) -> Tuple[date, date]:
+    today = (now or datetime.utcnow()).date()
+    return today - timedelta(days=today.weekday()), today.replace(day=1)
+
+def _roll_periods(summary: WorkoutStatsSummary, now: Optional[datetime] = None):
+    week_start, month_start = period_starts(now)
+    if summary.week_start != week_start:
+        summary.week_start = week_start
+        summary.this_week = 0
+    if summary.month_start != month_start:
+        summary.month_start = month_start
+        summary.this_month = 0
+
+def _locked_summary(db: Session, user_id: int) -> Optional[WorkoutStatsSummary]:
+    return db.query(WorkoutStatsSummary).filter(
+        WorkoutStatsSummary.user_id == user_id
+    ).with_for_update().first()
+
+def _user_exercises(db: Session, user_id: int, *columns):
+    return db.query(*columns).join(
+        MuscleGroup, Exercise.muscle_group_id == MuscleGroup.id
+    ).join(
+        Workout, MuscleGroup.workout_id == Workout.id
+    ).filter(Workout.user_id == user_id)
+
+def _refresh_exercise_highlights(db: Session, summary: WorkoutStatsSummary):
+    rows = db.query(ExerciseStatsSummary).filter(
+        ExerciseStatsSummary.user_id == summary.user_id
+    ).order_by(ExerciseStatsSummary.exercise_name).all()
+
+    most_frequent = max(rows, key=lambda row: row.exercise_count, default=None)
+    summary.most_frequent_exercise = most_frequent.exercise_name if most_frequent else None
+    summary.personal_bests = [
+        {"exercise": row.exercise_name, "weight": row.record_weight}
+        for row in rows if row.record_weight > 0
+    ]
+
+def refresh_exercise_stats(db: Session, user_id: int, exercise_names: Iterable[str]):
+    names = set(exercise_names)
+    if not names:
+        return
+
+    summary = _locked_summary(db, user_id)
+    if summary is None:
+        rebuild_user_stats(db, user_id)
+        return
+
+    aggregates = {
+        name: (count, record_weight)
+        for name, count, record_weight in _user_exercises(
+            db, user_id, Exercise.name, func.count(Exercise.id), func.max(Exercise.record_weight)
+        ).filter(Exercise.name.in_(names)).group_by(Exercise.name)
+    }
+
+    for name in names:
+        if name in aggregates:
+            count, record_weight = aggregates[name]
+            db.merge(ExerciseStatsSummary(
+                user_id=user_id,
+                exercise_name=name,
+                exercise_count=count,
+                record_weight=record_weight or 0
+            ))
+        else:
+            db.query(ExerciseStatsSummary).filter(
+                ExerciseStatsSummary.user_id == user_id,
+                ExerciseStatsSummary.exercise_name == name
+            ).delete(synchronize_session=False)
+
+    db.flush()
+    _refresh_exercise_highlights(db, summary)
+
+def record_workout_created(db: Session, workout: Workout, exercise_names: Iterable[str] = ()):
+    summary = _locked_summary(db, workout.user_id)
+    if summary is None:
+        rebuild_user_stats(db, workout.user_id)
+        return
+
+    _roll_periods(summary)
+    summary.total_workouts += 1
+    if workout.created_at.date() >= summary.week_start:
+        summary.this_week += 1
+    if workout.created_at.date() >= summary.month_start:
+        summary.this_month += 1
+
+    refresh_exercise_stats(db, workout.user_id, exercise_names)
+
+def record_workout_completed(db: Session, workout: Workout, was_completed: bool):
+    if was_completed:
+        return
+
+    summary = _locked_summary(db, workout.user_id)
+    if summary is None:
+        rebuild_user_stats(db, workout.user_id)
+        return
+
+    summary.completed_workouts += 1
+
+def record_workout_deleted(db: Session, workout: Workout, exercise_names: Iterable[str]):
+    summary = _locked_summary(db, workout.user_id)
+    if summary is None:
+        rebuild_user_stats(db, workout.user_id)
+        return
+
+    _roll_periods(summary)
+    summary.total_workouts -= 1
+    if workout.is_completed:
+        summary.completed_workouts -= 1
+    if workout.created_at.date() >= summary.week_start:
+        summary.this_week -= 1
+    if workout.created_at.date() >= summary.month_start:
+        summary.this_month -= 1
+
+    refresh_exercise_stats(db, workout.user_id, exercise_names)
+
+def rebuild_user_stats(db: Session, user_id: int, now: Optional[datetime] = None) -> WorkoutStatsSummary:
+    week_start, month_start = period_starts(now)
+    week_start_at = datetime.combine(week_start, time.min)
+    month_start_at = datetime.combine(month_start, time.min)
+
+    total, completed, this_week, this_month = db.query(
+        func.count(Workout.id),
+        func.coalesce(func.sum(case((Workout.is_completed.is_(True), 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Workout.created_at >= week_start_at, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Workout.created_at >= month_start_at, 1), else_=0)), 0)
+    ).filter(Workout.user_id == user_id).one()
+
+    db.query(ExerciseStatsSummary).filter(
+        ExerciseStatsSummary.user_id == user_id
+    ).delete(synchronize_session=False)
+    db.add_all([
+        ExerciseStatsSummary(
+            user_id=user_id,
+            exercise_name=name,
+            exercise_count=count,
+            record_weight=record_weight or 0
+        )
+        for name, count, record_weight in _user_exercises(
+            db, user_id, Exercise.name, func.count(Exercise.id), func.max(Exercise.record_weight)
+        ).group_by(Exercise.name)
+    ])
+    db.flush()
+
+    summary = db.merge(WorkoutStatsSummary(
+        user_id=user_id,
+        total_workouts=total,
+        completed_workouts=completed,
+        week_start=week_start,
+        this_week=this_week,
+        month_start=month_start,
+        this_month=this_month
+    ))
+    _refresh_exercise_highlights(db, summary)
+    db.flush()
+    return summary
+
+def get_user_stats(db: Session, user_id: int) -> WorkoutStatsSummary:
+    summary = db.get(WorkoutStatsSummary, user_id)
+    if summary is None:
+        summary = rebuild_user_stats(db, user_id)
+        db.commit()
+    return summary
@@ -1,29 +1,116 @@
+import time
+
+# Startup time is measured from here, so it includes importing the app's dependencies
+IMPORT_STARTED = time.perf_counter()
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from routes import workouts
-from database import engine, Base
+from routes import workouts, analytics, health
+from metrics import MetricsMiddleware
+from admission import AdmissionController, AdmissionControlMiddleware
+from compression import CompressionMiddleware
+from database import check_schema_revision, dispose_engines
+from progress_buffer import get_progress_buffer
+from config import get_settings
+
+logger = logging.getLogger(__name__)
+
+class SchemaRevisionError(RuntimeError):
+    pass
+
+async def verify_schema(settings):
+    # Tables come from `alembic upgrade head`, not from the app; this only reports drift
+    if settings.SCHEMA_CHECK == "off":
+        return None
+    try:
+        current, head = await asyncio.wait_for(
+            run_in_threadpool(check_schema_revision), settings.SCHEMA_CHECK_TIMEOUT_SECONDS
+        )
+    except Exception as exc:
+        # An unreachable database must not stop the worker; requests fail until it is back
+        logger.warning("Schema revision check skipped, database unavailable: %r", exc)
+        return None
+    if current != head:
+        message = f"Database schema is at revision {current}, expected {head}; run `alembic upgrade head`"
+        if settings.SCHEMA_CHECK == "strict":
+            raise SchemaRevisionError(message)
+        logger.warning(message)
+    return current
+
+def create_app() -> FastAPI:
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        settings = get_settings()
+        app.state.schema_revision = await verify_schema(settings)
+        app.state.startup_seconds = time.perf_counter() - IMPORT_STARTED
+        if app.state.startup_seconds > settings.STARTUP_TIME_BUDGET_SECONDS:
+            logger.warning(
+                "Startup took %.2fs, over the %.2fs budget",
+                app.state.startup_seconds, settings.STARTUP_TIME_BUDGET_SECONDS
+            )
+        # Replays anything journaled before a restart, then keeps flushing
+        buffer = get_progress_buffer()
+        if buffer:
+            buffer.start()
+        yield
+        if buffer:
+            await buffer.stop()
+        await dispose_engines()
+
+    app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+
+    settings = get_settings()
+    # Innermost, so it sees the app's bodies as they are produced
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        offload_size=settings.COMPRESSION_OFFLOAD_SIZE
+    )
+
+    # Inside CORS, so browsers can read the 503 and its Retry-After
+    app.state.admission = None
+    if settings.ADMISSION_MAX_CONCURRENCY > 0:
+        app.state.admission = AdmissionController(
+            settings.ADMISSION_MAX_CONCURRENCY,
+            settings.ADMISSION_MAX_QUEUE,
+            settings.ADMISSION_QUEUE_TIMEOUT_SECONDS
+        )
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            controller=app.state.admission,
+            retry_after=settings.ADMISSION_RETRY_AFTER_SECONDS
+        )
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Allow all origins for development
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", "Retry-After"],
+    )
+    # Outermost, so latency covers CORS handling too
+    app.add_middleware(MetricsMiddleware)
 
-app = FastAPI()
+    # Include routers
+    app.include_router(workouts.router, prefix="/api", tags=["workouts"])
+    app.include_router(analytics.router, prefix="/api", tags=["analytics"])
+    app.include_router(health.router, tags=["health"])
 
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for development
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+    @app.get("/")
+    def read_root():
+        return {"message": "Welcome to the Training App API"}
 
-# Include routers
-app.include_router(workouts.router, prefix="/api", tags=["workouts"])
+    return app
 
-@app.get("/")
-def read_root():
-    return {"message": "Welcome to the Training App API"}
+app = create_app()
 
 if __name__ == '__main__':
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,43 @@
+import os
+import sys
+import argparse
+from datetime import datetime, timedelta
+
+# Get the absolute path of the backend directory
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+# Add the backend directory to Python path
+sys.path.insert(0, backend_dir)
+
+import partitioning
+from config import get_settings
+from database import get_engine
+from history_archive import archive_before
+
+# Run daily (e.g. from cron): creates next months' partitions on PostgreSQL and
+# moves whole months older than the horizon into exercise_progress_archive
+
+def archive_history(older_than_days=None, months_ahead=None, engine=None):
+    settings = get_settings()
+    older_than_days = settings.HISTORY_ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    months_ahead = settings.HISTORY_PARTITION_MONTHS_AHEAD if months_ahead is None else months_ahead
+    engine = engine or get_engine()
+    now = datetime.utcnow()
+
+    with engine.begin() as connection:
+        for table in partitioning.PARTITIONED_TABLES:
+            for name in partitioning.ensure_monthly_partitions(connection, table, now, months_ahead):
+                print(f"Created partition {name}")
+
+    def report(month, count):
+        print(f"Archived {count} progress entries from {month:%Y-%m}")
+
+    return archive_before(engine, now - timedelta(days=older_than_days), progress=report)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive old exercise progress and maintain history partitions")
+    parser.add_argument("--older-than-days", type=int, help="Archive whole months older than this many days")
+    parser.add_argument("--months-ahead", type=int, help="Create partitions for this many future months")
+    args = parser.parse_args()
+
+    count = archive_history(args.older_than_days, args.months_ahead)
+    print(f"Archived {count} progress entries")
@@ -0,0 +1,345 @@
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+from datetime import datetime, timedelta
+
+# Get the absolute path of the backend directory
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+# Add the backend directory to Python path
+sys.path.insert(0, backend_dir)
+
+import httpx
+import numpy as np
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app import app
+from database import Base, get_async_db, get_read_db, set_sqlite_pragmas
+from models.workout import Workout, MuscleGroup, Exercise, ExerciseProgress
+
+# Drives the real routes through the ASGI app (no network) against a seeded
+# database and reports latency percentiles, throughput and SQL statements per
+# request for each endpoint.
+
+SEED_CHUNK_SIZE = 5000
+# Seeded data starts here, so runs are reproducible; analytics requests ask for its first two years
+SEED_START = datetime(2020, 1, 1)
+ANALYTICS_WINDOW = f"from={SEED_START.isoformat()}&to={(SEED_START + timedelta(days=730)).isoformat()}"
+
+def async_url(url: str) -> str:
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return url
+
+class Dataset:
+    # Ids are assigned while seeding so scenarios can address rows without querying
+    def __init__(self, users, workouts_per_user, muscle_groups, exercises, history):
+        self.workouts = users * workouts_per_user
+        self.muscle_groups = muscle_groups
+        self.exercises = exercises
+        self.history = history
+
+    def exercise_ids(self, workout_id):
+        first_group = (workout_id - 1) * self.muscle_groups
+        first = first_group * self.exercises + 1
+        return list(range(first, first + self.muscle_groups * self.exercises))
+
+def _insert_chunks(connection, table, rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == SEED_CHUNK_SIZE:
+            connection.execute(insert(table), chunk)
+            chunk = []
+    if chunk:
+        connection.execute(insert(table), chunk)
+
+def seed(engine, dataset: Dataset, seed_value: int):
+    rng = random.Random(seed_value)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    started = SEED_START
+
+    def workouts():
+        for workout_id in range(1, dataset.workouts + 1):
+            created = started + timedelta(hours=workout_id)
+            yield {"id": workout_id, "name": f"Workout {workout_id}", "created_at": created, "updated_at": created}
+
+    def muscle_groups():
+        for group_id in range(1, dataset.workouts * dataset.muscle_groups + 1):
+            workout_id = (group_id - 1) // dataset.muscle_groups + 1
+            yield {"id": group_id, "name": f"Group {group_id}", "workout_id": workout_id}
+
+    def exercises():
+        for exercise_id in range(1, dataset.workouts * dataset.muscle_groups * dataset.exercises + 1):
+            group_id = (exercise_id - 1) // dataset.exercises + 1
+            weight = rng.randint(20, 100)
+            yield {
+                "id": exercise_id, "name": f"Exercise {exercise_id}", "sets": 3, "reps": 10,
+                "current_weight": weight, "last_weight": weight, "record_weight": weight,
+                "muscle_group_id": group_id
+            }
+
+    def history():
+        for exercise_id in range(1, dataset.workouts * dataset.muscle_groups * dataset.exercises + 1):
+            weight = rng.uniform(20, 60)
+            for i in range(dataset.history):
+                weight = max(1.0, weight + rng.gauss(0.5, 2.0))
+                yield {"exercise_id": exercise_id, "weight": int(weight), "date": started + timedelta(days=2 * i)}
+
+    with engine.begin() as connection:
+        _insert_chunks(connection, Workout.__table__, workouts())
+        _insert_chunks(connection, MuscleGroup.__table__, muscle_groups())
+        _insert_chunks(connection, Exercise.__table__, exercises())
+        _insert_chunks(connection, ExerciseProgress.__table__, history())
+
+def scenarios(dataset: Dataset):
+    # name -> request builder; each builder gets the run's random generator
+    def workout_and_exercise(rng):
+        workout_id = rng.randint(1, dataset.workouts)
+        return workout_id, rng.choice(dataset.exercise_ids(workout_id))
+
+    def exercise(rng):
+        return workout_and_exercise(rng)[1]
+
+    def log_progress(rng):
+        workout_id, exercise_id = workout_and_exercise(rng)
+        return "PUT", f"/api/workouts/{workout_id}/exercises/{exercise_id}/progress", {"current_weight": rng.randint(20, 150)}
+
+    def batch_progress(rng):
+        workout_id = rng.randint(1, dataset.workouts)
+        entries = [
+            {"exercise_id": exercise_id, "current_weight": rng.randint(20, 150)}
+            for exercise_id in dataset.exercise_ids(workout_id)
+        ]
+        return "PUT", f"/api/workouts/{workout_id}/progress", entries
+
+    return {
+        "list_workouts": lambda rng: ("GET", "/api/workouts?limit=50", None),
+        "exercise_history": lambda rng: ("GET", f"/api/exercises/{exercise(rng)}/history", None),
+        "history_points": lambda rng: ("GET", f"/api/exercises/{exercise(rng)}/history/points?max_points=200", None),
+        "analytics_workout": lambda rng: ("GET", f"/api/analytics/exercises?workout_id={rng.randint(1, dataset.workouts)}&{ANALYTICS_WINDOW}", None),
+        "analytics_exercise": lambda rng: ("GET", f"/api/analytics/exercises/{exercise(rng)}?{ANALYTICS_WINDOW}", None),
+        "log_progress": log_progress,
+        "batch_progress": batch_progress,
+    }
+
+class StatementCounter:
+    def __init__(self, engine):
+        self.statements = None
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, conn, cursor, statement, parameters, context, executemany):
+        if self.statements is not None:
+            self.statements.append(statement)
+
+async def _send(client, request):
+    method, url, body = request
+    response = await client.request(method, url, json=body)
+    if response.status_code >= 400:
+        raise RuntimeError(f"{method} {url} returned {response.status_code}: {response.text[:200]}")
+    return response
+
+async def run_scenario(client, counter, build, requests, concurrency, warmup, rng):
+    for _ in range(warmup):
+        await _send(client, build(rng))
+
+    # Statement count from one request on its own, so concurrent requests don't mix
+    counter.statements = []
+    await _send(client, build(rng))
+    queries = len(counter.statements)
+    counter.statements = None
+
+    planned = [build(rng) for _ in range(requests)]
+    latencies = []
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        while planned:
+            request = planned.pop()
+            started = time.perf_counter()
+            try:
+                await _send(client, request)
+            except RuntimeError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99]) if len(latencies_ms) else (0.0, 0.0, 0.0)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "mean_ms": round(float(latencies_ms.mean()), 3) if len(latencies_ms) else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "queries_per_request": queries,
+    }
+
+async def drive(database_url, dataset, requests, concurrency, warmup, seed_value, only=None):
+    async_engine = create_async_engine(async_url(database_url))
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", set_sqlite_pragmas)
+    counter = StatementCounter(async_engine.sync_engine)
+    session_factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    results = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            for name, build in scenarios(dataset).items():
+                if only and name not in only:
+                    continue
+                # Each scenario gets its own generator so adding one doesn't shift the others
+                rng = random.Random(f"{seed_value}:{name}")
+                results[name] = await run_scenario(client, counter, build, requests, concurrency, warmup, rng)
+    finally:
+        app.dependency_overrides = {}
+        await async_engine.dispose()
+    return results
+
+def run_benchmark(
+    database_url=None,
+    users=10,
+    workouts_per_user=5,
+    muscle_groups=3,
+    exercises=4,
+    history=50,
+    requests=200,
+    concurrency=10,
+    warmup=5,
+    seed_value=42,
+    only=None
+):
+    scratch = None
+    if database_url is None:
+        scratch = tempfile.TemporaryDirectory()
+        database_url = f"sqlite:///{os.path.join(scratch.name, 'benchmark.db')}"
+
+    dataset = Dataset(users, workouts_per_user, muscle_groups, exercises, history)
+    engine = create_engine(database_url)
+    try:
+        seed_started = time.perf_counter()
+        seed(engine, dataset, seed_value)
+        seed_seconds = time.perf_counter() - seed_started
+        dialect = engine.dialect.name
+    finally:
+        engine.dispose()
+
+    try:
+        endpoints = asyncio.run(drive(database_url, dataset, requests, concurrency, warmup, seed_value, only))
+    finally:
+        if scratch is not None:
+            scratch.cleanup()
+
+    return {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "dialect": dialect,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed_seconds": round(seed_seconds, 3),
+            "config": {
+                "users": users, "workouts_per_user": workouts_per_user, "muscle_groups": muscle_groups,
+                "exercises": exercises, "history": history, "requests": requests,
+                "concurrency": concurrency, "warmup": warmup, "seed": seed_value,
+            },
+        },
+        "endpoints": endpoints,
+    }
+
+def compare(results, baseline, tolerance=0.2):
+    # Latency may drift by `tolerance`; any extra SQL statement is a regression
+    regressions = []
+    for name, current in results["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+        if current["queries_per_request"] > previous["queries_per_request"]:
+            regressions.append(
+                f"{name}: queries {previous['queries_per_request']} -> {current['queries_per_request']}"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
+
+def print_report(results, baseline=None):
+    print(f"{'endpoint':<20}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>9}{'errors':>8}")
+    for name, row in results["endpoints"].items():
+        line = (
+            f"{name:<20}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}"
+            f"{row['throughput_rps']:>10.1f}{row['queries_per_request']:>9}{row['errors']:>8}"
+        )
+        previous = (baseline or {}).get("endpoints", {}).get(name)
+        if previous and previous["p95_ms"]:
+            line += f"  p95 {(row['p95_ms'] / previous['p95_ms'] - 1) * 100:+.0f}%"
+        print(line)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the API endpoints against a seeded database")
+    parser.add_argument("--database-url", help="Sync SQLAlchemy URL; defaults to a scratch SQLite file. The database is dropped and reseeded")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--workouts-per-user", type=int, default=5)
+    parser.add_argument("--muscle-groups", type=int, default=3, help="Muscle groups per workout")
+    parser.add_argument("--exercises", type=int, default=4, help="Exercises per muscle group")
+    parser.add_argument("--history", type=int, default=50, help="Progress rows per exercise")
+    parser.add_argument("--requests", type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", help="Only run these endpoints")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Compare against this results file and exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 slowdown against the baseline")
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        database_url=args.database_url,
+        users=args.users,
+        workouts_per_user=args.workouts_per_user,
+        muscle_groups=args.muscle_groups,
+        exercises=args.exercises,
+        history=args.history,
+        requests=args.requests,
+        concurrency=args.concurrency,
+        warmup=args.warmup,
+        seed_value=args.seed,
+        only=args.only
+    )
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+    print(f"Results written to {args.output}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        sys.exit(1 if regressions else 0)
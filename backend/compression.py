@@ -0,0 +1,205 @@
+import gzip
+import time
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+import metrics
+
+# Negotiated response compression (zstd, br, gzip). Bodies under the minimum size
+# go out as they are, bodies over the offload size are compressed in the
+# threadpool so the event loop keeps serving, and streamed responses are
+# compressed chunk by chunk with a flush after each, so NDJSON lines still reach
+# the client as they are produced. brotli and zstandard are optional: without
+# them only gzip is offered.
+
+GZIP_LEVEL = 6
+# Dynamic responses favour speed over the last few percent of ratio
+BROTLI_QUALITY = 4
+ZSTD_LEVEL = 3
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+class _GzipStream:
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+class _BrotliStream:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.process(data)
+        return output + (self._compressor.finish() if final else self._compressor.flush())
+
+class _ZstdStream:
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        output = self._compressor.compress(data)
+        return output + self._compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+# encoding -> (one-shot compress, streaming compressor); server preference first
+ENCODERS: Dict[str, Tuple[Callable[[bytes], bytes], Callable]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = (lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data), _ZstdStream)
+if brotli is not None:
+    ENCODERS["br"] = (lambda data: brotli.compress(data, quality=BROTLI_QUALITY), _BrotliStream)
+ENCODERS["gzip"] = (lambda data: gzip.compress(data, GZIP_LEVEL, mtime=0), _GzipStream)
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    # Highest q-value wins; ties go to the server's preference order
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    wildcard = weights.get("*", 0.0)
+    best = None
+    best_q = 0.0
+    for encoding in ENCODERS:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+def _weak_etag(headers: MutableHeaders):
+    # The compressed body is a different representation of the same resource
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["etag"] = f"W/{etag}"
+
+def _add_vary(headers: MutableHeaders):
+    vary = headers.get("vary")
+    if not vary:
+        headers["vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["vary"] = f"{vary}, Accept-Encoding"
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = 1024, offload_size: int = 65536):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.offload_size = offload_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, scope, send, encoding))
+
+class _CompressingSend:
+    def __init__(self, middleware: CompressionMiddleware, scope, send, encoding: str):
+        self.middleware = middleware
+        self.scope = scope
+        self.send = send
+        self.encoding = encoding
+        self.start = None
+        self.mode = None
+        self.stream = None
+        self.original = 0
+        self.compressed = 0
+        self.cpu_seconds = 0.0
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        return (
+            self.start["status"] not in (204, 304)
+            and "content-encoding" not in headers
+            and headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+        )
+
+    def _timed(self, compress: Callable[[], bytes]) -> bytes:
+        # thread_time counts this thread's CPU only, whether on the loop or in the threadpool
+        started = time.thread_time()
+        output = compress()
+        self.cpu_seconds += time.thread_time() - started
+        return output
+
+    async def _compress(self, data: bytes, compress: Callable[[], bytes]) -> bytes:
+        if len(data) >= self.middleware.offload_size:
+            return await run_in_threadpool(self._timed, compress)
+        return self._timed(compress)
+
+    def _observe(self):
+        metrics.observe_compression(self.scope, self.encoding, self.original, self.compressed, self.cpu_seconds)
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.mode is None:
+            headers = MutableHeaders(scope=self.start)
+            if self.start["status"] == 304:
+                _weak_etag(headers)
+                _add_vary(headers)
+            if not self._compressible(headers) or (not more_body and len(body) < self.middleware.minimum_size):
+                self.mode = "identity"
+                await self.send(self.start)
+                await self.send(message)
+                return
+
+            headers["content-encoding"] = self.encoding
+            _weak_etag(headers)
+            _add_vary(headers)
+            if not more_body:
+                compress, _ = ENCODERS[self.encoding]
+                output = await self._compress(body, lambda: compress(body))
+                headers["content-length"] = str(len(output))
+                self.original, self.compressed = len(body), len(output)
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": output})
+                self._observe()
+                return
+
+            # Length unknown up front: send it chunked
+            self.mode = "stream"
+            self.stream = ENCODERS[self.encoding][1]()
+            del headers["content-length"]
+            await self.send(self.start)
+
+        if self.mode == "identity":
+            await self.send(message)
+            return
+
+        output = await self._compress(body, lambda: self.stream.compress(body, final=not more_body))
+        self.original += len(body)
+        self.compressed += len(output)
+        await self.send({"type": "http.response.body", "body": output, "more_body": more_body})
+        if not more_body:
+            self._observe()
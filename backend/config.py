@@ -10,17 +10,70 @@ class Settings:
         # Database settings
         self.DB_USER = os.getenv("DB_USER", "postgres")
         self.DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
-        self.DB_HOST = os.getenv("DB_HOST", "localhost")
+        self.DB_HOST = os.getenv("DB_HOST", "postgres")
         self.DB_PORT = os.getenv("DB_PORT", "5432")
         self.DB_NAME = os.getenv("DB_NAME", "training_app")
+
+        # Connection pool settings (PostgreSQL)
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+        self.DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+        # Optional read replica for GET endpoints
+        self.DB_REPLICA_URL = os.getenv("DB_REPLICA_URL")
+        self.DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))
+        self.DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "10"))
+
+        # SQLite settings (testing and local development)
+        self.SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
         
-        # Environment
-        self.ENV = os.getenv("ENV", "development")
-        
+        # Readiness probe
+        self.READINESS_DB_TIMEOUT_SECONDS = float(os.getenv("READINESS_DB_TIMEOUT_SECONDS", "2"))
+
+        # Startup: schema revision check ("off", "warn" or "strict") and time budget
+        self.SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "warn").lower()
+        self.SCHEMA_CHECK_TIMEOUT_SECONDS = float(os.getenv("SCHEMA_CHECK_TIMEOUT_SECONDS", "5"))
+        self.STARTUP_TIME_BUDGET_SECONDS = float(os.getenv("STARTUP_TIME_BUDGET_SECONDS", "2"))
+
+        # History retention: months kept in the hot tables and partitions created ahead
+        self.HISTORY_ARCHIVE_AFTER_DAYS = int(os.getenv("HISTORY_ARCHIVE_AFTER_DAYS", "365"))
+        self.HISTORY_PARTITION_MONTHS_AHEAD = int(os.getenv("HISTORY_PARTITION_MONTHS_AHEAD", "3"))
+
+        # Admission control: concurrent requests per worker (0 disables), waiting queue, 503 Retry-After
+        self.ADMISSION_MAX_CONCURRENCY = int(os.getenv("ADMISSION_MAX_CONCURRENCY", "64"))
+        self.ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "128"))
+        self.ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "5"))
+        self.ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "1"))
+
+        # Response compression: smallest body worth compressing, largest compressed on the event loop
+        self.COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+        self.COMPRESSION_OFFLOAD_SIZE = int(os.getenv("COMPRESSION_OFFLOAD_SIZE", "65536"))
+
+        # Write-behind progress ingest: acknowledge after a local journal append, flush in batches
+        self.PROGRESS_WRITE_BEHIND = os.getenv("PROGRESS_WRITE_BEHIND", "false").lower() == "true"
+        self.PROGRESS_JOURNAL_PATH = os.getenv("PROGRESS_JOURNAL_PATH", "./progress_journal.db")
+        self.PROGRESS_FLUSH_INTERVAL_SECONDS = float(os.getenv("PROGRESS_FLUSH_INTERVAL_SECONDS", "0.5"))
+        self.PROGRESS_FLUSH_BATCH_SIZE = int(os.getenv("PROGRESS_FLUSH_BATCH_SIZE", "500"))
+
+        # Environment (ENV is the older name): tests and local development run on SQLite
+        self.ENV = os.getenv("ENVIRONMENT", os.getenv("ENV", "development"))
+        self.TESTING = os.getenv("TESTING", "false").lower() == "true"
+
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    @property
+    def USE_SQLITE(self) -> bool:
+        return self.TESTING or self.ENV.lower() == "development"
+
 @lru_cache()
 def get_settings() -> Settings:
     return Settings() 
\ No newline at end of file
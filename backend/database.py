@@ -1,38 +1,277 @@
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base, sessionmaker
+from typing import Optional, Tuple
 import os
-from dotenv import load_dotenv
+import time
+import asyncio
+from config import get_settings
+import metrics
 
-load_dotenv()
+# Nothing here touches the database at import time. Engines are created on first
+# use, and the session factories below are bound to them at that point.
 
-# Check if we're in a test environment or local development
-is_test = os.getenv("TESTING", "false").lower() == "true"
-is_local = os.getenv("ENVIRONMENT", "development").lower() == "development"
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+def get_database_urls() -> Tuple[str, str]:
+    # Connection settings come from Settings only, so the app, scripts and alembic agree
+    settings = get_settings()
+    if settings.USE_SQLITE:
+        # Use SQLite for testing and local development
+        return "sqlite:///./training_app.db", "sqlite+aiosqlite:///./training_app.db"
+    return settings.DATABASE_URL, settings.ASYNC_DATABASE_URL
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run alongside a writer; busy_timeout waits instead of "database is locked"
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={get_settings().SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+def postgres_pool_options():
+    settings = get_settings()
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def statement_timeout() -> str:
+    return str(get_settings().DB_STATEMENT_TIMEOUT_MS)
+
+# Sync sessions for scripts such as init_db.py; the API uses the async ones
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+AsyncSessionLocal = async_sessionmaker(
+    class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
-if is_test or is_local:
-    # Use SQLite for testing and local development
-    SQLALCHEMY_DATABASE_URL = "sqlite:///./training_app.db"
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-    )
-else:
-    # Use PostgreSQL for production
-    DB_USER = os.getenv("DB_USER", "postgres")
-    DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
-    DB_HOST = os.getenv("DB_HOST", "postgres")
-    DB_PORT = os.getenv("DB_PORT", "5432")
-    DB_NAME = os.getenv("DB_NAME", "training_app")
-    SQLALCHEMY_DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-    engine = create_engine(SQLALCHEMY_DATABASE_URL)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+_engine = None
+_async_engine = None
+_replica_engine = None
+_read_router = None
+
+def get_engine():
+    global _engine
+    if _engine is None:
+        url, _ = get_database_urls()
+        if url.startswith("sqlite"):
+            _engine = create_engine(url, connect_args={"check_same_thread": False})
+            event.listen(_engine, "connect", set_sqlite_pragmas)
+        else:
+            _engine = create_engine(
+                url,
+                connect_args={"options": f"-c statement_timeout={statement_timeout()}"},
+                **postgres_pool_options()
+            )
+        SessionLocal.configure(bind=_engine)
+    return _engine
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        _, url = get_database_urls()
+        if url.startswith("sqlite"):
+            _async_engine = create_async_engine(url)
+            event.listen(_async_engine.sync_engine, "connect", set_sqlite_pragmas)
+        else:
+            _async_engine = create_async_engine(
+                url,
+                connect_args={"server_settings": {"statement_timeout": statement_timeout()}},
+                **postgres_pool_options()
+            )
+        AsyncSessionLocal.configure(bind=_async_engine)
+    return _async_engine
+
+REPLICA_CHECK_TIMEOUT = 2.0
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+def create_replica_engine(url: str):
+    # Accepts the same plain URLs as the primary and picks the async driver
+    if url.startswith("sqlite://"):
+        replica_engine = create_async_engine("sqlite+aiosqlite://" + url[len("sqlite://"):])
+        event.listen(replica_engine.sync_engine, "connect", set_sqlite_pragmas)
+        return replica_engine
+    if url.startswith("postgresql://"):
+        url = "postgresql+asyncpg://" + url[len("postgresql://"):]
+    return create_async_engine(
+        url,
+        connect_args={"server_settings": {"statement_timeout": statement_timeout()}},
+        **postgres_pool_options()
+    )
+
+async def replica_lag_seconds(connection) -> float:
+    # An idle primary stops advancing the replay timestamp, so a replica that has
+    # replayed everything it received counts as caught up
+    if connection.dialect.name != "postgresql":
+        await connection.execute(text("SELECT 1"))
+        return 0.0
+    return float((await connection.execute(REPLICA_LAG_SQL)).scalar())
+
+class ReadReplicaRouter:
+    def __init__(
+        self,
+        primary_sessionmaker,
+        replica_engine=None,
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 10.0,
+        lag_probe=replica_lag_seconds
+    ):
+        self.primary_sessionmaker = primary_sessionmaker
+        self.replica_engine = replica_engine
+        self.replica_sessionmaker = None
+        if replica_engine is not None:
+            self.replica_sessionmaker = async_sessionmaker(
+                replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self.replica_healthy = False
+        self.last_lag = None
+        self.checked_at = None
+        self._check_task = None
+
+    async def _probe(self) -> float:
+        async with self.replica_engine.connect() as connection:
+            return await self.lag_probe(connection)
+
+    async def check_replica(self) -> bool:
+        try:
+            self.last_lag = await asyncio.wait_for(self._probe(), REPLICA_CHECK_TIMEOUT)
+            self.replica_healthy = self.last_lag <= self.max_lag_seconds
+        except Exception:
+            # Unreachable or broken replica: serve reads from the primary until the next check
+            self.last_lag = None
+            self.replica_healthy = False
+        self.checked_at = time.monotonic()
+        return self.replica_healthy
+
+    def _check_due(self) -> bool:
+        return self.checked_at is None or time.monotonic() - self.checked_at >= self.check_interval
+
+    async def session_factory(self):
+        if self.replica_sessionmaker is None:
+            return self.primary_sessionmaker
+
+        if self._check_due():
+            # The probe runs in the background so an unreachable replica never holds
+            # up a read; the primary serves reads until it reports
+            if self._check_task is None or self._check_task.done():
+                self._check_task = asyncio.create_task(self.check_replica())
+            return self.primary_sessionmaker
+
+        return self.replica_sessionmaker if self.replica_healthy else self.primary_sessionmaker
+
+    async def wait_for_check(self):
+        if self._check_task is not None:
+            await self._check_task
+
+    async def close(self):
+        if self._check_task is not None and not self._check_task.done():
+            self._check_task.cancel()
+            try:
+                await self._check_task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self):
+        return {
+            "configured": self.replica_sessionmaker is not None,
+            "healthy": self.replica_healthy,
+            "lag_seconds": self.last_lag,
+        }
+
+def get_read_router() -> ReadReplicaRouter:
+    global _read_router, _replica_engine
+    if _read_router is None:
+        settings = get_settings()
+        get_async_engine()
+        if settings.DB_REPLICA_URL:
+            _replica_engine = create_replica_engine(settings.DB_REPLICA_URL)
+        _read_router = ReadReplicaRouter(
+            AsyncSessionLocal,
+            _replica_engine,
+            max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+            check_interval=settings.DB_REPLICA_CHECK_INTERVAL
+        )
+    return _read_router
+
 # Dependency
 def get_db():
+    get_engine()
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def _checkout(db: AsyncSession, pool: str):
+    # Take the connection up front so time spent waiting on the pool is measured on its own
+    started = time.perf_counter()
+    await db.connection()
+    metrics.observe_pool_checkout(pool, time.perf_counter() - started)
+
+async def get_async_db():
+    get_async_engine()
+    async with AsyncSessionLocal() as db:
+        await _checkout(db, "async")
+        yield db
+
+async def get_read_db():
+    # Replica when one is configured and healthy, primary otherwise
+    router = get_read_router()
+    session_factory = await router.session_factory()
+    async with session_factory() as db:
+        await _checkout(db, "replica" if session_factory is router.replica_sessionmaker else "async")
+        yield db
+
+def check_schema_revision(bind=None) -> Tuple[Optional[str], str]:
+    # Returns (current, head); alembic is only imported when the check runs
+    from alembic.config import Config
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    head = ScriptDirectory.from_config(Config(ALEMBIC_INI)).get_current_head()
+    with (bind or get_engine()).connect() as connection:
+        current = MigrationContext.configure(connection).get_current_revision()
+    return current, head
+
+async def dispose_engines():
+    # Only engines that were actually created have pools to close
+    if _read_router is not None:
+        await _read_router.close()
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    if _replica_engine is not None:
+        await _replica_engine.dispose()
+    if _engine is not None:
+        _engine.dispose()
+
+def get_pool_stats():
+    stats = {}
+    pools = [("sync", get_engine().pool), ("async", get_async_engine().sync_engine.pool)]
+    if _replica_engine is not None:
+        pools.append(("replica", _replica_engine.sync_engine.pool))
+    for name, pool in pools:
+        stats[name] = {"pool": type(pool).__name__, "status": pool.status()}
+        # Only queue-based pools track sizes; SQLite may fall back to a simpler pool
+        if hasattr(pool, "checkedout"):
+            stats[name].update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+    return stats
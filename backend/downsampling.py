@@ -0,0 +1,39 @@
+from typing import List, Sequence, Tuple
+
+# Largest-Triangle-Three-Buckets: picks `threshold` points that keep the visual
+# shape of an (x, y) series sorted by x. Returns indices into `points`; the first
+# and last point are always kept.
+def lttb_indices(points: Sequence[Tuple[float, float]], threshold: int) -> List[int]:
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    selected = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_points = points[next_start:next_end]
+        avg_x = sum(p[0] for p in next_points) / len(next_points)
+        avg_y = sum(p[1] for p in next_points) / len(next_points)
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = points[a]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+
+        selected.append(best)
+        a = best
+
+    selected.append(n - 1)
+    return selected
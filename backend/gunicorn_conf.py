@@ -0,0 +1,64 @@
+import math
+import os
+import tempfile
+from typing import Optional
+
+# Production server: gunicorn managing uvicorn workers.
+#   gunicorn -c gunicorn_conf.py app:app
+# Everything here can be overridden through the environment variables below.
+
+def cpu_quota(cgroup_root: str = "/sys/fs/cgroup") -> Optional[float]:
+    # CPUs granted by the container's cgroup limit, None when unlimited
+    try:
+        with open(os.path.join(cgroup_root, "cpu.max")) as f:
+            quota, period = f.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_quota_us")) as f:
+            quota = int(f.read())
+        with open(os.path.join(cgroup_root, "cpu", "cpu.cfs_period_us")) as f:
+            period = int(f.read())
+        return quota / period if quota > 0 else None
+    except (OSError, ValueError):
+        return None
+
+def default_workers(cgroup_root: str = "/sys/fs/cgroup") -> int:
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = cpu_quota(cgroup_root)
+    if quota is not None:
+        cpus = min(cpus, quota)
+    return max(1, math.ceil(cpus))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", "0")) or default_workers()
+
+# Import the app once in the master so workers fork with it loaded; database
+# engines are created lazily, so no connection is shared across the fork
+preload_app = True
+
+# Recycle workers to bound memory growth; the jitter keeps them from restarting together
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "1000"))
+
+# On SIGTERM workers stop accepting and get this long to finish in-flight requests
+# and run the app's shutdown (progress journal flush, engine disposal). Keep it
+# below the pod's terminationGracePeriodSeconds.
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+
+accesslog = "-"
+errorlog = "-"
+
+# Each worker keeps its own Prometheus samples; /metrics aggregates them from here.
+# Set before the app is preloaded so every instrument writes to it.
+if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
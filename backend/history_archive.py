@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+from sqlalchemy import bindparam, delete, func, insert, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import partitioning
+from models.workout import ExerciseProgress, ExerciseProgressArchive
+
+# Progress rows older than the archive horizon move into exercise_progress_archive,
+# one compact row per exercise and month. The history endpoints read both tables
+# and merge them, so archiving never changes what a client sees.
+
+ARCHIVE_EXERCISE_CHUNK = 500
+
+archive_table = ExerciseProgressArchive.__table__
+
+def expand(rows, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None) -> List[dict]:
+    # (exercise_id, entries) rows -> history entries, oldest first
+    history = []
+    for exercise_id, entries in rows:
+        for entry_id, date, weight in entries:
+            date = datetime.fromisoformat(date)
+            if date_from is not None and date < date_from:
+                continue
+            if date_to is not None and date >= date_to:
+                continue
+            history.append({"id": entry_id, "exercise_id": exercise_id, "weight": weight, "date": date})
+    history.sort(key=lambda entry: (entry["date"], entry["id"]))
+    return history
+
+def archive_filters(exercise_id: int, date_from: Optional[datetime] = None, date_to: Optional[datetime] = None):
+    filters = [ExerciseProgressArchive.exercise_id == exercise_id]
+    if date_from is not None:
+        filters.append(ExerciseProgressArchive.month >= partitioning.month_start(date_from))
+    if date_to is not None:
+        filters.append(ExerciseProgressArchive.month < date_to)
+    return filters
+
+def archive_totals(exercise_id: int):
+    # Scalar subqueries, so callers fold the archive into a query they already run
+    filters = archive_filters(exercise_id)
+    return (
+        select(func.coalesce(func.sum(ExerciseProgressArchive.entry_count), 0)).filter(*filters).scalar_subquery(),
+        select(func.max(ExerciseProgressArchive.max_entry_id)).filter(*filters).scalar_subquery()
+    )
+
+def bucket_start(bucket: str, date: datetime) -> datetime:
+    # Matches date_trunc on Postgres and the SQLite modifiers in routes/workouts.py
+    day = date.replace(hour=0, minute=0, second=0, microsecond=0)
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return partitioning.month_start(day)
+    return day
+
+def merge_buckets(rows, entries: List[dict], bucket: str) -> list:
+    # rows: (bucket_start, min, max, last, count, last_date) from SQL, plus archived entries oldest first
+    buckets = {row[0]: list(row) for row in rows}
+    for entry in entries:
+        start = bucket_start(bucket, entry["date"])
+        weight = entry["weight"]
+        current = buckets.get(start)
+        if current is None:
+            buckets[start] = [start, weight, weight, weight, 1, entry["date"]]
+            continue
+        current[1] = min(current[1], weight)
+        current[2] = max(current[2], weight)
+        current[4] += 1
+        if entry["date"] >= current[5]:
+            current[3] = weight
+            current[5] = entry["date"]
+    return [tuple(buckets[start]) for start in sorted(buckets)]
+
+async def load_archived(
+    db: AsyncSession,
+    exercise_id: int,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+) -> List[dict]:
+    result = await db.execute(
+        select(ExerciseProgressArchive.exercise_id, ExerciseProgressArchive.entries)
+        .filter(*archive_filters(exercise_id, date_from, date_to))
+    )
+    return expand(result.all(), date_from, date_to)
+
+def archive_month(connection, month: datetime) -> int:
+    # Moves one calendar month of progress rows into the archive, in the caller's transaction
+    month_end = partitioning.add_months(month, 1)
+    in_month = (ExerciseProgress.date >= month, ExerciseProgress.date < month_end)
+    partitioned = partitioning.is_partitioned(connection, "exercise_progress")
+    if partitioned:
+        # Keep writers out of the month until its partition is gone
+        name = partitioning.partition_name("exercise_progress", month)
+        if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is not None:
+            connection.execute(text(f"LOCK TABLE {name} IN EXCLUSIVE MODE"))
+
+    exercise_ids = connection.execute(
+        select(ExerciseProgress.exercise_id).filter(*in_month).distinct().order_by(ExerciseProgress.exercise_id)
+    ).scalars().all()
+
+    moved = 0
+    max_id_seen = 0
+    for i in range(0, len(exercise_ids), ARCHIVE_EXERCISE_CHUNK):
+        chunk = exercise_ids[i:i + ARCHIVE_EXERCISE_CHUNK]
+        entries = {}
+        for row in connection.execute(
+            select(ExerciseProgress.id, ExerciseProgress.exercise_id, ExerciseProgress.weight, ExerciseProgress.date)
+            .filter(ExerciseProgress.exercise_id.in_(chunk), *in_month)
+            .order_by(ExerciseProgress.exercise_id, ExerciseProgress.date, ExerciseProgress.id)
+        ):
+            entries.setdefault(row.exercise_id, []).append([row.id, row.date.isoformat(), row.weight])
+            max_id_seen = max(max_id_seen, row.id)
+            moved += 1
+
+        existing = {
+            row.exercise_id: row
+            for row in connection.execute(
+                select(archive_table.c.id, archive_table.c.exercise_id, archive_table.c.entries)
+                .filter(archive_table.c.exercise_id.in_(chunk), archive_table.c.month == month)
+            )
+        }
+        new_rows = []
+        merged_rows = []
+        for exercise_id, items in entries.items():
+            if exercise_id in existing:
+                # Late rows for a month that was already archived
+                items = sorted(existing[exercise_id].entries + items, key=lambda entry: (entry[1], entry[0]))
+                merged_rows.append({
+                    "archive_id": existing[exercise_id].id, "entries": items,
+                    "entry_count": len(items), "max_entry_id": max(entry[0] for entry in items)
+                })
+            else:
+                new_rows.append({
+                    "exercise_id": exercise_id, "month": month, "entries": items,
+                    "entry_count": len(items), "max_entry_id": max(entry[0] for entry in items)
+                })
+        if new_rows:
+            connection.execute(insert(archive_table), new_rows)
+        if merged_rows:
+            connection.execute(
+                update(archive_table)
+                .where(archive_table.c.id == bindparam("archive_id"))
+                .values(
+                    entries=bindparam("entries"),
+                    entry_count=bindparam("entry_count"),
+                    max_entry_id=bindparam("max_entry_id")
+                ),
+                merged_rows
+            )
+
+    if moved:
+        partitioning.drop_partition(connection, "exercise_progress", month)
+        # Rows left in a default partition, or the whole month on an unpartitioned table;
+        # the id bound spares rows written after the month was read
+        connection.execute(delete(ExerciseProgress).where(*in_month, ExerciseProgress.id <= max_id_seen))
+    return moved
+
+def archive_before(engine, cutoff: datetime, progress=None) -> int:
+    # Archives every whole month before `cutoff`, one transaction per month
+    cutoff = partitioning.month_start(cutoff)
+    with engine.connect() as connection:
+        oldest = connection.execute(select(func.min(ExerciseProgress.date))).scalar()
+    if oldest is None:
+        return 0
+
+    moved = 0
+    month = partitioning.month_start(oldest)
+    while month < cutoff:
+        with engine.begin() as connection:
+            count = archive_month(connection, month)
+        moved += count
+        if progress:
+            progress(month, count)
+        month = partitioning.add_months(month, 1)
+    return moved
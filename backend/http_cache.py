@@ -0,0 +1,66 @@
+from fastapi import Request, Response
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+import hashlib
+
+# Strong validators for GET endpoints. Callers derive them from a cheap
+# aggregate (row counts, max timestamps/ids) rather than from the response
+# body, so a 304 can be returned before anything is loaded or serialized.
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+def _validator_headers(etag: str, last_modified: Optional[datetime]) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # Weak comparison, so W/"..." from intermediaries still matches
+    candidates = [tag.strip() for tag in header.split(",")]
+    candidates = [tag[2:] if tag.startswith("W/") else tag for tag in candidates]
+    return etag in candidates
+
+def _not_modified_since(header: str, last_modified: Optional[datetime]) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP dates have one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+def not_modified_response(
+    request: Request,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Optional[Response]:
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.1.3)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        matched = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        matched = if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+
+    if matched:
+        return Response(status_code=304, headers=_validator_headers(etag, last_modified))
+    return None
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None):
+    response.headers.update(_validator_headers(etag, last_modified))
@@ -6,42 +6,52 @@ backend_dir = os.path.dirname(os.path.abspath(__file__))
 # Add the backend directory to Python path
 sys.path.insert(0, backend_dir)
 
+import argparse
+import time
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
-from database import Base
+from database import Base, get_engine
 from api.models.user import User
 from api.models.workout import Workout
 from api.models.exercise import Exercise, WeightHistory
 from api.models.muscle_group import MuscleGroup
 from datetime import datetime, UTC
+import synthetic_data
 
-# Create database engine - using SQLite for local development
-SQLALCHEMY_DATABASE_URL = "sqlite:///./training_app.db"
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+def reset_database(engine):
+    # Drop all tables and recreate them
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
 
-# Drop all tables and recreate them
-Base.metadata.drop_all(bind=engine)
-Base.metadata.create_all(bind=engine)
-
-# Create session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-db = SessionLocal()
+def init_db(reset=False, database_url=None):
+    # Uses the app's database unless a URL is given; existing tables are kept unless reset
+    engine = create_engine(database_url) if database_url else get_engine()
+    if reset:
+        reset_database(engine)
+    else:
+        Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        seed_data(db)
+    finally:
+        db.close()
+    return engine
 
 # Create initial data
-def init_db():
-    # Create admin user if not exists
+def seed_data(db):
+    # Sample data goes in once, alongside the admin user
     admin = db.query(User).filter(User.email == "admin@example.com").first()
-    if not admin:
-        admin = User(
-            email="admin@example.com",
-            hashed_password="$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW",  # "password"
-            is_active=True,
-            is_superuser=True
-        )
-        db.add(admin)
-        db.commit()
+    if admin:
+        return
+
+    admin = User(
+        email="admin@example.com",
+        hashed_password="$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW",  # "password"
+        is_active=True,
+        is_superuser=True
+    )
+    db.add(admin)
+    db.commit()
 
     # Create sample workout
     workout = Workout(
@@ -123,5 +133,37 @@ def init_db():
     db.commit()
 
 if __name__ == "__main__":
-    init_db()
-    print("Database initialized with sample data") 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Create tables and seed sample or synthetic data")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate all tables first")
+    parser.add_argument("--database-url", help="Defaults to the app's database")
+    parser.add_argument("--users", type=int, default=0, help="Also generate this many synthetic users")
+    parser.add_argument("--workouts-per-user", type=int, default=2)
+    parser.add_argument("--muscle-groups-per-workout", type=int, default=3)
+    parser.add_argument("--exercises-per-group", type=int, default=3)
+    parser.add_argument("--history-per-exercise", type=int, default=100)
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Weight history rows per transaction")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine = init_db(reset=args.reset, database_url=args.database_url)
+    print("Database initialized with sample data")
+
+    if args.users:
+        started = time.perf_counter()
+
+        def report(counts):
+            rate = counts["weight_history"] / max(time.perf_counter() - started, 1e-9)
+            print(f"  {counts['users']}/{args.users} users, {counts['weight_history']} history rows ({rate:,.0f} rows/s)")
+
+        counts = synthetic_data.generate(
+            engine,
+            users=args.users,
+            workouts_per_user=args.workouts_per_user,
+            muscle_groups_per_workout=args.muscle_groups_per_workout,
+            exercises_per_group=args.exercises_per_group,
+            history_per_exercise=args.history_per_exercise,
+            chunk_size=args.chunk_size,
+            seed=args.seed,
+            progress=report
+        )
+        print("Generated " + ", ".join(f"{count} {name}" for name, count in counts.items())) 
\ No newline at end of file
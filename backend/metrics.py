@@ -0,0 +1,192 @@
+import os
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Optional
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Prometheus instruments for HTTP requests and the database. The middleware
+# opens a RequestStats for each request; the cursor hooks below add every
+# statement's time to it, so the route histograms split DB time from the rest.
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "Request latency by route",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size by route",
+    ["method", "route"], buckets=SIZE_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "SQL statements executed per request",
+    ["method", "route"], buckets=QUERY_COUNT_BUCKETS
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_duration_seconds", "Time spent executing SQL per request",
+    ["method", "route"], buckets=LATENCY_BUCKETS
+)
+DB_STATEMENTS = Counter("db_statements_total", "SQL statements executed", ["dialect"])
+DB_STATEMENT_TIME = Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time",
+    ["dialect"], buckets=LATENCY_BUCKETS
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time waiting for a pooled connection",
+    ["pool"], buckets=LATENCY_BUCKETS
+)
+# Gauges use a live multiprocess mode, so a worker's series go away with it
+# (gunicorn_conf.child_exit); each worker has its own pools, which add up
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ["pool"], multiprocess_mode="livesum"
+)
+POOL_SIZE = Gauge("db_pool_size", "Configured pool size", ["pool"], multiprocess_mode="livesum")
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size", ["pool"], multiprocess_mode="livesum"
+)
+# Every worker on the host reports the same journal, so they aren't added up
+PROGRESS_PENDING = Gauge(
+    "progress_journal_pending_events", "Progress events waiting in the write-behind journal",
+    multiprocess_mode="livemax"
+)
+PROGRESS_FLUSHED = Counter("progress_events_flushed_total", "Progress events applied from the write-behind journal")
+PROGRESS_FLUSH_TIME = Histogram(
+    "progress_flush_duration_seconds", "Time to apply one batch from the write-behind journal",
+    buckets=LATENCY_BUCKETS
+)
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight_requests", "Requests holding an admission slot", multiprocess_mode="livesum"
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "admission_queue_depth", "Requests waiting for an admission slot", ["priority"], multiprocess_mode="livesum"
+)
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds", "Time spent waiting for an admission slot",
+    ["priority"], buckets=LATENCY_BUCKETS
+)
+ADMISSION_REJECTED = Counter(
+    "admission_rejected_total", "Requests turned away with 503 by admission control", ["priority", "reason"]
+)
+COMPRESSION_RATIO = Histogram(
+    "http_response_compression_ratio", "Compressed size over original size",
+    ["route", "encoding"], buckets=(0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.7, 0.9, 1.0)
+)
+COMPRESSION_CPU_TIME = Histogram(
+    "http_response_compression_cpu_seconds", "CPU time spent compressing one response",
+    ["route", "encoding"], buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+)
+
+# Requests that match no route share one label instead of one per URL
+UNMATCHED_ROUTE = "unmatched"
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    dialect = conn.dialect.name
+    DB_STATEMENTS.labels(dialect).inc()
+    DB_STATEMENT_TIME.labels(dialect).observe(elapsed)
+    stats = request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_started"):
+        connection.info["query_started"].pop()
+
+_route_paths = weakref.WeakKeyDictionary()
+
+def route_label(scope) -> str:
+    # Label by route template (/api/exercises/{exercise_id}/history), never the raw path;
+    # the router sets scope["endpoint"], so call this once the app has handled the request
+    app = scope["app"]
+    if app not in _route_paths:
+        _route_paths[app] = {
+            route.endpoint: route.path
+            for route in app.routes if hasattr(route, "endpoint")
+        }
+    return _route_paths[app].get(scope.get("endpoint"), UNMATCHED_ROUTE)
+
+class MetricsMiddleware:
+    # Plain ASGI middleware so streamed bodies are counted chunk by chunk
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = request_stats.set(stats)
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            request_stats.reset(token)
+            method = scope["method"]
+            route = route_label(scope)
+            REQUEST_LATENCY.labels(method, route, str(status)).observe(elapsed)
+            RESPONSE_SIZE.labels(method, route).observe(size)
+            REQUEST_QUERIES.labels(method, route).observe(stats.queries)
+            REQUEST_DB_TIME.labels(method, route).observe(stats.db_seconds)
+
+def observe_pool_checkout(pool: str, seconds: float):
+    POOL_CHECKOUT_WAIT.labels(pool).observe(seconds)
+
+def update_pool_gauges(pool_stats):
+    for name, stats in pool_stats.items():
+        if "checked_out" in stats:
+            POOL_CHECKED_OUT.labels(name).set(stats["checked_out"])
+            POOL_SIZE.labels(name).set(stats["size"])
+            POOL_OVERFLOW.labels(name).set(stats["overflow"])
+
+def observe_progress_flush(events: int, seconds: float, pending: int):
+    PROGRESS_FLUSHED.inc(events)
+    PROGRESS_FLUSH_TIME.observe(seconds)
+    PROGRESS_PENDING.set(pending)
+
+def observe_compression(scope, encoding: str, original: int, compressed: int, cpu_seconds: float):
+    route = route_label(scope)
+    if original:
+        COMPRESSION_RATIO.labels(route, encoding).observe(compressed / original)
+    COMPRESSION_CPU_TIME.labels(route, encoding).observe(cpu_seconds)
+
+def render():
+    # Under gunicorn (gunicorn_conf.py) each worker writes its samples to this directory
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
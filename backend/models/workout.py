@@ -1,15 +1,31 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Index, JSON, UniqueConstraint, text
 from sqlalchemy.orm import relationship
 from database import Base
 
 class Workout(Base):
     __tablename__ = "workouts"
+    __table_args__ = (
+        Index("ix_workouts_scheduled_date", "scheduled_date"),
+        # Recurring series are few; the calendar reads them all from this partial index
+        Index(
+            "ix_workouts_recurring_scheduled_date", "scheduled_date",
+            postgresql_where=text("recurrence_rule IS NOT NULL"),
+            sqlite_where=text("recurrence_rule IS NOT NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    scheduled_date = Column(DateTime, nullable=True)
+    is_completed = Column(Boolean, default=False)
+
+    # Recurring workouts: a recurrence rule anchored at scheduled_date, expanded per
+    # requested window. recurrence_until is the last occurrence (NULL when open-ended)
+    recurrence_rule = Column(String, nullable=True)
+    recurrence_until = Column(DateTime, nullable=True)
     
     # Relationships
     muscle_groups = relationship("MuscleGroup", back_populates="workout", cascade="all, delete-orphan")
@@ -19,7 +35,7 @@ class MuscleGroup(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    workout_id = Column(Integer, ForeignKey("workouts.id"))
+    workout_id = Column(Integer, ForeignKey("workouts.id"), index=True)
     
     # Relationships
     workout = relationship("Workout", back_populates="muscle_groups")
@@ -35,14 +51,18 @@ class Exercise(Base):
     current_weight = Column(Integer, default=0)
     last_weight = Column(Integer, default=0)
     record_weight = Column(Integer, default=0)
-    muscle_group_id = Column(Integer, ForeignKey("muscle_groups.id"))
+    muscle_group_id = Column(Integer, ForeignKey("muscle_groups.id"), index=True)
     
     # Relationships
     muscle_group = relationship("MuscleGroup", back_populates="exercises")
     progress_history = relationship("ExerciseProgress", back_populates="exercise", cascade="all, delete-orphan")
+    archived_progress = relationship("ExerciseProgressArchive", cascade="all, delete-orphan")
 
 class ExerciseProgress(Base):
     __tablename__ = "exercise_progress"
+    __table_args__ = (
+        Index("ix_exercise_progress_exercise_id_date", "exercise_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     exercise_id = Column(Integer, ForeignKey("exercises.id"))
@@ -50,4 +70,29 @@ class ExerciseProgress(Base):
     date = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    exercise = relationship("Exercise", back_populates="progress_history") 
\ No newline at end of file
+    exercise = relationship("Exercise", back_populates="progress_history")
+
+class ExerciseProgressArchive(Base):
+    # Cold storage for progress rows past the archive horizon (see archive_history.py):
+    # one row per exercise and month, holding that month's entries oldest first
+    __tablename__ = "exercise_progress_archive"
+    __table_args__ = (
+        UniqueConstraint("exercise_id", "month", name="uq_exercise_progress_archive_exercise_id_month"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=False)
+    month = Column(DateTime, nullable=False)
+    entry_count = Column(Integer, nullable=False)
+    max_entry_id = Column(Integer, nullable=False)
+    # [[id, ISO date, weight], ...]
+    entries = Column(JSON, nullable=False)
+
+class ProgressIngestWatermark(Base):
+    # Last write-behind journal event applied to this database, per journal file
+    # (see progress_buffer.py); advanced in the same transaction as each batch
+    __tablename__ = "progress_ingest_watermarks"
+
+    journal_id = Column(String, primary_key=True)
+    last_seq = Column(Integer, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,58 @@
+from datetime import datetime
+from typing import List
+from sqlalchemy import text
+
+# Monthly range partitions for the append-only history tables on PostgreSQL.
+# Migration 0004 converts the tables; this module keeps partitions created
+# ahead of time and drops the ones whose rows have been archived. SQLite keeps
+# a single table and every helper here is a no-op there.
+
+PARTITIONED_TABLES = ("exercise_progress", "weight_history")
+
+def month_start(value: datetime) -> datetime:
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def add_months(month: datetime, months: int) -> datetime:
+    index = month.month - 1 + months
+    return month.replace(year=month.year + index // 12, month=index % 12 + 1)
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+def is_partitioned(connection, table: str) -> bool:
+    if connection.dialect.name != "postgresql":
+        return False
+    return connection.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": table}
+    ).first() is not None
+
+def ensure_monthly_partitions(connection, table: str, start: datetime, months_ahead: int) -> List[str]:
+    # Rows past the last partition land in the default partition, and a partition
+    # can't be added over rows already sitting there, so stay ahead of time
+    if not is_partitioned(connection, table):
+        return []
+    created = []
+    month = month_start(start)
+    for _ in range(months_ahead + 1):
+        name = partition_name(table, month)
+        exists = connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if exists is None:
+            connection.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+            ))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+def drop_partition(connection, table: str, month: datetime) -> bool:
+    # Dropping a month's partition replaces a large DELETE once its rows are archived
+    if not is_partitioned(connection, table):
+        return False
+    name = partition_name(table, month)
+    if connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar() is None:
+        return False
+    connection.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+    connection.execute(text(f"DROP TABLE {name}"))
+    return True
@@ -0,0 +1,341 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+import metrics
+from config import get_settings
+from database import AsyncSessionLocal, get_async_engine
+from models.workout import Exercise, ExerciseProgress, ProgressIngestWatermark
+
+logger = logging.getLogger(__name__)
+
+# Opt-in write-behind ingest for progress logging (PROGRESS_WRITE_BEHIND=true).
+# A progress call is acknowledged once its events are in a local SQLite journal
+# (WAL, synchronous=FULL), and a background task applies them to the main
+# database in batches, in journal order. Every batch advances this journal's
+# watermark row in the same transaction, so replaying the journal after a crash,
+# or two workers flushing the same file, never applies an event twice.
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    exercise_id INTEGER NOT NULL,
+    current_weight INTEGER NOT NULL,
+    last_weight INTEGER,
+    record_weight INTEGER,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_events_exercise_id ON events (exercise_id, seq);
+"""
+
+# A read retries when a flush lands in the middle of it; past this many tries it
+# takes what it has (only a replica far behind the journal keeps it retrying)
+CONSISTENT_READ_ATTEMPTS = 3
+
+class ProgressEvent(NamedTuple):
+    seq: Optional[int]
+    exercise_id: int
+    current_weight: int
+    last_weight: Optional[int]
+    record_weight: Optional[int]
+    date: datetime
+
+def next_weights(current_weight: int, record_weight: int, progress) -> Tuple[int, int, int]:
+    # Returns (last_weight, current_weight, record_weight) after logging `progress`
+    last_weight = progress.last_weight if progress.last_weight is not None else current_weight
+
+    if progress.record_weight is not None:
+        record_weight = progress.record_weight
+    elif progress.current_weight > record_weight:
+        record_weight = progress.current_weight
+
+    return last_weight, progress.current_weight, record_weight
+
+def _event(row) -> ProgressEvent:
+    return ProgressEvent(row[0], row[1], row[2], row[3], row[4], datetime.fromisoformat(row[5]))
+
+class ProgressJournal:
+    # sqlite3 connections can't move between threads, so each threadpool thread opens its own
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        connection = self._connection()
+        connection.executescript(JOURNAL_SCHEMA)
+        connection.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('journal_id', ?)", (uuid.uuid4().hex,)
+        )
+        self.journal_id = connection.execute("SELECT value FROM meta WHERE key = 'journal_id'").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # An acknowledged event must survive a power loss, not only a process crash
+            connection.execute("PRAGMA synchronous=FULL")
+            self._local.connection = connection
+        return connection
+
+    def append(self, events: List[ProgressEvent]) -> List[int]:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            seqs = [
+                connection.execute(
+                    "INSERT INTO events (exercise_id, current_weight, last_weight, record_weight, date) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (e.exercise_id, e.current_weight, e.last_weight, e.record_weight, e.date.isoformat())
+                ).lastrowid
+                for e in events
+            ]
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return seqs
+
+    def pending(self, limit: int) -> List[ProgressEvent]:
+        rows = self._connection().execute(
+            "SELECT seq, exercise_id, current_weight, last_weight, record_weight, date "
+            "FROM events ORDER BY seq LIMIT ?", (limit,)
+        )
+        return [_event(row) for row in rows]
+
+    def pending_for(self, exercise_ids: List[int]) -> List[ProgressEvent]:
+        if not exercise_ids:
+            return []
+        placeholders = ",".join("?" * len(exercise_ids))
+        rows = self._connection().execute(
+            "SELECT seq, exercise_id, current_weight, last_weight, record_weight, date "
+            f"FROM events WHERE exercise_id IN ({placeholders}) ORDER BY seq", list(exercise_ids)
+        )
+        return [_event(row) for row in rows]
+
+    def marker(self) -> Tuple[int, Optional[int]]:
+        # (pending count, newest seq): changes whenever an event is appended or flushed
+        return tuple(self._connection().execute("SELECT count(*), max(seq) FROM events").fetchone())
+
+    def pending_after(self, exercise_ids: List[int], after_seq: int) -> Tuple[List[ProgressEvent], int]:
+        # Events past `after_seq` and the highest seq discarded so far, from one journal snapshot
+        connection = self._connection()
+        placeholders = ",".join("?" * len(exercise_ids))
+        connection.execute("BEGIN")
+        try:
+            rows = connection.execute(
+                "SELECT seq, exercise_id, current_weight, last_weight, record_weight, date "
+                f"FROM events WHERE exercise_id IN ({placeholders}) AND seq > ? ORDER BY seq",
+                [*exercise_ids, after_seq]
+            ).fetchall()
+            discarded = connection.execute(
+                "SELECT CAST(value AS INTEGER) FROM meta WHERE key = 'discarded_seq'"
+            ).fetchone()
+        finally:
+            connection.execute("COMMIT")
+        return [_event(row) for row in rows], discarded[0] if discarded else 0
+
+    def discard(self, up_to_seq: int):
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("DELETE FROM events WHERE seq <= ?", (up_to_seq,))
+            connection.execute(
+                "INSERT INTO meta (key, value) VALUES ('discarded_seq', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = max(CAST(value AS INTEGER), CAST(excluded.value AS INTEGER))",
+                (up_to_seq,)
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+class ProgressBuffer:
+    def __init__(self, journal: ProgressJournal, session_factory=None, batch_size: int = 500, interval: float = 0.5):
+        self.journal = journal
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._task = None
+
+    async def append(self, events: List[ProgressEvent]) -> List[int]:
+        return await run_in_threadpool(self.journal.append, events)
+
+    async def pending_for(self, exercise_ids) -> Dict[int, List[ProgressEvent]]:
+        pending: Dict[int, List[ProgressEvent]] = {}
+        for event in await run_in_threadpool(self.journal.pending_for, list(exercise_ids)):
+            pending.setdefault(event.exercise_id, []).append(event)
+        return pending
+
+    async def marker(self) -> Tuple[int, Optional[int]]:
+        return await run_in_threadpool(self.journal.marker)
+
+    async def watermark(self, db) -> int:
+        return await db.scalar(
+            select(func.coalesce(func.max(ProgressIngestWatermark.last_seq), 0))
+            .filter(ProgressIngestWatermark.journal_id == self.journal.journal_id)
+        )
+
+    async def read_your_writes(
+        self, db, read: Callable[[], Awaitable], exercise_ids: Callable[[object], Iterable[int]]
+    ) -> Tuple[object, Dict[int, List[ProgressEvent]]]:
+        """Runs `read()` against the database and returns its result together with the
+        journaled events it doesn't include yet, by exercise id.
+
+        Each batch commits before it leaves the journal and advances the watermark
+        in the same transaction. An unchanged watermark around the read means no
+        batch committed during it, so the read saw exactly the events up to the
+        watermark; once the journal has discarded nothing past the watermark,
+        every later event is still there to be merged.
+        """
+        for _ in range(CONSISTENT_READ_ATTEMPTS):
+            before = await self.watermark(db)
+            result = await read()
+            ids = list(set(exercise_ids(result)))
+            if not ids:
+                return result, {}
+            settled = await self.watermark(db) == before
+            events, discarded = await run_in_threadpool(self.journal.pending_after, ids, before)
+            if settled and discarded <= before:
+                break
+        pending: Dict[int, List[ProgressEvent]] = {}
+        for event in events:
+            pending.setdefault(event.exercise_id, []).append(event)
+        return result, pending
+
+    async def _advance_watermark(self, db, last_seq: int) -> Optional[int]:
+        # Returns the previous watermark (0 for a new journal), or None if another
+        # worker applied these events first
+        watermark = await db.scalar(
+            select(ProgressIngestWatermark.last_seq)
+            .filter(ProgressIngestWatermark.journal_id == self.journal.journal_id)
+        )
+        if watermark is None:
+            await db.execute(insert(ProgressIngestWatermark).values(
+                journal_id=self.journal.journal_id, last_seq=last_seq, updated_at=datetime.utcnow()
+            ))
+            return 0
+        if watermark >= last_seq:
+            return watermark
+        # Compare-and-set: a concurrent flusher's commit makes this match no row
+        result = await db.execute(
+            update(ProgressIngestWatermark)
+            .where(
+                ProgressIngestWatermark.journal_id == self.journal.journal_id,
+                ProgressIngestWatermark.last_seq == watermark
+            )
+            .values(last_seq=last_seq, updated_at=datetime.utcnow())
+        )
+        return watermark if result.rowcount == 1 else None
+
+    async def flush(self) -> int:
+        """Applies one batch from the journal; returns the number of journal events consumed."""
+        async with self._lock:
+            started = time.perf_counter()
+            events = await run_in_threadpool(self.journal.pending, self.batch_size)
+            if not events:
+                return 0
+
+            applied = 0
+            async with self.session_factory() as db:
+                try:
+                    watermark = await self._advance_watermark(db, events[-1].seq)
+                except IntegrityError:
+                    watermark = None
+                if watermark is None:
+                    await db.rollback()
+                    return 0
+
+                # Events at or below the watermark were committed by a flush that died before trimming the journal
+                fresh = [event for event in events if event.seq > watermark]
+                if fresh:
+                    weights = {
+                        row.id: {"id": row.id, "current_weight": row.current_weight, "record_weight": row.record_weight}
+                        for row in await db.execute(
+                            select(Exercise.id, Exercise.current_weight, Exercise.record_weight)
+                            .filter(Exercise.id.in_({event.exercise_id for event in fresh}))
+                        )
+                    }
+                    history_rows = []
+                    for event in fresh:
+                        state = weights.get(event.exercise_id)
+                        if state is None:
+                            logger.warning("Dropping progress event %s for deleted exercise %s", event.seq, event.exercise_id)
+                            continue
+                        state["last_weight"], state["current_weight"], state["record_weight"] = next_weights(
+                            state["current_weight"], state["record_weight"], event
+                        )
+                        history_rows.append({"exercise_id": event.exercise_id, "weight": event.current_weight, "date": event.date})
+                    if history_rows:
+                        await db.execute(update(Exercise), [state for state in weights.values() if "last_weight" in state])
+                        await db.execute(insert(ExerciseProgress), history_rows)
+                    applied = len(history_rows)
+                await db.commit()
+
+            await run_in_threadpool(self.journal.discard, events[-1].seq)
+            pending, _ = await self.marker()
+            metrics.observe_progress_flush(applied, time.perf_counter() - started, pending)
+            return len(events)
+
+    async def flush_all(self) -> int:
+        consumed = 0
+        while True:
+            count = await self.flush()
+            consumed += count
+            if count < self.batch_size:
+                return consumed
+
+    async def _run(self):
+        # Flush first, so events journaled before a restart are replayed right away
+        while True:
+            try:
+                await self.flush_all()
+            except Exception:
+                logger.exception("Flushing the progress journal failed; retrying")
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # Anything left stays in the journal and is replayed on the next start
+        try:
+            await self.flush_all()
+        except Exception:
+            logger.exception("Final progress journal flush failed; events stay journaled")
+
+_buffer: Optional[ProgressBuffer] = None
+
+def get_progress_buffer() -> Optional[ProgressBuffer]:
+    # FastAPI dependency; None unless PROGRESS_WRITE_BEHIND is enabled
+    global _buffer
+    settings = get_settings()
+    if not settings.PROGRESS_WRITE_BEHIND:
+        return None
+    if _buffer is None:
+        get_async_engine()
+        _buffer = ProgressBuffer(
+            ProgressJournal(settings.PROGRESS_JOURNAL_PATH),
+            AsyncSessionLocal,
+            batch_size=settings.PROGRESS_FLUSH_BATCH_SIZE,
+            interval=settings.PROGRESS_FLUSH_INTERVAL_SECONDS
+        )
+    return _buffer
@@ -0,0 +1,47 @@
+import os
+import sys
+import argparse
+
+# Get the absolute path of the backend directory
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+# Add the backend directory to Python path
+sys.path.insert(0, backend_dir)
+
+from database import Base, SessionLocal, get_engine
+from api.models.user import User
+# The service imports the rest of the api/ models, which registers their mappers
+from api.models.workout_stats import WorkoutStatsSummary, ExerciseStatsSummary
+from api.services.workout_stats import rebuild_user_stats
+
+BATCH_SIZE = 500
+
+def rebuild_stats(user_id=None):
+    # Make sure the summary tables exist before backfilling them
+    Base.metadata.create_all(
+        bind=get_engine(),
+        tables=[WorkoutStatsSummary.__table__, ExerciseStatsSummary.__table__]
+    )
+
+    db = SessionLocal()
+    try:
+        if user_id is not None:
+            user_ids = [user_id]
+        else:
+            user_ids = [row.id for row in db.query(User.id).order_by(User.id)]
+
+        for i, uid in enumerate(user_ids, start=1):
+            rebuild_user_stats(db, uid)
+            if i % BATCH_SIZE == 0:
+                db.commit()
+        db.commit()
+        return len(user_ids)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-user workout statistics")
+    parser.add_argument("--user-id", type=int, help="Only rebuild this user's statistics")
+    args = parser.parse_args()
+
+    count = rebuild_stats(args.user_id)
+    print(f"Rebuilt workout statistics for {count} user(s)")
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterator, List, NamedTuple, Optional
+
+# A small subset of RFC 5545 recurrence rules, e.g. "FREQ=WEEKLY;BYDAY=MO,TH"
+# or "FREQ=DAILY;INTERVAL=2;COUNT=10". Occurrences are computed for a requested
+# window only: daily and weekly rules jump straight to the window's first period
+# instead of walking from the series start.
+
+WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY")
+MAX_COUNT = 10000
+
+class Rule(NamedTuple):
+    freq: str
+    interval: int = 1
+    byday: Optional[List[int]] = None
+    count: Optional[int] = None
+    until: Optional[datetime] = None
+
+def _parse_until(value: str) -> datetime:
+    for layout in ("%Y%m%dT%H%M%SZ", "%Y%m%dT%H%M%S", "%Y%m%d"):
+        try:
+            until = datetime.strptime(value, layout)
+        except ValueError:
+            continue
+        # A date-only UNTIL includes that whole day
+        return until + timedelta(days=1) - timedelta(microseconds=1) if layout == "%Y%m%d" else until
+    raise ValueError(f"Invalid UNTIL value: {value}")
+
+def parse_rule(text: str) -> Rule:
+    parts = {}
+    for part in text.strip().upper().split(";"):
+        if not part:
+            continue
+        key, sep, value = part.partition("=")
+        if not sep or not value:
+            raise ValueError(f"Invalid recurrence rule part: {part}")
+        parts[key] = value
+
+    freq = parts.pop("FREQ", None)
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    interval = int(parts.pop("INTERVAL", "1"))
+    if interval < 1:
+        raise ValueError("INTERVAL must be at least 1")
+
+    byday = None
+    if "BYDAY" in parts:
+        if freq != "WEEKLY":
+            raise ValueError("BYDAY is only supported with FREQ=WEEKLY")
+        days = parts.pop("BYDAY").split(",")
+        if any(day not in WEEKDAYS for day in days):
+            raise ValueError(f"BYDAY values must be in {','.join(WEEKDAYS)}")
+        byday = sorted({WEEKDAYS.index(day) for day in days})
+
+    count = int(parts.pop("COUNT")) if "COUNT" in parts else None
+    if count is not None and not 1 <= count <= MAX_COUNT:
+        raise ValueError(f"COUNT must be between 1 and {MAX_COUNT}")
+    until = _parse_until(parts.pop("UNTIL")) if "UNTIL" in parts else None
+    if count is not None and until is not None:
+        raise ValueError("COUNT and UNTIL can't be combined")
+    if parts:
+        raise ValueError(f"Unsupported recurrence rule parts: {', '.join(sorted(parts))}")
+    return Rule(freq, interval, byday, count, until)
+
+def _add_months(start: datetime, months: int) -> Optional[datetime]:
+    # Months without the start's day (e.g. the 31st) have no occurrence
+    month = start.month - 1 + months
+    try:
+        return start.replace(year=start.year + month // 12, month=month % 12 + 1)
+    except ValueError:
+        return None
+
+def _candidates(rule: Rule, start: datetime, window_from: datetime) -> Iterator[tuple]:
+    # Yields (occurrence index, datetime) from the first period that can reach `window_from`
+    if rule.freq == "DAILY":
+        step = timedelta(days=rule.interval)
+        index = max(0, (window_from - start) // step)
+        while True:
+            yield index, start + index * step
+            index += 1
+
+    elif rule.freq == "WEEKLY":
+        days = rule.byday or [start.weekday()]
+        week_start = start - timedelta(days=start.weekday())
+        period = timedelta(weeks=rule.interval)
+        # The first week only has the days from the start onwards
+        first_week = [day for day in days if day >= start.weekday()]
+        number = max(0, (window_from - week_start) // period)
+        index = 0 if number == 0 else len(first_week) + (number - 1) * len(days)
+        while True:
+            for day in (first_week if number == 0 else days):
+                yield index, week_start + number * period + timedelta(days=day)
+                index += 1
+            number += 1
+
+    else:
+        index = 0
+        months = 0
+        while True:
+            occurrence = _add_months(start, months)
+            if occurrence is not None:
+                yield index, occurrence
+                index += 1
+            months += rule.interval
+
+def occurrences(rule: Rule, start: datetime, window_from: datetime, window_to: datetime) -> Iterator[datetime]:
+    """Occurrences of a series starting at `start` within [window_from, window_to)."""
+    for index, occurrence in _candidates(rule, start, window_from):
+        if occurrence >= window_to:
+            return
+        if rule.count is not None and index >= rule.count:
+            return
+        if rule.until is not None and occurrence > rule.until:
+            return
+        if occurrence >= window_from:
+            yield occurrence
+
+def last_occurrence(rule: Rule, start: datetime) -> Optional[datetime]:
+    # None for open-ended series
+    if rule.until is not None:
+        return rule.until
+    if rule.count is None:
+        return None
+    remaining = occurrences(rule, start, start, datetime.max)
+    return list(islice(remaining, rule.count))[-1]
@@ -0,0 +1,99 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+
+import training_analytics
+from database import get_read_db
+from models.workout import MuscleGroup, Exercise, ExerciseProgress
+from schemas.analytics import ExerciseAnalytics, ExerciseAnalyticsDetail
+
+router = APIRouter()
+
+DEFAULT_ROLLING_WINDOW = 5
+MAX_ROLLING_WINDOW = 100
+# Progress rows are read for a bounded date window only, and never more than
+# MAX_HISTORY_ROWS of them, so one request can't pull the whole table into NumPy
+DEFAULT_WINDOW_DAYS = 365
+MAX_WINDOW_DAYS = 731
+MAX_HISTORY_ROWS = 200000
+MAX_EXERCISE_IDS = 100
+
+def _naive_utc(value: datetime) -> datetime:
+    # Stored datetimes are naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _date_window(date_from: Optional[datetime], date_to: Optional[datetime]):
+    # Missing bounds default to the DEFAULT_WINDOW_DAYS ending at `to` (or now)
+    date_to = _naive_utc(date_to) if date_to else datetime.utcnow()
+    date_from = _naive_utc(date_from) if date_from else date_to - timedelta(days=DEFAULT_WINDOW_DAYS)
+    if date_to <= date_from:
+        raise HTTPException(status_code=422, detail="`to` must be after `from`")
+    if date_to - date_from > timedelta(days=MAX_WINDOW_DAYS):
+        raise HTTPException(status_code=422, detail=f"Windows are limited to {MAX_WINDOW_DAYS} days")
+    return date_from, date_to
+
+async def _load_history(db: AsyncSession, date_from: datetime, date_to: datetime, *filters):
+    # One pass over the window's progress rows joined to the exercise's sets/reps
+    result = await db.execute(
+        select(
+            ExerciseProgress.exercise_id,
+            Exercise.name,
+            ExerciseProgress.date,
+            ExerciseProgress.weight,
+            Exercise.sets,
+            Exercise.reps
+        )
+        .join(Exercise, ExerciseProgress.exercise_id == Exercise.id)
+        .filter(ExerciseProgress.date >= date_from, ExerciseProgress.date < date_to, *filters)
+        .order_by(ExerciseProgress.exercise_id, ExerciseProgress.date, ExerciseProgress.id)
+        .limit(MAX_HISTORY_ROWS + 1)
+    )
+    rows = result.all()
+    if len(rows) > MAX_HISTORY_ROWS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"More than {MAX_HISTORY_ROWS} progress entries; narrow the window or filter by exercise"
+        )
+    return training_analytics.load_history(rows)
+
+@router.get("/analytics/exercises", response_model=List[ExerciseAnalytics])
+async def get_exercises_analytics(
+    workout_id: Optional[int] = None,
+    exercise_id: Optional[List[int]] = Query(None, max_length=MAX_EXERCISE_IDS),
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    window: int = Query(DEFAULT_ROLLING_WINDOW, ge=1, le=MAX_ROLLING_WINDOW),
+    db: AsyncSession = Depends(get_read_db)
+):
+    date_from, date_to = _date_window(date_from, date_to)
+    filters = []
+    if workout_id is not None:
+        filters.append(Exercise.muscle_group.has(MuscleGroup.workout_id == workout_id))
+    if exercise_id:
+        filters.append(ExerciseProgress.exercise_id.in_(exercise_id))
+
+    history = await _load_history(db, date_from, date_to, *filters)
+    # NumPy work is CPU-bound; keep it off the event loop
+    return await run_in_threadpool(training_analytics.summarize, history, window)
+
+@router.get("/analytics/exercises/{exercise_id}", response_model=ExerciseAnalyticsDetail)
+async def get_exercise_analytics(
+    exercise_id: int,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    window: int = Query(DEFAULT_ROLLING_WINDOW, ge=1, le=MAX_ROLLING_WINDOW),
+    db: AsyncSession = Depends(get_read_db)
+):
+    date_from, date_to = _date_window(date_from, date_to)
+    history = await _load_history(db, date_from, date_to, ExerciseProgress.exercise_id == exercise_id)
+    if len(history["weight"]) == 0:
+        raise HTTPException(status_code=404, detail="No history for this exercise in this window")
+
+    summary = await run_in_threadpool(training_analytics.summarize, history, window)
+    points = await run_in_threadpool(training_analytics.series, history, window)
+    return {"summary": summary[0], "series": points}
@@ -0,0 +1,50 @@
+import asyncio
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import text
+
+import metrics
+from config import get_settings
+from database import get_async_engine, get_pool_stats, get_read_router
+
+router = APIRouter()
+
+@router.get("/metrics")
+def get_metrics():
+    metrics.update_pool_gauges(get_pool_stats())
+    content, media_type = metrics.render()
+    return Response(content, media_type=media_type)
+
+@router.get("/health/live")
+def liveness():
+    # The process is serving requests; the database is the readiness probe's concern
+    return {"status": "alive"}
+
+async def _ping_database():
+    async with get_async_engine().connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+@router.get("/health/ready")
+async def readiness(request: Request):
+    try:
+        await asyncio.wait_for(_ping_database(), get_settings().READINESS_DB_TIMEOUT_SECONDS)
+        database = "ok"
+    except Exception as exc:
+        database = f"unavailable: {exc!r}"
+
+    settings = get_settings()
+    pools = get_pool_stats()
+    for stats in pools.values():
+        if "checked_out" in stats:
+            # Reported, not failed on: every pod saturating at once would take the whole service out
+            stats["saturated"] = stats["checked_out"] >= stats["size"] + settings.DB_MAX_OVERFLOW
+
+    body = {
+        "status": "ready" if database == "ok" else "unavailable",
+        "database": database,
+        "pools": pools,
+        "replica": get_read_router().status(),
+    }
+    if request.app.state.admission is not None:
+        body["admission"] = request.app.state.admission.stats()
+    return ORJSONResponse(body, status_code=200 if database == "ok" else 503)
@@ -1,78 +1,453 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import DateTime, and_, func, insert, or_, select, type_coerce, union_all, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import AsyncIterator, Dict, FrozenSet, List, Literal, NamedTuple, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+import base64
+import json
 
-from database import get_db
+import recurrence
+from database import get_async_db, get_read_db
+from downsampling import lttb_indices
+from history_archive import archive_totals, load_archived, merge_buckets
+from progress_buffer import ProgressBuffer, ProgressEvent, get_progress_buffer, next_weights
+from http_cache import make_etag, not_modified_response, set_validators
+from serialization import PydanticJSONResponse
 from models.workout import Workout, MuscleGroup, Exercise, ExerciseProgress
 from schemas.workout import (
     WorkoutCreate,
     WorkoutResponse,
+    ExerciseResponse,
     ExerciseProgressUpdate,
-    ExerciseHistoryResponse
+    ExerciseProgressBatchItem,
+    ExerciseProgressBatchResponse,
+    ExerciseHistoryResponse,
+    ExerciseHistoryPointsResponse,
+    ScheduledWorkout
 )
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+MAX_BULK_WORKOUTS = 500
+MAX_BATCH_PROGRESS = 200
+HISTORY_STREAM_BATCH_SIZE = 1000
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+MAX_HISTORY_POINTS = 5000
+MAX_SCHEDULE_WINDOW_DAYS = 366
+
+SQLITE_BUCKET_MODIFIERS = {
+    "day": ("start of day",),
+    # 'weekday 0' moves forward to Sunday, so step back to that week's Monday
+    "week": ("start of day", "weekday 0", "-6 days"),
+    "month": ("start of month",),
+}
+
+WORKOUT_LIST_ADAPTER = TypeAdapter(List[WorkoutResponse])
+
+# Sparse fieldsets for GET /workouts: ?fields=name,muscle_groups.exercises.current_weight
+# picks columns per level and ?include=muscle_groups,muscle_groups.exercises picks levels.
+# Levels that aren't included are never queried.
+WORKOUT_FIELDS = ("id", "name", "created_at", "updated_at", "scheduled_date", "recurrence_rule")
+MUSCLE_GROUP_FIELDS = ("id", "name", "workout_id")
+EXERCISE_FIELDS = (
+    "id", "name", "sets", "reps", "current_weight", "last_weight", "record_weight", "muscle_group_id"
+)
+LEVEL_FIELDS = {
+    "": WORKOUT_FIELDS,
+    "muscle_groups": MUSCLE_GROUP_FIELDS,
+    "muscle_groups.exercises": EXERCISE_FIELDS,
+}
+INCLUDES = ("muscle_groups", "muscle_groups.exercises")
+
+class WorkoutShape(NamedTuple):
+    includes: FrozenSet[str]
+    workout: Tuple[str, ...]
+    muscle_group: Tuple[str, ...]
+    exercise: Tuple[str, ...]
+
+FULL_WORKOUT_SHAPE = WorkoutShape(frozenset(INCLUDES), WORKOUT_FIELDS, MUSCLE_GROUP_FIELDS, EXERCISE_FIELDS)
+
+def _encode_cursor(updated_at: datetime, workout_id: int) -> str:
+    raw = f"{updated_at.isoformat()}|{workout_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        updated_at, workout_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(updated_at), int(workout_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _parse_workout_shape(fields: Optional[str], include: Optional[str]) -> WorkoutShape:
+    requested = {level: [] for level in LEVEL_FIELDS}
+    unknown = []
+    for path in filter(None, (part.strip() for part in (fields or "").split(","))):
+        level, _, name = path.rpartition(".")
+        if name in LEVEL_FIELDS.get(level, ()):
+            requested[level].append(name)
+        else:
+            unknown.append(path)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {unknown}")
+
+    if include is not None:
+        includes = {part.strip() for part in include.split(",") if part.strip()}
+        if includes - set(INCLUDES):
+            raise HTTPException(status_code=400, detail=f"Unknown includes: {sorted(includes - set(INCLUDES))}")
+    elif fields:
+        # Without include, ?fields loads only the levels it names
+        includes = {level for level in INCLUDES if requested[level]}
+    else:
+        includes = set(INCLUDES)
+    if "muscle_groups.exercises" in includes:
+        includes.add("muscle_groups")
+    missing = [level for level in INCLUDES if requested[level] and level not in includes]
+    if missing:
+        raise HTTPException(status_code=400, detail=f"Fields requested for levels not included: {missing}")
+
+    def pick(level):
+        return tuple(name for name in LEVEL_FIELDS[level] if name in requested[level]) or LEVEL_FIELDS[level]
+
+    return WorkoutShape(frozenset(includes), pick(""), pick("muscle_groups"), pick("muscle_groups.exercises"))
+
+async def _workouts_validators(db: AsyncSession) -> Tuple[str, Optional[datetime]]:
+    # Progress updates change exercise weights without touching the workout row,
+    # so the newest progress entry is part of the validator too
+    latest_progress = select(ExerciseProgress.id, ExerciseProgress.date)\
+        .order_by(ExerciseProgress.id.desc()).limit(1).subquery()
+    count, max_updated_at, progress_id, progress_date = (await db.execute(
+        select(
+            func.count(Workout.id),
+            func.max(Workout.updated_at),
+            select(latest_progress.c.id).scalar_subquery(),
+            select(latest_progress.c.date).scalar_subquery()
+        )
+    )).one()
+
+    last_modified = max(filter(None, (max_updated_at, progress_date)), default=None)
+    return make_etag("workouts", count, max_updated_at, progress_id), last_modified
+
 @router.get("/workouts", response_model=List[WorkoutResponse])
-def get_workouts(db: Session = Depends(get_db)):
-    workouts = db.query(Workout).all()
-    return workouts
+async def get_workouts(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    buffer: Optional[ProgressBuffer] = Depends(get_progress_buffer)
+):
+    shape = _parse_workout_shape(fields, include)
+    etag, last_modified = await _workouts_validators(db)
+    if buffer:
+        etag = make_etag(etag, *await buffer.marker())
+    if shape != FULL_WORKOUT_SHAPE:
+        # Sorted, since set order varies between worker processes
+        etag = make_etag(etag, sorted(shape.includes), shape.workout, shape.muscle_group, shape.exercise)
+    cached = not_modified_response(request, etag, last_modified)
+    if cached:
+        return cached
+
+    # Keyset pagination on (updated_at, id), newest first; both are selected for the cursor
+    columns = dict.fromkeys(("id", "updated_at") + shape.workout)
+    query = select(*(getattr(Workout, name) for name in columns))
+    if cursor:
+        updated_at, workout_id = _decode_cursor(cursor)
+        query = query.filter(or_(
+            Workout.updated_at < updated_at,
+            and_(Workout.updated_at == updated_at, Workout.id < workout_id)
+        ))
+
+    query = query.order_by(Workout.updated_at.desc(), Workout.id.desc()).limit(limit + 1)
+    workout_rows = (await db.execute(query)).all()
+
+    headers = {}
+    if len(workout_rows) > limit:
+        workout_rows = workout_rows[:limit]
+        headers["X-Next-Cursor"] = _encode_cursor(workout_rows[-1].updated_at, workout_rows[-1].id)
+
+    # Build the tree from plain row tuples (at most three queries) instead of ORM objects
+    if buffer and "muscle_groups.exercises" in shape.includes:
+        exercise_extra = ("current_weight", "last_weight", "record_weight")
+        workouts, pending = await buffer.read_your_writes(
+            db,
+            lambda: _workout_trees_from_rows(db, workout_rows, shape, exercise_extra),
+            lambda workouts: (exercise["id"] for exercise in _tree_exercises(workouts))
+        )
+        exercises = {exercise["id"]: exercise for exercise in _tree_exercises(workouts)}
+        for exercise_id, events in pending.items():
+            _apply_pending(exercises[exercise_id], events)
+    else:
+        workouts = await _workout_trees_from_rows(db, workout_rows, shape)
+
+    if shape == FULL_WORKOUT_SHAPE:
+        # The full tree is validated and encoded in one pass through pydantic-core
+        response = PydanticJSONResponse(WORKOUT_LIST_ADAPTER, WORKOUT_LIST_ADAPTER.validate_python(workouts), headers=headers)
+    else:
+        response = ORJSONResponse(_project_workouts(workouts, shape), headers=headers)
+    set_validators(response, etag, last_modified)
+    return response
+
+def _tree_exercises(workouts: List[dict]):
+    for workout in workouts:
+        for muscle_group in workout["muscle_groups"]:
+            yield from muscle_group["exercises"]
+
+async def _workout_trees_from_rows(
+    db: AsyncSession,
+    workout_rows,
+    shape: WorkoutShape = FULL_WORKOUT_SHAPE,
+    exercise_extra: Tuple[str, ...] = ()
+) -> List[dict]:
+    workouts = {}
+    for row in workout_rows:
+        workout = row._asdict()
+        if "muscle_groups" in shape.includes:
+            workout["muscle_groups"] = []
+        workouts[row.id] = workout
+    if not workouts or "muscle_groups" not in shape.includes:
+        return list(workouts.values())
+
+    muscle_groups = {}
+    columns = dict.fromkeys(("id", "workout_id") + shape.muscle_group)
+    for row in await db.execute(
+        select(*(getattr(MuscleGroup, name) for name in columns))
+        .filter(MuscleGroup.workout_id.in_(workouts.keys()))
+        .order_by(MuscleGroup.id)
+    ):
+        muscle_group = row._asdict()
+        if "muscle_groups.exercises" in shape.includes:
+            muscle_group["exercises"] = []
+        muscle_groups[row.id] = muscle_group
+        workouts[row.workout_id]["muscle_groups"].append(muscle_group)
+
+    if muscle_groups and "muscle_groups.exercises" in shape.includes:
+        columns = dict.fromkeys(("id", "muscle_group_id") + shape.exercise + exercise_extra)
+        for row in await db.execute(
+            select(*(getattr(Exercise, name) for name in columns))
+            .filter(Exercise.muscle_group_id.in_(muscle_groups.keys()))
+            .order_by(Exercise.id)
+        ):
+            muscle_groups[row.muscle_group_id]["exercises"].append(row._asdict())
+
+    return list(workouts.values())
+
+def _schedule_window(date_from: Optional[datetime], date_to: Optional[datetime]):
+    # Missing bounds default to the calendar month around the other bound (or now)
+    if date_from is None:
+        anchor = date_to - timedelta(microseconds=1) if date_to else datetime.utcnow()
+        date_from = anchor.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    if date_to is None:
+        date_to = (date_from.replace(day=1) + timedelta(days=32)).replace(
+            day=1, hour=0, minute=0, second=0, microsecond=0
+        )
+    return date_from, date_to
+
+@router.get("/workouts/scheduled", response_model=List[ScheduledWorkout])
+async def get_scheduled_workouts(
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    date_from, date_to = _schedule_window(
+        _naive_utc(date_from) if date_from else None,
+        _naive_utc(date_to) if date_to else None
+    )
+    if date_to <= date_from:
+        raise HTTPException(status_code=422, detail="`to` must be after `from`")
+    if date_to - date_from > timedelta(days=MAX_SCHEDULE_WINDOW_DAYS):
+        raise HTTPException(status_code=422, detail=f"Windows are limited to {MAX_SCHEDULE_WINDOW_DAYS} days")
+
+    # One statement: a range scan on scheduled_date for one-off workouts plus
+    # the recurring series from the partial index
+    columns = (Workout.id, Workout.name, Workout.scheduled_date, Workout.is_completed, Workout.recurrence_rule)
+    one_off = select(*columns).filter(
+        Workout.scheduled_date >= date_from,
+        Workout.scheduled_date < date_to,
+        Workout.recurrence_rule.is_(None)
+    )
+    series = select(*columns).filter(
+        Workout.recurrence_rule.isnot(None),
+        Workout.scheduled_date < date_to,
+        or_(Workout.recurrence_until.is_(None), Workout.recurrence_until >= date_from)
+    )
+
+    scheduled = []
+    for row in await db.execute(union_all(one_off, series)):
+        if row.recurrence_rule is None:
+            scheduled.append({
+                "id": row.id, "name": row.name,
+                "scheduled_date": row.scheduled_date, "is_completed": bool(row.is_completed)
+            })
+            continue
+        # Occurrences exist only for the requested window; none are stored
+        rule = recurrence.parse_rule(row.recurrence_rule)
+        for occurrence in recurrence.occurrences(rule, row.scheduled_date, date_from, date_to):
+            scheduled.append({
+                "id": row.id, "name": row.name, "scheduled_date": occurrence,
+                "is_completed": False, "is_recurring": True
+            })
+
+    scheduled.sort(key=lambda workout: (workout["scheduled_date"], workout["id"]))
+    return scheduled
+
+def _project_workouts(workouts: List[dict], shape: WorkoutShape) -> List[dict]:
+    # Drops the keys that were only selected for pagination or assembling the tree
+    projected = []
+    for workout in workouts:
+        item = {name: workout[name] for name in shape.workout}
+        if "muscle_groups" in workout:
+            item["muscle_groups"] = []
+            for muscle_group in workout["muscle_groups"]:
+                group = {name: muscle_group[name] for name in shape.muscle_group}
+                if "exercises" in muscle_group:
+                    group["exercises"] = [
+                        {name: exercise[name] for name in shape.exercise}
+                        for exercise in muscle_group["exercises"]
+                    ]
+                item["muscle_groups"].append(group)
+        projected.append(item)
+    return projected
+
+def _naive_utc(value: datetime) -> datetime:
+    # Stored datetimes are naive UTC
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _schedule_columns(workout: WorkoutCreate) -> dict:
+    # recurrence_until is stored so the calendar query can skip series that ended before the window
+    scheduled_date = _naive_utc(workout.scheduled_date) if workout.scheduled_date else None
+    recurrence_until = None
+    if workout.recurrence_rule is not None:
+        if scheduled_date is None:
+            raise HTTPException(status_code=422, detail="A recurring workout needs a scheduled_date")
+        recurrence_until = recurrence.last_occurrence(recurrence.parse_rule(workout.recurrence_rule), scheduled_date)
+    return {
+        "scheduled_date": scheduled_date,
+        "recurrence_rule": workout.recurrence_rule,
+        "recurrence_until": recurrence_until,
+        "is_completed": False
+    }
+
+async def _insert_workout_trees(db: AsyncSession, workouts: List[WorkoutCreate]) -> List[int]:
+    # One multi-row INSERT ... RETURNING per table instead of a flush per row
+    now = datetime.utcnow()
+    workout_ids = (await db.scalars(
+        insert(Workout).returning(Workout.id, sort_by_parameter_order=True),
+        [{"name": w.name, "created_at": now, "updated_at": now, **_schedule_columns(w)} for w in workouts]
+    )).all()
+
+    muscle_group_rows = []
+    exercise_groups = []
+    for workout_id, workout in zip(workout_ids, workouts):
+        for muscle_group_data in workout.muscle_groups:
+            muscle_group_rows.append({"name": muscle_group_data.name, "workout_id": workout_id})
+            exercise_groups.append(muscle_group_data.exercises)
+
+    if muscle_group_rows:
+        muscle_group_ids = (await db.scalars(
+            insert(MuscleGroup).returning(MuscleGroup.id, sort_by_parameter_order=True),
+            muscle_group_rows
+        )).all()
+
+        exercise_rows = [
+            {
+                "name": exercise_data.name,
+                "sets": exercise_data.sets,
+                "reps": exercise_data.reps,
+                "muscle_group_id": muscle_group_id
+            }
+            for muscle_group_id, exercises in zip(muscle_group_ids, exercise_groups)
+            for exercise_data in exercises
+        ]
+        if exercise_rows:
+            await db.execute(insert(Exercise), exercise_rows)
+
+    return list(workout_ids)
+
+async def _load_workout_trees(db: AsyncSession, workout_ids: List[int]) -> List[Workout]:
+    result = await db.scalars(
+        select(Workout).options(
+            selectinload(Workout.muscle_groups).selectinload(MuscleGroup.exercises)
+        ).filter(Workout.id.in_(workout_ids)).order_by(Workout.id)
+    )
+    return result.all()
 
 @router.post("/workouts", response_model=WorkoutResponse)
-def create_workout(workout: WorkoutCreate, db: Session = Depends(get_db)):
-    db_workout = Workout(name=workout.name)
-    db.add(db_workout)
-    db.flush()
-
-    for muscle_group_data in workout.muscle_groups:
-        db_muscle_group = MuscleGroup(
-            name=muscle_group_data.name,
-            workout_id=db_workout.id
+async def create_workout(workout: WorkoutCreate, db: AsyncSession = Depends(get_async_db)):
+    workout_ids = await _insert_workout_trees(db, [workout])
+    await db.commit()
+    return (await _load_workout_trees(db, workout_ids))[0]
+
+@router.post("/workouts/bulk", response_model=List[WorkoutResponse])
+async def create_workouts_bulk(
+    workouts: List[WorkoutCreate],
+    db: AsyncSession = Depends(get_async_db)
+):
+    if len(workouts) > MAX_BULK_WORKOUTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Cannot create more than {MAX_BULK_WORKOUTS} workouts per request"
         )
-        db.add(db_muscle_group)
-        db.flush()
-
-        for exercise_data in muscle_group_data.exercises:
-            db_exercise = Exercise(
-                name=exercise_data.name,
-                sets=exercise_data.sets,
-                reps=exercise_data.reps,
-                muscle_group_id=db_muscle_group.id
-            )
-            db.add(db_exercise)
+    if not workouts:
+        return []
+
+    workout_ids = await _insert_workout_trees(db, workouts)
+    await db.commit()
+    return await _load_workout_trees(db, workout_ids)
 
-    db.commit()
-    db.refresh(db_workout)
-    return db_workout
+def _apply_pending(state: dict, events: List[ProgressEvent]) -> dict:
+    # Journaled progress not yet flushed, so write-behind clients read their own writes
+    for event in events:
+        state["last_weight"], state["current_weight"], state["record_weight"] = next_weights(
+            state["current_weight"], state["record_weight"], event
+        )
+    return state
 
 @router.put("/workouts/{workout_id}/exercises/{exercise_id}/progress")
-def update_exercise_progress(
+async def update_exercise_progress(
     workout_id: int,
     exercise_id: int,
     progress: ExerciseProgressUpdate,
-    db: Session = Depends(get_db)
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    buffer: Optional[ProgressBuffer] = Depends(get_progress_buffer)
 ):
-    exercise = db.query(Exercise).filter(
-        Exercise.id == exercise_id,
-        Exercise.muscle_group.has(workout_id=workout_id)
-    ).first()
+    if buffer:
+        exercise_exists = await db.scalar(
+            select(Exercise.id).filter(
+                Exercise.id == exercise_id,
+                Exercise.muscle_group.has(workout_id=workout_id)
+            )
+        )
+        if not exercise_exists:
+            raise HTTPException(status_code=404, detail="Exercise not found")
+        await buffer.append([ProgressEvent(
+            None, exercise_id, progress.current_weight, progress.last_weight, progress.record_weight, datetime.utcnow()
+        )])
+        response.status_code = 202
+        return {"message": "Progress accepted"}
+
+    exercise = await db.scalar(
+        select(Exercise).filter(
+            Exercise.id == exercise_id,
+            Exercise.muscle_group.has(workout_id=workout_id)
+        ).limit(1)
+    )
 
     if not exercise:
         raise HTTPException(status_code=404, detail="Exercise not found")
 
     # Update exercise weights
-    if progress.last_weight is not None:
-        exercise.last_weight = progress.last_weight
-    else:
-        exercise.last_weight = exercise.current_weight
-
-    exercise.current_weight = progress.current_weight
-
-    if progress.record_weight is not None:
-        exercise.record_weight = progress.record_weight
-    elif progress.current_weight > exercise.record_weight:
-        exercise.record_weight = progress.current_weight
+    exercise.last_weight, exercise.current_weight, exercise.record_weight = next_weights(
+        exercise.current_weight, exercise.record_weight, progress
+    )
 
     # Add to progress history
     progress_entry = ExerciseProgress(
@@ -81,21 +456,281 @@ def update_exercise_progress(
     )
     db.add(progress_entry)
 
-    db.commit()
+    await db.commit()
     return {"message": "Progress updated successfully"}
 
+@router.put("/workouts/{workout_id}/progress", response_model=ExerciseProgressBatchResponse)
+async def update_workout_progress(
+    workout_id: int,
+    entries: List[ExerciseProgressBatchItem],
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    buffer: Optional[ProgressBuffer] = Depends(get_progress_buffer)
+):
+    if len(entries) > MAX_BATCH_PROGRESS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Cannot log more than {MAX_BATCH_PROGRESS} entries per request"
+        )
+    if not entries:
+        return {"message": "Progress updated successfully", "updated": 0}
+
+    # Verify every exercise belongs to the workout in one query
+    exercise_ids = {entry.exercise_id for entry in entries}
+    weights: Dict[int, Dict[str, int]] = {
+        row.id: {"id": row.id, "current_weight": row.current_weight, "record_weight": row.record_weight}
+        for row in await db.execute(
+            select(Exercise.id, Exercise.current_weight, Exercise.record_weight)
+            .join(MuscleGroup, Exercise.muscle_group_id == MuscleGroup.id)
+            .filter(Exercise.id.in_(exercise_ids), MuscleGroup.workout_id == workout_id)
+        )
+    }
+    missing = sorted(exercise_ids - weights.keys())
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Exercises not found: {missing}")
+
+    now = datetime.utcnow()
+    if buffer:
+        await buffer.append([
+            ProgressEvent(None, e.exercise_id, e.current_weight, e.last_weight, e.record_weight, now)
+            for e in entries
+        ])
+        response.status_code = 202
+        return {"message": "Progress accepted", "updated": len(weights)}
+
+    # Apply entries in order so repeated exercises chain like separate requests
+    history_rows = []
+    for entry in entries:
+        state = weights[entry.exercise_id]
+        state["last_weight"], state["current_weight"], state["record_weight"] = next_weights(
+            state["current_weight"], state["record_weight"], entry
+        )
+        history_rows.append({"exercise_id": entry.exercise_id, "weight": entry.current_weight, "date": now})
+
+    await db.execute(update(Exercise), list(weights.values()))
+    await db.execute(insert(ExerciseProgress), history_rows)
+    await db.commit()
+    return {"message": "Progress updated successfully", "updated": len(weights)}
+
+def _history_line(entry: dict) -> str:
+    return json.dumps({
+        "id": entry["id"],
+        "exercise_id": entry["exercise_id"],
+        "weight": entry["weight"],
+        "date": entry["date"].isoformat() if entry["date"] else None
+    }) + "\n"
+
+async def _stream_exercise_history(db: AsyncSession, exercise_id: int, archived: List[dict]) -> AsyncIterator[str]:
+    # Runs after the session dependency has exited, so the stream owns the session from here on.
+    # Archived entries (oldest first) are interleaved newest first with the hot rows.
+    try:
+        result = await db.stream(
+            select(
+                ExerciseProgress.id,
+                ExerciseProgress.exercise_id,
+                ExerciseProgress.weight,
+                ExerciseProgress.date
+            )
+            .filter(ExerciseProgress.exercise_id == exercise_id)
+            .order_by(ExerciseProgress.date.desc())
+            .execution_options(yield_per=HISTORY_STREAM_BATCH_SIZE)
+        )
+        async for rows in result.partitions():
+            lines = []
+            for row in rows:
+                while archived and row.date is not None and archived[-1]["date"] > row.date:
+                    lines.append(_history_line(archived.pop()))
+                lines.append(_history_line(row._mapping))
+            yield "".join(lines)
+        if archived:
+            yield "".join(_history_line(entry) for entry in reversed(archived))
+    finally:
+        await db.close()
+
+async def _exercise_with_archive(db: AsyncSession, exercise_id: int) -> Tuple[Optional[int], int]:
+    # One round trip for the existence check and the archive's entry count
+    archived_count, _ = archive_totals(exercise_id)
+    row = (await db.execute(
+        select(Exercise.id, archived_count).filter(Exercise.id == exercise_id)
+    )).first()
+    return (row[0], row[1]) if row else (None, 0)
+
+async def _exercise_history_stream_response(db: AsyncSession, exercise_id: int) -> StreamingResponse:
+    exercise_exists, archived_count = await _exercise_with_archive(db, exercise_id)
+    if not exercise_exists:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    archived = await load_archived(db, exercise_id) if archived_count else []
+
+    return StreamingResponse(
+        _stream_exercise_history(db, exercise_id, archived),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
 @router.get("/exercises/{exercise_id}/history", response_model=ExerciseHistoryResponse)
-def get_exercise_history(exercise_id: int, db: Session = Depends(get_db)):
-    exercise = db.query(Exercise).filter(Exercise.id == exercise_id).first()
+async def get_exercise_history(
+    exercise_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    buffer: Optional[ProgressBuffer] = Depends(get_progress_buffer)
+):
+    if NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return await _exercise_history_stream_response(db, exercise_id)
+
+    exercise = await db.get(Exercise, exercise_id)
     if not exercise:
         raise HTTPException(status_code=404, detail="Exercise not found")
 
-    history = db.query(ExerciseProgress)\
-        .filter(ExerciseProgress.exercise_id == exercise_id)\
-        .order_by(ExerciseProgress.date.desc())\
-        .all()
+    # History is append-only and the exercise's weights only move with it;
+    # archived entries count too, so archiving a month changes the validator
+    archived_count, archived_max_id = archive_totals(exercise_id)
+    count, max_id, last_modified, archived_count, archived_max_id = (await db.execute(
+        select(
+            func.count(ExerciseProgress.id),
+            func.max(ExerciseProgress.id),
+            func.max(ExerciseProgress.date),
+            archived_count,
+            archived_max_id
+        ).filter(ExerciseProgress.exercise_id == exercise_id)
+    )).one()
+    pending = (await buffer.pending_for([exercise_id])).get(exercise_id, []) if buffer else []
+    etag = make_etag(
+        "exercise-history", exercise_id, count, max_id, archived_count, archived_max_id,
+        pending[-1].seq if pending else None
+    )
+    cached = not_modified_response(request, etag, last_modified)
+    if cached:
+        cached.headers["Vary"] = "Accept"
+        return cached
+
+    async def load_history():
+        return (await db.scalars(
+            select(ExerciseProgress)
+            .filter(ExerciseProgress.exercise_id == exercise_id)
+            .order_by(ExerciseProgress.date.desc())
+        )).all()
+
+    if buffer:
+        async def load_exercise_and_history():
+            # The weights and the history have to come from the same flushed state
+            await db.refresh(exercise)
+            return await load_history()
 
+        history, pending = await buffer.read_your_writes(db, load_exercise_and_history, lambda _: [exercise_id])
+        pending = pending.get(exercise_id, [])
+    else:
+        history = await load_history()
+    if archived_count:
+        archived = await load_archived(db, exercise_id)
+        # Both runs are already sorted, so this sort is a linear merge
+        history = sorted(
+            [*history, *reversed(archived)],
+            key=lambda entry: (entry["date"] if isinstance(entry, dict) else entry.date) or datetime.min,
+            reverse=True
+        )
+
+    if pending:
+        # Unflushed entries carry negative ids until the journal is flushed
+        history = [
+            {"id": -event.seq, "exercise_id": exercise_id, "weight": event.current_weight, "date": event.date}
+            for event in reversed(pending)
+        ] + list(history)
+        exercise = _apply_pending(ExerciseResponse.model_validate(exercise).model_dump(), pending)
+
+    set_validators(response, etag, last_modified)
+    response.headers["Vary"] = "Accept"
     return {
         "exercise": exercise,
         "history": history
-    } 
\ No newline at end of file
+    }
+
+@router.get("/exercises/{exercise_id}/history/stream")
+async def stream_exercise_history(exercise_id: int, db: AsyncSession = Depends(get_read_db)):
+    return await _exercise_history_stream_response(db, exercise_id)
+
+def _bucket_start(dialect_name: str, bucket: str, column):
+    if dialect_name == "sqlite":
+        return type_coerce(func.datetime(column, *SQLITE_BUCKET_MODIFIERS[bucket]), DateTime)
+    return func.date_trunc(bucket, column)
+
+@router.get("/exercises/{exercise_id}/history/points", response_model=ExerciseHistoryPointsResponse)
+async def get_exercise_history_points(
+    exercise_id: int,
+    bucket: Optional[Literal["day", "week", "month"]] = None,
+    date_from: Optional[datetime] = Query(None, alias="from"),
+    date_to: Optional[datetime] = Query(None, alias="to"),
+    max_points: Optional[int] = Query(None, ge=3, le=MAX_HISTORY_POINTS),
+    db: AsyncSession = Depends(get_read_db)
+):
+    exercise_exists, archived_count = await _exercise_with_archive(db, exercise_id)
+    if not exercise_exists:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    date_from = _naive_utc(date_from) if date_from else None
+    date_to = _naive_utc(date_to) if date_to else None
+    archived = await load_archived(db, exercise_id, date_from, date_to) if archived_count else []
+
+    filters = [ExerciseProgress.exercise_id == exercise_id]
+    if date_from is not None:
+        filters.append(ExerciseProgress.date >= date_from)
+    if date_to is not None:
+        filters.append(ExerciseProgress.date < date_to)
+
+    if bucket:
+        # Aggregate per bucket in SQL; row_number picks each bucket's last entry
+        bucket_start = _bucket_start(db.get_bind().dialect.name, bucket, ExerciseProgress.date)
+        window = {"partition_by": bucket_start}
+        ranked = select(
+            bucket_start.label("bucket_start"),
+            ExerciseProgress.weight.label("last_weight"),
+            ExerciseProgress.date.label("last_date"),
+            func.min(ExerciseProgress.weight).over(**window).label("min_weight"),
+            func.max(ExerciseProgress.weight).over(**window).label("max_weight"),
+            func.count(ExerciseProgress.id).over(**window).label("count"),
+            func.row_number().over(
+                order_by=(ExerciseProgress.date.desc(), ExerciseProgress.id.desc()), **window
+            ).label("rank")
+        ).filter(*filters).subquery()
+        rows = (await db.execute(
+            select(
+                ranked.c.bucket_start,
+                ranked.c.min_weight,
+                ranked.c.max_weight,
+                ranked.c.last_weight,
+                ranked.c["count"],
+                ranked.c.last_date
+            ).filter(ranked.c.rank == 1).order_by(ranked.c.bucket_start)
+        )).all()
+        if archived:
+            rows = merge_buckets(rows, archived, bucket)
+    else:
+        # Raw entries, shaped like single-entry buckets
+        result = await db.execute(
+            select(ExerciseProgress.date, ExerciseProgress.weight)
+            .filter(*filters)
+            .order_by(ExerciseProgress.date, ExerciseProgress.id)
+        )
+        rows = [(date, weight, weight, weight, 1) for date, weight in result]
+        if archived:
+            rows = sorted(
+                rows + [(entry["date"], entry["weight"], entry["weight"], entry["weight"], 1) for entry in archived],
+                key=lambda row: row[0] or datetime.min
+            )
+
+    if max_points and len(rows) > max_points:
+        series = [(row[0].timestamp(), row[3]) for row in rows]
+        rows = [rows[i] for i in lttb_indices(series, max_points)]
+
+    return {
+        "exercise_id": exercise_id,
+        "bucket": bucket,
+        "points": [
+            {
+                "bucket_start": bucket_start,
+                "min_weight": min_weight,
+                "max_weight": max_weight,
+                "last_weight": last_weight,
+                "count": count
+            }
+            for bucket_start, min_weight, max_weight, last_weight, count, *_ in rows
+        ]
+    }
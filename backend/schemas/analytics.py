@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+class ExerciseAnalytics(BaseModel):
+    exercise_id: int
+    exercise_name: str
+    entries: int
+    first_date: datetime
+    last_date: datetime
+    latest_weight: float
+    max_weight: float
+    total_volume: float
+    best_epley_1rm: float
+    best_brzycki_1rm: Optional[float] = None
+    rolling_average: float
+    trend_per_week: float
+
+class ExerciseAnalyticsPoint(BaseModel):
+    date: datetime
+    weight: float
+    volume: float
+    epley_1rm: float
+    brzycki_1rm: Optional[float] = None
+    rolling_average: float
+
+class ExerciseAnalyticsDetail(BaseModel):
+    summary: ExerciseAnalytics
+    series: List[ExerciseAnalyticsPoint]
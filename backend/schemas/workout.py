@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, field_validator
 from typing import List, Optional
 from datetime import datetime
+import recurrence
 
 class ExerciseBase(BaseModel):
     name: str
@@ -34,6 +35,15 @@ class MuscleGroupResponse(MuscleGroupBase):
 
 class WorkoutBase(BaseModel):
     name: str
+    scheduled_date: Optional[datetime] = None
+    recurrence_rule: Optional[str] = None
+
+    @field_validator("recurrence_rule")
+    @classmethod
+    def check_recurrence_rule(cls, value):
+        if value is not None:
+            recurrence.parse_rule(value)
+        return value
 
 class WorkoutCreate(WorkoutBase):
     muscle_groups: List[MuscleGroupCreate]
@@ -51,6 +61,13 @@ class ExerciseProgressUpdate(BaseModel):
     last_weight: Optional[int] = None
     record_weight: Optional[int] = None
 
+class ExerciseProgressBatchItem(ExerciseProgressUpdate):
+    exercise_id: int
+
+class ExerciseProgressBatchResponse(BaseModel):
+    message: str
+    updated: int
+
 class ExerciseProgressResponse(BaseModel):
     id: int
     exercise_id: int
@@ -61,4 +78,23 @@ class ExerciseProgressResponse(BaseModel):
 
 class ExerciseHistoryResponse(BaseModel):
     exercise: ExerciseResponse
-    history: List[ExerciseProgressResponse] 
\ No newline at end of file
+    history: List[ExerciseProgressResponse]
+
+class HistoryPoint(BaseModel):
+    bucket_start: datetime
+    min_weight: float
+    max_weight: float
+    last_weight: float
+    count: int
+
+class ExerciseHistoryPointsResponse(BaseModel):
+    exercise_id: int
+    bucket: Optional[str] = None
+    points: List[HistoryPoint]
+
+class ScheduledWorkout(BaseModel):
+    id: int
+    name: str
+    scheduled_date: datetime
+    is_completed: bool
+    is_recurring: bool = False
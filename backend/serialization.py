@@ -0,0 +1,22 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+from typing import Any, Mapping, Optional
+
+class PydanticJSONResponse(Response):
+    # Encodes straight to JSON bytes with pydantic-core. Returning it from a route
+    # skips FastAPI's response_model validate/serialize/encode round trip, while the
+    # route's declared response_model still drives the OpenAPI schema.
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        adapter: TypeAdapter,
+        content: Any,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None
+    ):
+        self.adapter = adapter
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        return self.adapter.dump_json(content)
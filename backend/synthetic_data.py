@@ -0,0 +1,222 @@
+import csv
+import io
+from datetime import datetime
+import numpy as np
+from sqlalchemy import func, select
+
+# Synthetic training data at production scale. Rows are generated per block of
+# users with NumPy and written straight through the DBAPI connection: COPY on
+# PostgreSQL, executemany in one transaction per block elsewhere.
+
+# Muscle group -> (exercise, typical working weight in kg)
+CATALOG = [
+    ("Chest", [("Bench Press", 60.0), ("Incline Dumbbell Press", 22.5), ("Cable Fly", 15.0)]),
+    ("Back", [("Deadlift", 100.0), ("Barbell Row", 60.0), ("Lat Pulldown", 50.0)]),
+    ("Legs", [("Squat", 80.0), ("Romanian Deadlift", 70.0), ("Leg Press", 120.0)]),
+    ("Shoulders", [("Overhead Press", 40.0), ("Lateral Raise", 8.0), ("Face Pull", 20.0)]),
+    ("Arms", [("Barbell Curl", 30.0), ("Triceps Pushdown", 25.0), ("Hammer Curl", 12.5)]),
+]
+
+WORKOUT_NAMES = ["Push Day", "Pull Day", "Leg Day", "Upper Body", "Lower Body", "Full Body"]
+
+# Same bcrypt hash as the sample admin ("password")
+PASSWORD_HASH = "$2b$12$EixZaYVK1fsbw1ZfbX3OXePaWxn96p36WQoeG6Lruj3vjPGga31lW"
+
+PLATE_STEP = 2.5
+DELOAD_EVERY = 12
+MIN_SESSION_GAP_DAYS = 2
+MAX_SESSION_GAP_DAYS = 5
+
+class BulkWriter:
+    def __init__(self, engine):
+        self.dialect = engine.dialect.name
+        self.connection = engine.raw_connection()
+        self.cursor = self.connection.cursor()
+        self.placeholder = "?" if engine.dialect.paramstyle == "qmark" else "%s"
+
+    def write(self, table: str, columns, rows):
+        if not rows:
+            return
+        if self.dialect == "postgresql":
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            buffer.seek(0)
+            self.cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        else:
+            placeholders = ", ".join([self.placeholder] * len(columns))
+            self.cursor.executemany(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows
+            )
+
+    def commit(self):
+        self.connection.commit()
+
+    def close(self):
+        self.cursor.close()
+        self.connection.close()
+
+def _next_ids(engine, tables):
+    with engine.connect() as connection:
+        return {
+            table.name: (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+            for table in tables
+        }
+
+def _reset_sequences(engine, tables):
+    # Explicit ids bypass the serial sequences, so move them past the new rows
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as connection:
+        for table in tables:
+            connection.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table.name}), 1))"
+            )
+
+def _timestamps(values):
+    # Same text layout SQLAlchemy uses for DateTime on SQLite; PostgreSQL parses it too
+    return np.char.replace(np.datetime_as_string(values, unit="us"), "T", " ").tolist()
+
+def weight_progressions(rng, base_weights, sessions):
+    # Logarithmic gains from a per-lifter starting point, a deload every few
+    # weeks, session-to-session noise, rounded to the nearest plate step
+    count = len(base_weights)
+    start = base_weights * rng.uniform(0.5, 1.3, count)
+    rate = rng.uniform(0.15, 0.6, count)
+    t = np.arange(sessions)
+    weights = start[:, None] * (1 + rate[:, None] * np.log1p(t / 8.0))
+    deload = (t % DELOAD_EVERY) == DELOAD_EVERY - 1
+    weights[:, deload] *= 0.9
+    weights += rng.normal(0, 0.02, (count, sessions)) * start[:, None]
+    return np.maximum(np.round(weights / PLATE_STEP) * PLATE_STEP, PLATE_STEP)
+
+def session_dates(rng, count, sessions, now):
+    # Sessions every few days, with each exercise's last session close to `now`
+    gaps = rng.integers(MIN_SESSION_GAP_DAYS, MAX_SESSION_GAP_DAYS + 1, (count, sessions)).astype("timedelta64[D]")
+    offsets = np.cumsum(gaps[:, ::-1], axis=1)[:, ::-1] - gaps[:, -1:]
+    jitter = rng.integers(0, 12 * 3600, (count, sessions)).astype("timedelta64[s]")
+    return np.datetime64(now, "s") - offsets - jitter
+
+def generate(
+    engine,
+    users: int,
+    workouts_per_user: int = 2,
+    muscle_groups_per_workout: int = 3,
+    exercises_per_group: int = 3,
+    history_per_exercise: int = 100,
+    chunk_size: int = 50000,
+    seed: int = 0,
+    progress=None
+):
+    # The api models reuse table names from models.workout, so they are only
+    # imported into Base when data is actually generated
+    from api.models.user import User
+    from api.models.workout import Workout
+    from api.models.muscle_group import MuscleGroup
+    from api.models.exercise import Exercise, WeightHistory
+
+    tables = [User.__table__, Workout.__table__, MuscleGroup.__table__, Exercise.__table__, WeightHistory.__table__]
+    ids = _next_ids(engine, tables)
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+    now_text = now.isoformat(sep=" ")
+    groups_per_user = workouts_per_user * muscle_groups_per_workout
+    exercises_per_user = groups_per_user * exercises_per_group
+    # Enough users per block that each transaction writes about `chunk_size` history rows
+    block = max(1, chunk_size // max(1, exercises_per_user * history_per_exercise))
+
+    writer = BulkWriter(engine)
+    counts = dict.fromkeys(["users", "workouts", "muscle_groups", "exercises", "weight_history"], 0)
+    try:
+        for block_start in range(0, users, block):
+            n_users = min(block, users - block_start)
+            n_workouts = n_users * workouts_per_user
+            n_groups = n_workouts * muscle_groups_per_workout
+            n_exercises = n_groups * exercises_per_group
+
+            user_ids = np.arange(ids["users"], ids["users"] + n_users)
+            workout_ids = np.arange(ids["workouts"], ids["workouts"] + n_workouts)
+            group_ids = np.arange(ids["muscle_groups"], ids["muscle_groups"] + n_groups)
+            exercise_ids = np.arange(ids["exercises"], ids["exercises"] + n_exercises)
+
+            writer.write("users", ["id", "email", "hashed_password", "is_active", "is_superuser"], [
+                (int(uid), f"user{uid}@example.com", PASSWORD_HASH, True, False) for uid in user_ids
+            ])
+
+            created = _timestamps(np.datetime64(now, "s") - rng.integers(0, 730, n_workouts).astype("timedelta64[D]"))
+            completed = rng.random(n_workouts) < 0.7
+            writer.write(
+                "workouts",
+                ["id", "name", "description", "user_id", "created_at", "updated_at", "is_completed", "completed_at"],
+                [
+                    (int(wid), WORKOUT_NAMES[wid % len(WORKOUT_NAMES)], None,
+                     int(user_ids[i // workouts_per_user]), created[i], created[i],
+                     bool(completed[i]), created[i] if completed[i] else None)
+                    for i, wid in enumerate(workout_ids)
+                ]
+            )
+
+            # Group and exercise kinds rotate through the catalog so every lift is covered
+            group_kinds = (group_ids % len(CATALOG)).astype(int)
+            writer.write("muscle_groups", ["id", "name", "description", "workout_id"], [
+                # Names are unique across the table
+                (int(gid), f"{CATALOG[group_kinds[i]][0]} #{gid}", None, int(workout_ids[i // muscle_groups_per_workout]))
+                for i, gid in enumerate(group_ids)
+            ])
+
+            exercise_groups = np.repeat(np.arange(n_groups), exercises_per_group)
+            exercise_kinds = [
+                CATALOG[group_kinds[g]][1][(i % exercises_per_group) % len(CATALOG[group_kinds[g]][1])]
+                for i, g in enumerate(exercise_groups)
+            ]
+            base_weights = np.array([weight for _, weight in exercise_kinds])
+
+            weights = weight_progressions(rng, base_weights, history_per_exercise)
+            dates = session_dates(rng, n_exercises, history_per_exercise, now)
+
+            if history_per_exercise:
+                current = weights[:, -1]
+                last = weights[:, -2] if history_per_exercise > 1 else current
+                record = weights.max(axis=1)
+            else:
+                current = last = record = np.zeros(n_exercises)
+            writer.write(
+                "exercises",
+                ["id", "name", "description", "muscle_group_id", "sets", "reps", "current_weight",
+                 "last_weight", "record_weight", "created_at", "updated_at"],
+                [
+                    (int(eid), exercise_kinds[i][0], None, int(group_ids[exercise_groups[i]]), 3, 10,
+                     float(current[i]), float(last[i]), float(record[i]), now_text, now_text)
+                    for i, eid in enumerate(exercise_ids)
+                ]
+            )
+
+            n_history = n_exercises * history_per_exercise
+            writer.write(
+                "weight_history",
+                ["id", "exercise_id", "weight", "date", "created_at"],
+                list(zip(
+                    range(ids["weight_history"], ids["weight_history"] + n_history),
+                    np.repeat(exercise_ids, history_per_exercise).tolist(),
+                    weights.ravel().tolist(),
+                    _timestamps(dates.ravel()),
+                    _timestamps(dates.ravel())
+                ))
+            )
+            writer.commit()
+
+            ids["users"] += n_users
+            ids["workouts"] += n_workouts
+            ids["muscle_groups"] += n_groups
+            ids["exercises"] += n_exercises
+            ids["weight_history"] += n_history
+            for name, added in [("users", n_users), ("workouts", n_workouts), ("muscle_groups", n_groups),
+                                ("exercises", n_exercises), ("weight_history", n_history)]:
+                counts[name] += added
+            if progress:
+                progress(counts)
+    finally:
+        writer.close()
+
+    _reset_sequences(engine, tables)
+    return counts
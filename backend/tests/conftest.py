@@ -1,12 +1,27 @@
+import os
+
+# Tests build their own tables, so skip the alembic revision check on startup
+os.environ.setdefault("SCHEMA_CHECK", "off")
+
+import re
+from collections import Counter
+from contextlib import contextmanager
+from unittest.mock import patch
 import pytest
-from sqlalchemy import create_engine
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+import database
 from app import app
-from database import Base
-import os
+from database import ALEMBIC_INI, Base, get_async_db, get_read_db
 
 # Test database URL - using SQLite for tests
 TEST_DATABASE_URL = "sqlite:///./test.db"
+ASYNC_TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
 
 @pytest.fixture(scope="session")
 def test_db():
@@ -31,4 +46,115 @@ def test_db():
 def test_app():
     # Override the database URL for testing
     app.dependency_overrides = {}
-    return app 
\ No newline at end of file
+    return app 
+
+@contextmanager
+def app_engines_on(database_url, async_database_url):
+    # Engines the app creates itself (readiness ping, pool stats) point at the test
+    # database too, and are created afresh for the test and dropped after it
+    def reset():
+        database._engine = database._async_engine = database._replica_engine = database._read_router = None
+
+    reset()
+    try:
+        with patch.object(database, "get_database_urls", return_value=(database_url, async_database_url)):
+            yield
+    finally:
+        reset()
+
+@contextmanager
+def api_client(database_url, async_database_url):
+    # Route every request through an async session on the given database
+    async_engine = create_async_engine(async_database_url)
+    TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_read_db] = override_get_async_db
+    try:
+        with app_engines_on(database_url, async_database_url), TestClient(app) as client:
+            yield client
+            client.portal.call(async_engine.dispose)
+    finally:
+        app.dependency_overrides = {}
+
+@pytest.fixture
+def client(test_db):
+    with api_client(TEST_DATABASE_URL, ASYNC_TEST_DATABASE_URL) as client:
+        yield client
+
+    # Leave the tables empty for the next test
+    for table in reversed(Base.metadata.sorted_tables):
+        test_db.execute(table.delete())
+    test_db.commit()
+
+@pytest.fixture(params=["fresh", "stamped"])
+def migrated_client(request, tmp_path, monkeypatch):
+    # The API on a schema built by `alembic upgrade head`, the way production gets
+    # its tables, rather than by create_all from the models. "stamped" is a
+    # database from before the chain: its create_all made muscle group names
+    # unique, then it was stamped onto the baseline as migrations/README.md says.
+    monkeypatch.chdir(tmp_path)
+    config = Config(ALEMBIC_INI)
+    if request.param == "stamped":
+        command.upgrade(config, "0001_baseline")
+        engine = create_engine("sqlite:///./training_app.db")
+        with engine.begin() as connection:
+            connection.exec_driver_sql("DROP INDEX ix_muscle_groups_name")
+            connection.exec_driver_sql("CREATE UNIQUE INDEX ix_muscle_groups_name ON muscle_groups (name)")
+        engine.dispose()
+    command.upgrade(config, "head")
+    with api_client("sqlite:///./training_app.db", "sqlite+aiosqlite:///./training_app.db") as client:
+        yield client
+
+def normalize_statement(statement):
+    # Literals and whitespace aside, the same statement twice is the same query shape
+    statement = re.sub(r"'(?:[^']|'')*'", "?", statement)
+    statement = re.sub(r"\b\d+(?:\.\d+)?\b", "?", statement)
+    statement = re.sub(r"\(\s*\?(?:\s*,\s*\?)*\s*\)", "(?)", statement)
+    return " ".join(statement.split())
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __len__(self):
+        return len(self.statements)
+
+    def repeated(self, max_repeats=1):
+        shapes = Counter(normalize_statement(statement) for statement in self.statements)
+        return {shape: count for shape, count in shapes.items() if count > max_repeats}
+
+    def report(self):
+        return "\n".join(f"  {i}. {' '.join(s.split())}" for i, s in enumerate(self.statements, start=1))
+
+@contextmanager
+def count_queries(max_queries=None, max_repeats=1):
+    """Count SQL statements run inside the block on any engine.
+
+    Fails the test when more than `max_queries` statements run, or when one
+    statement shape runs more than `max_repeats` times (the usual N+1 pattern).
+    """
+    counter = QueryCounter()
+    event.listen(Engine, "before_cursor_execute", counter._record)
+    try:
+        yield counter
+    finally:
+        event.remove(Engine, "before_cursor_execute", counter._record)
+
+    if max_queries is not None and len(counter) > max_queries:
+        pytest.fail(f"{len(counter)} queries, budget is {max_queries}:\n{counter.report()}")
+    repeated = counter.repeated(max_repeats)
+    if repeated:
+        lines = "\n".join(f"  {count}x {shape}" for shape, count in repeated.items())
+        pytest.fail(f"Repeated statements (possible N+1):\n{lines}\nAll statements:\n{counter.report()}")
+
+@pytest.fixture
+def query_counter():
+    return count_queries
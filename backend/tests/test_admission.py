@@ -0,0 +1,79 @@
+import asyncio
+from admission import AdmissionController, AdmissionControlMiddleware
+
+def make_scope(method="GET", path="/api/workouts", headers=()):
+    return {"type": "http", "method": method, "path": path, "headers": list(headers)}
+
+async def call(middleware, scope):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    return messages[0]
+
+def test_queue_overflow_sheds_lowest_priority_first():
+    async def scenario():
+        release = asyncio.Event()
+        served = []
+
+        async def app(scope, receive, send):
+            await release.wait()
+            served.append(scope["method"])
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        controller = AdmissionController(max_concurrency=1, max_queue=1, queue_timeout=5)
+        middleware = AdmissionControlMiddleware(app, controller, retry_after=3)
+
+        running = asyncio.create_task(call(middleware, make_scope()))
+        await asyncio.sleep(0)
+        write = asyncio.create_task(call(middleware, make_scope("POST", "/api/workouts/bulk")))
+        await asyncio.sleep(0)
+        assert controller.stats()["queued"] == 1
+
+        # A cheap conditional read takes the queued write's place
+        cached = asyncio.create_task(call(middleware, make_scope(headers=[(b"if-none-match", b'"x"')])))
+        evicted = await write
+        assert evicted["status"] == 503
+        assert (b"retry-after", b"3") in evicted["headers"]
+
+        # Nothing ranks below another plain read, so it is turned away at the door
+        rejected = await call(middleware, make_scope())
+        assert rejected["status"] == 503
+
+        release.set()
+        assert (await running)["status"] == 200
+        assert (await cached)["status"] == 200
+        assert served == ["GET", "GET"]
+        assert controller.stats() == {
+            "in_flight": 0, "queued": 0, "max_concurrency": 1, "max_queue": 1,
+            "rejected": {"high": 0, "normal": 1, "low": 1}
+        }
+
+    asyncio.run(scenario())
+
+def test_queued_request_times_out_and_probes_bypass():
+    async def scenario():
+        release = asyncio.Event()
+
+        async def app(scope, receive, send):
+            if scope["path"] != "/health/live":
+                await release.wait()
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+
+        controller = AdmissionController(max_concurrency=1, max_queue=5, queue_timeout=0.05)
+        middleware = AdmissionControlMiddleware(app, controller)
+        running = asyncio.create_task(call(middleware, make_scope()))
+        await asyncio.sleep(0)
+
+        assert (await call(middleware, make_scope()))["status"] == 503
+        assert (await call(middleware, make_scope(path="/health/live")))["status"] == 200
+        release.set()
+        assert (await running)["status"] == 200
+        assert controller.in_flight == 0
+
+    asyncio.run(scenario())
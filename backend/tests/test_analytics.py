@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta
+import pytest
+import training_analytics
+from routes import analytics
+from models.workout import ExerciseProgress
+
+def make_rows(exercise_id, name, weights, sets=3, reps=10, start=datetime(2024, 1, 1)):
+    return [
+        (exercise_id, name, start + timedelta(days=7 * i), weight, sets, reps)
+        for i, weight in enumerate(weights)
+    ]
+
+def test_summarize_computes_metrics_per_exercise():
+    rows = make_rows(1, "Squat", [100, 105, 110, 115]) + make_rows(2, "Bench", [60, 60], reps=40)
+    summary = training_analytics.summarize(training_analytics.load_history(rows), window=2)
+
+    squat, bench = summary
+    assert squat["entries"] == 4
+    assert squat["latest_weight"] == 115
+    assert squat["total_volume"] == 3 * 10 * (100 + 105 + 110 + 115)
+    assert squat["best_epley_1rm"] == pytest.approx(115 * (1 + 10 / 30))
+    assert squat["best_brzycki_1rm"] == pytest.approx(115 * 36 / 27)
+    assert squat["rolling_average"] == pytest.approx(112.5)
+    # +5kg every week
+    assert squat["trend_per_week"] == pytest.approx(5)
+
+    assert bench["entries"] == 2
+    assert bench["best_brzycki_1rm"] is None
+    assert bench["trend_per_week"] == pytest.approx(0)
+
+def test_rolling_average_does_not_cross_exercises():
+    rows = make_rows(1, "Squat", [100, 200]) + make_rows(2, "Bench", [10, 20, 30])
+    points = training_analytics.series(training_analytics.load_history(rows), window=3)
+    assert [p["rolling_average"] for p in points] == [100, 150, 10, 15, 20]
+
+def test_analytics_endpoints(client, test_db):
+    response = client.post("/api/workouts", json={
+        "name": "Legs",
+        "muscle_groups": [{"name": "Legs", "exercises": [{"name": "Squat", "sets": 5, "reps": 5}]}]
+    })
+    exercise_id = response.json()["muscle_groups"][0]["exercises"][0]["id"]
+    test_db.add_all([
+        ExerciseProgress(exercise_id=exercise_id, weight=weight, date=datetime(2024, 1, 1) + timedelta(days=i))
+        for i, weight in enumerate([100, 102, 104])
+    ])
+    test_db.commit()
+    window = {"from": "2024-01-01T00:00:00", "to": "2024-02-01T00:00:00"}
+
+    summaries = client.get("/api/analytics/exercises", params=window).json()
+    assert [s["exercise_name"] for s in summaries] == ["Squat"]
+    assert summaries[0]["trend_per_week"] == pytest.approx(14)
+
+    detail = client.get(f"/api/analytics/exercises/{exercise_id}", params=window).json()
+    assert [p["weight"] for p in detail["series"]] == [100, 102, 104]
+    assert detail["series"][0]["volume"] == 100 * 5 * 5
+
+    assert client.get("/api/analytics/exercises/999999", params=window).status_code == 404
+
+def test_analytics_reads_a_bounded_window(client, test_db):
+    response = client.post("/api/workouts", json={
+        "name": "Legs",
+        "muscle_groups": [{"name": "Legs", "exercises": [
+            {"name": "Squat", "sets": 5, "reps": 5}, {"name": "Lunge", "sets": 3, "reps": 10}
+        ]}]
+    })
+    squat, lunge = (e["id"] for e in response.json()["muscle_groups"][0]["exercises"])
+    recent = datetime.utcnow() - timedelta(days=30)
+    test_db.add_all([
+        ExerciseProgress(exercise_id=squat, weight=90, date=datetime(2020, 1, 1)),
+        ExerciseProgress(exercise_id=squat, weight=100, date=recent),
+        ExerciseProgress(exercise_id=squat, weight=110, date=recent + timedelta(days=7)),
+        ExerciseProgress(exercise_id=lunge, weight=40, date=recent),
+    ])
+    test_db.commit()
+
+    # Without bounds only the last year is read
+    detail = client.get(f"/api/analytics/exercises/{squat}").json()
+    assert [p["weight"] for p in detail["series"]] == [100, 110]
+
+    summaries = client.get("/api/analytics/exercises", params={"exercise_id": lunge}).json()
+    assert [s["exercise_name"] for s in summaries] == ["Lunge"]
+
+    assert client.get("/api/analytics/exercises", params={"from": "2020-01-01T00:00:00"}).status_code == 422
+    assert client.get("/api/analytics/exercises", params={
+        "from": "2024-02-01T00:00:00", "to": "2024-01-01T00:00:00"
+    }).status_code == 422
+
+def test_analytics_caps_rows(client, test_db, monkeypatch):
+    response = client.post("/api/workouts", json={
+        "name": "Legs",
+        "muscle_groups": [{"name": "Legs", "exercises": [{"name": "Squat", "sets": 5, "reps": 5}]}]
+    })
+    exercise_id = response.json()["muscle_groups"][0]["exercises"][0]["id"]
+    recent = datetime.utcnow() - timedelta(days=3)
+    test_db.add_all([
+        ExerciseProgress(exercise_id=exercise_id, weight=100, date=recent + timedelta(hours=i)) for i in range(3)
+    ])
+    test_db.commit()
+
+    monkeypatch.setattr(analytics, "MAX_HISTORY_ROWS", 2)
+    response = client.get("/api/analytics/exercises")
+    assert response.status_code == 422
+    assert "narrow the window" in response.json()["detail"]
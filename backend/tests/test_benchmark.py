@@ -0,0 +1,22 @@
+from benchmark import compare, run_benchmark
+
+def test_benchmark_reports_every_endpoint(tmp_path):
+    results = run_benchmark(
+        database_url=f"sqlite:///{tmp_path / 'bench.db'}",
+        users=2, workouts_per_user=2, muscle_groups=2, exercises=2, history=5,
+        requests=5, concurrency=2, warmup=1
+    )
+    assert results["meta"]["dialect"] == "sqlite"
+    assert set(results["endpoints"]) >= {"list_workouts", "exercise_history", "log_progress"}
+    for row in results["endpoints"].values():
+        assert row["errors"] == 0
+        assert row["queries_per_request"] > 0
+        assert row["p50_ms"] <= row["p95_ms"] <= row["p99_ms"]
+
+def test_compare_flags_extra_queries_and_slowdowns():
+    baseline = {"endpoints": {"list_workouts": {"p95_ms": 10.0, "queries_per_request": 2, "errors": 0}}}
+    results = {"endpoints": {"list_workouts": {"p95_ms": 11.0, "queries_per_request": 2, "errors": 0}}}
+    assert compare(results, baseline, tolerance=0.2) == []
+
+    results["endpoints"]["list_workouts"].update(p95_ms=20.0, queries_per_request=3)
+    assert len(compare(results, baseline, tolerance=0.2)) == 2
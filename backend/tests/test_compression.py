@@ -0,0 +1,75 @@
+import asyncio
+import zlib
+from fastapi import FastAPI
+from compression import ENCODERS, CompressionMiddleware, choose_encoding
+from metrics import render
+
+def test_choose_encoding_honours_q_values():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("br;q=0.5, gzip") == "gzip"
+    assert choose_encoding("*") == next(iter(ENCODERS))
+
+def test_large_responses_are_compressed_and_small_ones_are_not(client):
+    client.post("/api/workouts/bulk", json=[
+        {"name": f"Workout {i}", "muscle_groups": [
+            {"name": "Chest", "exercises": [{"name": "Bench Press", "sets": 3, "reps": 10}]}
+        ]}
+        for i in range(30)
+    ])
+
+    identity = client.get("/api/workouts", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+
+    compressed = client.get("/api/workouts", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert compressed.headers["etag"] == f"W/{identity.headers['etag']}"
+    assert int(compressed.headers["content-length"]) < len(identity.content) / 3
+    assert compressed.json() == identity.json()
+
+    # The weak ETag still validates
+    cached = client.get("/api/workouts", headers={"Accept-Encoding": "gzip", "If-None-Match": compressed.headers["etag"]})
+    assert cached.status_code == 304
+
+    small = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    assert 'http_response_compression_ratio_count{encoding="gzip",route="/api/workouts"}' in render()[0].decode()
+
+def test_streamed_bodies_are_compressed_chunk_by_chunk():
+    lines = [b'{"n": %d}\n' % i * 50 for i in range(3)]
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/x-ndjson")]})
+        for line in lines:
+            await send({"type": "http.response.body", "body": line, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def scenario():
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        async def receive():
+            return {"type": "http.request"}
+
+        # offload_size=1 sends every chunk through the threadpool
+        middleware = CompressionMiddleware(app, minimum_size=10**6, offload_size=1)
+        scope = {"type": "http", "method": "GET", "path": "/stream", "headers": [(b"accept-encoding", b"gzip")], "app": FastAPI()}
+        await middleware(scope, receive, send)
+        return messages
+
+    messages = asyncio.run(scenario())
+    headers = dict(messages[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip"
+    assert b"content-length" not in headers
+
+    # Each chunk decodes on arrival, before the stream ends
+    decoder = zlib.decompressobj(31)
+    for line, message in zip(lines, messages[1:]):
+        assert decoder.decompress(message["body"]) == line
+    decoder.decompress(messages[-1]["body"])
+    assert decoder.eof
@@ -0,0 +1,24 @@
+import importlib
+import os
+import pytest
+
+@pytest.fixture
+def conf(monkeypatch, tmp_path):
+    # Importing the config must not switch this process to multiprocess metrics
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path / "prometheus"))
+    return importlib.import_module("gunicorn_conf")
+
+def test_cgroup_v2_quota(conf, tmp_path):
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    assert conf.cpu_quota(str(tmp_path)) == 1.5
+    assert conf.default_workers(str(tmp_path)) == min(2, len(os.sched_getaffinity(0)))
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    assert conf.cpu_quota(str(tmp_path)) is None
+
+def test_cgroup_v1_quota_and_minimum(conf, tmp_path):
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("25000\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    assert conf.cpu_quota(str(tmp_path)) == 0.25
+    assert conf.default_workers(str(tmp_path)) == 1
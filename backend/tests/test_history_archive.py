@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta
+from history_archive import archive_before
+from models.workout import ExerciseProgress, ExerciseProgressArchive
+
+def _responses(client, exercise_id):
+    base = f"/api/exercises/{exercise_id}/history"
+    return {
+        "history": client.get(base).json()["history"],
+        "stream": client.get(f"{base}/stream").text,
+        "weekly": client.get(f"{base}/points", params={"bucket": "week"}).json(),
+        "monthly": client.get(f"{base}/points", params={"bucket": "month", "from": "2024-01-15T00:00:00"}).json(),
+        # Aware bounds are converted to the naive UTC the dates are stored in
+        "monthly_utc": client.get(f"{base}/points", params={"bucket": "month", "from": "2024-01-15T00:00:00Z"}).json(),
+        "raw_offset": client.get(f"{base}/points", params={"to": "2024-01-15T02:00:00+02:00"}).json(),
+        "raw": client.get(f"{base}/points", params={"max_points": 20}).json(),
+    }
+
+def test_archived_months_are_merged_into_history(client, test_db):
+    workout = client.post("/api/workouts", json={
+        "name": "Legs",
+        "muscle_groups": [{"name": "Legs", "exercises": [{"name": "Squat", "sets": 5, "reps": 5}]}]
+    }).json()
+    exercise_id = workout["muscle_groups"][0]["exercises"][0]["id"]
+    start = datetime(2024, 1, 1, 8)
+    test_db.add_all([
+        ExerciseProgress(exercise_id=exercise_id, weight=100 + day + half, date=start + timedelta(days=day, hours=half * 8))
+        for day in range(60)
+        for half in range(2)
+    ])
+    test_db.commit()
+
+    before = _responses(client, exercise_id)
+    assert before["monthly_utc"] == before["monthly"]
+    assert before["raw_offset"]["points"][-1]["bucket_start"] == "2024-01-14T16:00:00"
+    etag = client.get(f"/api/exercises/{exercise_id}/history").headers["ETag"]
+
+    # January goes to the archive; the week spanning Jan 29 - Feb 4 ends up split across both tables
+    assert archive_before(test_db.get_bind(), datetime(2024, 2, 15)) == 62
+    test_db.expire_all()
+    assert test_db.query(ExerciseProgress).filter(ExerciseProgress.date < datetime(2024, 2, 1)).count() == 0
+    assert test_db.query(ExerciseProgressArchive).one().entry_count == 62
+
+    assert _responses(client, exercise_id) == before
+    assert client.get(f"/api/exercises/{exercise_id}/history").headers["ETag"] != etag
+
+    # A late entry for an archived month is merged into the existing archive row
+    test_db.add(ExerciseProgress(exercise_id=exercise_id, weight=50, date=datetime(2024, 1, 10, 12)))
+    test_db.commit()
+    assert archive_before(test_db.get_bind(), datetime(2024, 2, 15)) == 1
+    test_db.expire_all()
+    assert test_db.query(ExerciseProgressArchive).one().entry_count == 63
+    history = client.get(f"/api/exercises/{exercise_id}/history").json()["history"]
+    assert len(history) == 121
+    assert [h["date"] for h in history] == sorted((h["date"] for h in history), reverse=True)
@@ -0,0 +1,90 @@
+import os
+import subprocess
+import sys
+from prometheus_client import multiprocess
+from prometheus_client.parser import text_string_to_metric_families
+from database import get_async_engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A gunicorn worker: reports its pool and the shared journal, then exits
+WORKER_SCRIPT = """
+import os
+import metrics
+metrics.update_pool_gauges({"async": {"checked_out": 2, "size": 5, "overflow": 1}})
+metrics.observe_progress_flush(0, 0.01, 7)
+print(os.getpid())
+"""
+
+RENDER_SCRIPT = """
+import metrics
+print(metrics.render()[0].decode())
+"""
+
+def sample_value(text, name, **labels):
+    for family in text_string_to_metric_families(text):
+        for sample in family.samples:
+            if sample.name == name and all(sample.labels.get(k) == v for k, v in labels.items()):
+                return sample.value
+    return None
+
+def test_metrics_record_route_latency_and_queries(client):
+    before = client.get("/metrics").text
+    count_before = sample_value(before, "http_request_duration_seconds_count", route="/api/workouts", method="GET", status="200") or 0
+    queries_before = sample_value(before, "http_request_db_queries_sum", route="/api/workouts", method="GET") or 0
+
+    client.post("/api/workouts", json={"name": "Push", "muscle_groups": []})
+    assert client.get("/api/workouts").status_code == 200
+    assert client.get("/api/workouts/does-not-exist").status_code in (404, 405, 422)
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert sample_value(text, "http_request_duration_seconds_count", route="/api/workouts", method="GET", status="200") == count_before + 1
+    # Labelled by route template, and the request's statements are attributed to it
+    assert sample_value(text, "http_request_db_queries_sum", route="/api/workouts", method="GET") > queries_before
+    assert sample_value(text, "http_response_size_bytes_count", route="/api/workouts", method="POST") >= 1
+    assert 'route="/api/workouts/does-not-exist"' not in text
+
+def test_liveness_and_readiness(client):
+    assert client.get("/health/live").json() == {"status": "alive"}
+
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["database"] == "ok"
+    assert "async" in body["pools"]
+    assert body["replica"]["configured"] is False
+    # The probe pinged the test database, not the app's own file
+    assert get_async_engine().url.database == "./test.db"
+
+def run_in_multiprocess_dir(script, directory):
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env={**os.environ, "PYTHONPATH": BACKEND_DIR, "PROMETHEUS_MULTIPROC_DIR": str(directory)},
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+def test_gauges_drop_dead_workers_across_processes(tmp_path):
+    pids = [int(run_in_multiprocess_dir(WORKER_SCRIPT, tmp_path)) for _ in range(2)]
+    text = run_in_multiprocess_dir(RENDER_SCRIPT, tmp_path)
+    assert sample_value(text, "db_pool_checked_out", pool="async") == 4
+    assert sample_value(text, "db_pool_size", pool="async") == 10
+    assert sample_value(text, "db_pool_overflow", pool="async") == 2
+    assert sample_value(text, "progress_journal_pending_events") == 7
+
+    # What gunicorn_conf.child_exit does when a worker goes away
+    multiprocess.mark_process_dead(pids[0], str(tmp_path))
+    text = run_in_multiprocess_dir(RENDER_SCRIPT, tmp_path)
+    assert sample_value(text, "db_pool_checked_out", pool="async") == 2
+    assert sample_value(text, "db_pool_size", pool="async") == 5
+    multiprocess.mark_process_dead(pids[1], str(tmp_path))
+    text = run_in_multiprocess_dir(RENDER_SCRIPT, tmp_path)
+    assert sample_value(text, "db_pool_checked_out", pool="async") is None
+    # Only the rendering process's own unlabelled gauge is left
+    assert sample_value(text, "progress_journal_pending_events") == 0
@@ -0,0 +1,54 @@
+import os
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "alembic.ini")
+
+def test_migrations_upgrade_and_downgrade(tmp_path, monkeypatch):
+    # The app's SQLite URL is relative, so run the chain inside a scratch directory
+    monkeypatch.chdir(tmp_path)
+    config = Config(ALEMBIC_INI)
+
+    command.upgrade(config, "head")
+    engine = create_engine("sqlite:///./training_app.db")
+    indexes = {index["name"] for index in inspect(engine).get_indexes("weight_history")}
+    assert "ix_weight_history_exercise_id_date" in indexes
+    indexes = {index["name"] for index in inspect(engine).get_indexes("workouts")}
+    assert {"ix_workouts_user_id_created_at", "ix_workouts_user_id_scheduled_date", "ix_workouts_user_id_recurring"} <= indexes
+    assert {"ix_workouts_scheduled_date", "ix_workouts_recurring_scheduled_date"} <= indexes
+    assert {"recurrence_rule", "recurrence_until"} <= {c["name"] for c in inspect(engine).get_columns("workouts")}
+    assert {"exercise_progress_archive", "progress_ingest_watermarks"} <= set(inspect(engine).get_table_names())
+
+    command.downgrade(config, "base")
+    assert inspect(engine).get_table_names() == ["alembic_version"]
+    engine.dispose()
+
+def test_api_runs_on_migrated_schema(migrated_client):
+    # Muscle group names repeat across workouts, so the schema must not make them unique
+    payload = {
+        "name": "Push",
+        "muscle_groups": [{"name": "Chest", "exercises": [{"name": "Bench Press", "sets": 3, "reps": 10}]}]
+    }
+    first = migrated_client.post("/api/workouts", json=payload)
+    assert first.status_code == 200
+    bulk = migrated_client.post("/api/workouts/bulk", json=[payload, {**payload, "name": "Push B"}])
+    assert bulk.status_code == 200
+
+    exercise = first.json()["muscle_groups"][0]["exercises"][0]
+    progress = migrated_client.put(
+        f"/api/workouts/{first.json()['id']}/exercises/{exercise['id']}/progress",
+        json={"current_weight": 80}
+    )
+    assert progress.status_code == 200
+
+    workouts = migrated_client.get("/api/workouts").json()
+    assert [w["muscle_groups"][0]["name"] for w in workouts] == ["Chest"] * 3
+    history = migrated_client.get(f"/api/exercises/{exercise['id']}/history").json()
+    assert [entry["weight"] for entry in history["history"]] == [80]
+    assert migrated_client.get("/api/workouts/scheduled").status_code == 200
+
+    engine = create_engine("sqlite:///./training_app.db")
+    names = {index["name"]: index["unique"] for index in inspect(engine).get_indexes("muscle_groups")}
+    engine.dispose()
+    assert not names["ix_muscle_groups_name"]
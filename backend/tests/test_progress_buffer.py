@@ -0,0 +1,104 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app import app
+from models.workout import ExerciseProgress, ProgressIngestWatermark
+from progress_buffer import ProgressBuffer, ProgressJournal, get_progress_buffer
+
+@pytest.fixture
+def write_behind(client, tmp_path):
+    engine = create_async_engine("sqlite+aiosqlite:///./test.db")
+    buffer = ProgressBuffer(ProgressJournal(str(tmp_path / "journal.db")), async_sessionmaker(engine, expire_on_commit=False))
+    app.dependency_overrides[get_progress_buffer] = lambda: buffer
+    yield buffer
+    client.portal.call(engine.dispose)
+
+def make_exercise(client):
+    workout = client.post("/api/workouts", json={
+        "name": "Push",
+        "muscle_groups": [{"name": "Chest", "exercises": [{"name": "Bench Press", "sets": 3, "reps": 10}]}]
+    }).json()
+    return workout["id"], workout["muscle_groups"][0]["exercises"][0]["id"]
+
+def test_progress_is_journaled_and_read_back_before_flush(client, test_db, write_behind):
+    workout_id, exercise_id = make_exercise(client)
+    for weight in (60, 70, 65):
+        response = client.put(f"/api/workouts/{workout_id}/exercises/{exercise_id}/progress", json={"current_weight": weight})
+        assert response.status_code == 202
+    assert test_db.query(ExerciseProgress).count() == 0
+
+    # Reads merge the journal in order, so clients see their own writes
+    history = client.get(f"/api/exercises/{exercise_id}/history").json()
+    assert [h["weight"] for h in history["history"]] == [65, 70, 60]
+    assert all(h["id"] < 0 for h in history["history"])
+    assert (history["exercise"]["current_weight"], history["exercise"]["last_weight"], history["exercise"]["record_weight"]) == (65, 70, 70)
+    listed = client.get("/api/workouts").json()[0]["muscle_groups"][0]["exercises"][0]
+    assert listed["current_weight"] == 65
+
+    assert client.portal.call(write_behind.flush_all) == 3
+    assert write_behind.journal.marker() == (0, None)
+    flushed = client.get(f"/api/exercises/{exercise_id}/history").json()
+    assert [h["weight"] for h in flushed["history"]] == [65, 70, 60]
+    assert all(h["id"] > 0 for h in flushed["history"])
+    assert flushed["exercise"] == history["exercise"]
+
+def test_replay_after_a_crash_applies_events_once(client, test_db, write_behind, tmp_path):
+    workout_id, exercise_id = make_exercise(client)
+    client.put(f"/api/workouts/{workout_id}/progress", json=[
+        {"exercise_id": exercise_id, "current_weight": 80},
+        {"exercise_id": exercise_id, "current_weight": 85},
+    ])
+
+    # The batch commits but the process dies before the journal is trimmed
+    def crash(up_to_seq):
+        raise RuntimeError("crashed")
+    write_behind.journal.discard = crash
+    with pytest.raises(RuntimeError):
+        client.portal.call(write_behind.flush)
+    assert test_db.query(ExerciseProgress).count() == 2
+
+    # On restart the same journal file replays; the watermark skips what was applied
+    restarted = ProgressBuffer(ProgressJournal(str(tmp_path / "journal.db")), write_behind.session_factory)
+    assert restarted.journal.journal_id == write_behind.journal.journal_id
+    assert restarted.journal.marker()[0] == 2
+    client.portal.call(restarted.flush_all)
+    assert restarted.journal.marker() == (0, None)
+    test_db.expire_all()
+    assert test_db.query(ExerciseProgress).count() == 2
+    assert test_db.query(ProgressIngestWatermark).one().last_seq == 2
+
+def test_reads_neither_drop_nor_repeat_events_a_flush_moves(client, test_db, write_behind):
+    workout_id, exercise_id = make_exercise(client)
+    client.put(f"/api/workouts/{workout_id}/progress", json=[
+        {"exercise_id": exercise_id, "current_weight": 80},
+        {"exercise_id": exercise_id, "current_weight": 85},
+    ])
+
+    # A flush commits and trims the journal between a read's database and journal halves
+    pending_after = write_behind.journal.pending_after
+    def flush_first(exercise_ids, after_seq):
+        if write_behind.journal.marker()[0]:
+            client.portal.call(write_behind.flush_all)
+        return pending_after(exercise_ids, after_seq)
+    write_behind.journal.pending_after = flush_first
+
+    history = client.get(f"/api/exercises/{exercise_id}/history").json()
+    assert [h["weight"] for h in history["history"]] == [85, 80]
+    assert history["exercise"]["current_weight"] == 85
+    client.put(f"/api/workouts/{workout_id}/exercises/{exercise_id}/progress", json={"current_weight": 90})
+    listed = client.get("/api/workouts").json()[0]["muscle_groups"][0]["exercises"][0]
+    assert (listed["current_weight"], listed["last_weight"]) == (90, 85)
+    assert write_behind.journal.marker() == (0, None)
+
+    # A batch committed but not yet trimmed is read from the database only
+    client.put(f"/api/workouts/{workout_id}/exercises/{exercise_id}/progress", json={"current_weight": 95})
+    write_behind.journal.pending_after = pending_after
+    def crash(up_to_seq):
+        raise RuntimeError("crashed")
+    write_behind.journal.discard = crash
+    with pytest.raises(RuntimeError):
+        client.portal.call(write_behind.flush)
+    assert write_behind.journal.marker()[0] == 1
+    history = client.get(f"/api/exercises/{exercise_id}/history").json()
+    assert [h["weight"] for h in history["history"]] == [95, 90, 85, 80]
+    assert all(h["id"] > 0 for h in history["history"])
+    assert history["exercise"]["current_weight"] == 95
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import select
+from models.workout import Workout
+
+# (method, path, body, max statements, max repeats of one statement), measured
+# against several workouts, muscle groups and exercises so a per-row lazy load
+# shows up as a repeated statement
+QUERY_BUDGETS = [
+    ("GET", "/api/workouts", None, 4, 1),
+    # Levels left out by ?fields / ?include are never queried
+    ("GET", "/api/workouts?fields=id,name,created_at", None, 2, 1),
+    ("GET", "/api/workouts?include=muscle_groups", None, 3, 1),
+    # SQLite can't order multi-row RETURNING, so SQLAlchemy inserts the 3 workouts
+    # and 6 muscle groups one row at a time there; PostgreSQL batches them
+    ("POST", "/api/workouts/bulk", "bulk", 13, 6),
+    ("GET", "/api/exercises/{exercise_id}/history", None, 3, 1),
+    ("GET", "/api/exercises/{exercise_id}/history/stream", None, 2, 1),
+    ("GET", "/api/exercises/{exercise_id}/history/points", None, 2, 1),
+    ("PUT", "/api/workouts/{workout_id}/exercises/{exercise_id}/progress", "progress", 3, 1),
+    ("PUT", "/api/workouts/{workout_id}/progress", "batch", 3, 1),
+    ("GET", "/api/workouts/scheduled", None, 1, 1),
+    ("GET", "/api/analytics/exercises", None, 1, 1),
+    ("GET", "/api/analytics/exercises/{exercise_id}", None, 1, 1),
+]
+
+def workouts_payload(count, prefix):
+    return [
+        {
+            "name": f"{prefix} {i}",
+            "muscle_groups": [
+                {
+                    "name": f"{prefix} {i} Group {g}",
+                    "exercises": [{"name": f"Exercise {e}", "sets": 3, "reps": 10} for e in range(3)]
+                }
+                for g in range(2)
+            ]
+        }
+        for i in range(count)
+    ]
+
+@pytest.fixture
+def seeded(client):
+    workouts = client.post("/api/workouts/bulk", json=workouts_payload(3, "Day")).json()
+    workout = workouts[0]
+    exercises = [e for group in workout["muscle_groups"] for e in group["exercises"]]
+    for weight in (40, 45, 50):
+        client.put(f"/api/workouts/{workout['id']}/progress", json=[
+            {"exercise_id": e["id"], "current_weight": weight} for e in exercises
+        ])
+    return {"workout_id": workout["id"], "exercise_id": exercises[0]["id"], "exercises": exercises}
+
+def request_body(kind, seeded):
+    if kind == "bulk":
+        return workouts_payload(3, "Budget")
+    if kind == "progress":
+        return {"current_weight": 55}
+    if kind == "batch":
+        return [{"exercise_id": e["id"], "current_weight": 60} for e in seeded["exercises"]]
+    return None
+
+@pytest.mark.parametrize(
+    "method,path,body,budget,max_repeats", QUERY_BUDGETS, ids=[f"{b[0]} {b[1]}" for b in QUERY_BUDGETS]
+)
+def test_endpoint_query_budget(client, seeded, query_counter, method, path, body, budget, max_repeats):
+    url = path.format(workout_id=seeded["workout_id"], exercise_id=seeded["exercise_id"])
+    with query_counter(max_queries=budget, max_repeats=max_repeats):
+        response = client.request(method, url, json=request_body(body, seeded))
+    assert response.status_code == 200
+
+def test_lazy_loading_loop_is_flagged(client, test_db, query_counter):
+    client.post("/api/workouts/bulk", json=workouts_payload(3, "Lazy"))
+    test_db.expire_all()
+
+    with pytest.raises(pytest.fail.Exception, match="possible N\\+1"):
+        with query_counter():
+            for workout in test_db.scalars(select(Workout)):
+                workout.muscle_groups
@@ -0,0 +1,76 @@
+import asyncio
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from database import ReadReplicaRouter, create_replica_engine
+
+def make_database(path, label):
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE source (label TEXT)"))
+        connection.execute(text("INSERT INTO source VALUES (:label)"), {"label": label})
+    engine.dispose()
+
+def make_router(tmp_path, replica_url=None, **kwargs):
+    make_database(tmp_path / "primary.db", "primary")
+    primary_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica_engine = create_replica_engine(replica_url) if replica_url else None
+    return ReadReplicaRouter(async_sessionmaker(primary_engine), replica_engine, **kwargs)
+
+async def read_label(router):
+    session_factory = await router.session_factory()
+    async with session_factory() as db:
+        return (await db.execute(text("SELECT label FROM source"))).scalar()
+
+async def read_label_after_check(router):
+    # The first read starts the replica probe and is served by the primary
+    first = await read_label(router)
+    await router.wait_for_check()
+    return first, await read_label(router)
+
+def test_reads_go_to_healthy_replica(tmp_path):
+    make_database(tmp_path / "replica.db", "replica")
+    router = make_router(tmp_path, f"sqlite:///{tmp_path / 'replica.db'}")
+
+    assert asyncio.run(read_label_after_check(router)) == ("primary", "replica")
+    assert router.status() == {"configured": True, "healthy": True, "lag_seconds": 0.0}
+
+def test_no_replica_uses_primary(tmp_path):
+    router = make_router(tmp_path)
+    assert asyncio.run(read_label(router)) == "primary"
+
+def test_lagging_replica_falls_back_to_primary(tmp_path):
+    make_database(tmp_path / "replica.db", "replica")
+
+    async def lagging(connection):
+        return 30.0
+
+    router = make_router(tmp_path, f"sqlite:///{tmp_path / 'replica.db'}", max_lag_seconds=5, lag_probe=lagging)
+    assert asyncio.run(read_label_after_check(router)) == ("primary", "primary")
+    assert router.status()["lag_seconds"] == 30.0
+
+def test_unreachable_replica_falls_back_until_next_check(tmp_path):
+    replica_path = tmp_path / "missing" / "replica.db"
+    router = make_router(tmp_path, f"sqlite:///{replica_path}", check_interval=60)
+    assert asyncio.run(read_label_after_check(router)) == ("primary", "primary")
+    assert router.status()["healthy"] is False
+
+    # Once the replica comes back the next check routes reads to it again
+    replica_path.parent.mkdir()
+    make_database(replica_path, "replica")
+    router.checked_at = None
+    assert asyncio.run(read_label_after_check(router)) == ("primary", "replica")
+
+def test_slow_probe_does_not_hold_up_reads(tmp_path):
+    make_database(tmp_path / "replica.db", "replica")
+
+    async def hanging(connection):
+        await asyncio.sleep(60)
+
+    async def concurrent_reads(router):
+        # Every read is answered by the primary while the probe is still running
+        labels = await asyncio.wait_for(asyncio.gather(*(read_label(router) for _ in range(5))), 1)
+        await router.close()
+        return labels
+
+    router = make_router(tmp_path, f"sqlite:///{tmp_path / 'replica.db'}", lag_probe=hanging)
+    assert asyncio.run(concurrent_reads(router)) == ["primary"] * 5
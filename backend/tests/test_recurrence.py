@@ -0,0 +1,33 @@
+from datetime import datetime
+import pytest
+from recurrence import last_occurrence, occurrences, parse_rule
+
+MONDAY = datetime(2026, 1, 5, 18, 0)
+
+def test_weekly_rule_expands_only_the_requested_window():
+    rule = parse_rule("FREQ=WEEKLY;BYDAY=MO,TH")
+    march = list(occurrences(rule, MONDAY, datetime(2026, 3, 1), datetime(2026, 3, 15)))
+    assert march == [datetime(2026, 3, d, 18, 0) for d in (2, 5, 9, 12)]
+
+def test_count_is_measured_from_the_series_start():
+    rule = parse_rule("FREQ=WEEKLY;INTERVAL=2;BYDAY=MO,TH;COUNT=5")
+    everything = list(occurrences(rule, MONDAY, datetime(2026, 1, 1), datetime(2027, 1, 1)))
+    assert len(everything) == 5
+    assert last_occurrence(rule, MONDAY) == everything[-1]
+    # A later window still knows which occurrences the count already used up
+    assert list(occurrences(rule, MONDAY, datetime(2026, 2, 1), datetime(2027, 1, 1))) == everything[4:]
+
+def test_daily_until_and_monthly_rules():
+    daily = parse_rule("FREQ=DAILY;INTERVAL=3;UNTIL=20260120")
+    assert list(occurrences(daily, MONDAY, datetime(2026, 1, 10), datetime(2026, 2, 1)))[-1] == datetime(2026, 1, 20, 18, 0)
+    assert last_occurrence(parse_rule("FREQ=DAILY"), MONDAY) is None
+
+    # Months without a 31st are skipped rather than clamped
+    monthly = parse_rule("FREQ=MONTHLY")
+    start = datetime(2026, 1, 31)
+    assert [d.month for d in occurrences(monthly, start, start, datetime(2026, 8, 1))] == [1, 3, 5, 7]
+
+@pytest.mark.parametrize("text", ["FREQ=YEARLY", "FREQ=DAILY;BYDAY=MO", "FREQ=WEEKLY;BYDAY=XX", "FREQ=DAILY;COUNT=0", "INTERVAL=2"])
+def test_invalid_rules_are_rejected(text):
+    with pytest.raises(ValueError):
+        parse_rule(text)
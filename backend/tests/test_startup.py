@@ -0,0 +1,74 @@
+import os
+import subprocess
+import sys
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine
+from database import ALEMBIC_INI, check_schema_revision
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STARTUP_SCRIPT = """
+from fastapi.testclient import TestClient
+from app import app
+with TestClient(app) as client:
+    assert client.get("/").status_code == 200
+    print(app.state.startup_seconds)
+"""
+
+def run_startup(cwd, script=STARTUP_SCRIPT, **env):
+    return subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": BACKEND_DIR, **env},
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+
+def test_starts_within_budget_with_unreachable_database(tmp_path):
+    # Nothing at import or startup may need the database to be up
+    result = run_startup(
+        tmp_path, ENVIRONMENT="production", DB_HOST="127.0.0.1", DB_PORT="1",
+        SCHEMA_CHECK="warn", SCHEMA_CHECK_TIMEOUT_SECONDS="1"
+    )
+    assert result.returncode == 0, result.stderr
+    assert float(result.stdout.strip()) < 5.0
+
+def test_strict_schema_check_refuses_unmigrated_database(tmp_path):
+    # A fresh SQLite file has no alembic_version table
+    result = run_startup(tmp_path, ENVIRONMENT="development", SCHEMA_CHECK="strict")
+    assert result.returncode != 0
+    assert "alembic upgrade head" in result.stderr
+
+def test_schema_revision_matches_head_after_upgrade(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    command.upgrade(Config(ALEMBIC_INI), "head")
+    engine = create_engine("sqlite:///./training_app.db")
+    current, head = check_schema_revision(engine)
+    assert current == head
+    engine.dispose()
+
+MIGRATED_APP_SCRIPT = """
+from fastapi.testclient import TestClient
+from app import app
+payload = {"name": "Push", "muscle_groups": [{"name": "Chest", "exercises": [{"name": "Bench", "sets": 3, "reps": 10}]}]}
+with TestClient(app) as client:
+    print(app.state.schema_revision)
+    for name in ("Push A", "Push B"):
+        response = client.post("/api/workouts", json={**payload, "name": name})
+        assert response.status_code == 200, response.text
+    assert [w["muscle_groups"][0]["name"] for w in client.get("/api/workouts").json()] == ["Chest", "Chest"]
+"""
+
+def test_app_serves_writes_on_a_migrated_database(tmp_path, monkeypatch):
+    # Migrations are the only way the app gets its tables, so they must match the mounted models
+    monkeypatch.chdir(tmp_path)
+    command.upgrade(Config(ALEMBIC_INI), "head")
+    result = run_startup(tmp_path, MIGRATED_APP_SCRIPT, ENVIRONMENT="development", SCHEMA_CHECK="strict")
+    assert result.returncode == 0, result.stderr
+
+    engine = create_engine("sqlite:///./training_app.db")
+    _, head = check_schema_revision(engine)
+    assert result.stdout.strip() == head
+    engine.dispose()
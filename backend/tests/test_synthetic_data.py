@@ -0,0 +1,40 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_init_db(database_path, *args):
+    # The api models can't share a metadata with the app's models, so seed in a fresh process
+    return subprocess.run(
+        [sys.executable, os.path.join(BACKEND_DIR, "init_db.py"), "--database-url", f"sqlite:///{database_path}", *args],
+        capture_output=True,
+        text=True,
+        timeout=120
+    )
+
+def test_generates_and_appends_without_dropping(tmp_path):
+    database_path = tmp_path / "synthetic.db"
+    args = ["--users", "3", "--workouts-per-user", "2", "--history-per-exercise", "10", "--chunk-size", "100"]
+
+    result = run_init_db(database_path, *args)
+    assert result.returncode == 0, result.stderr
+    result = run_init_db(database_path, *args)
+    assert result.returncode == 0, result.stderr
+
+    connection = sqlite3.connect(database_path)
+    # One sample admin plus two generated batches of three users
+    assert connection.execute("SELECT COUNT(*) FROM users").fetchone()[0] == 7
+    # 3 sample rows + 2 runs x 3 users x 2 workouts x 3 groups x 3 exercises x 10 sessions
+    assert connection.execute("SELECT COUNT(*) FROM weight_history").fetchone()[0] == 3 + 2 * 540
+    # Current weight is the latest session and record the heaviest
+    exercise_id, current, record = connection.execute(
+        "SELECT id, current_weight, record_weight FROM exercises ORDER BY id DESC LIMIT 1"
+    ).fetchone()
+    weights = [row[0] for row in connection.execute(
+        "SELECT weight FROM weight_history WHERE exercise_id = ? ORDER BY date", (exercise_id,)
+    )]
+    assert current == weights[-1]
+    assert record == max(weights)
+    connection.close()
@@ -0,0 +1,145 @@
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The api/ package maps the same table names as models.workout on the shared Base,
+# so its stats service is exercised in a fresh interpreter with only its own models.
+# Each step mirrors what the matching api/routes/workouts.py endpoint does, then
+# compares the incrementally maintained summary with a full rebuild.
+STATS_SCRIPT = """
+from database import Base, SessionLocal, get_engine
+from api.models.user import User
+from api.models.workout import Workout
+from api.models.muscle_group import MuscleGroup
+from api.models.exercise import Exercise
+from api.models.workout_stats import WorkoutStatsSummary, ExerciseStatsSummary
+from api.services import workout_stats
+import rebuild_stats
+
+Base.metadata.create_all(bind=get_engine())
+
+def snapshot(db, user_id):
+    summary = db.get(WorkoutStatsSummary, user_id)
+    exercises = db.query(
+        ExerciseStatsSummary.exercise_name, ExerciseStatsSummary.exercise_count, ExerciseStatsSummary.record_weight
+    ).filter(ExerciseStatsSummary.user_id == user_id).order_by(ExerciseStatsSummary.exercise_name).all()
+    return {
+        "total": summary.total_workouts,
+        "completed": summary.completed_workouts,
+        "this_week": summary.this_week,
+        "this_month": summary.this_month,
+        "most_frequent": summary.most_frequent_exercise,
+        "personal_bests": summary.personal_bests,
+        "exercises": [tuple(row) for row in exercises],
+    }
+
+def assert_in_sync(db, user_id):
+    db.expire_all()
+    incremental = snapshot(db, user_id)
+    scratch = SessionLocal()
+    try:
+        workout_stats.rebuild_user_stats(scratch, user_id)
+        rebuilt = snapshot(scratch, user_id)
+    finally:
+        scratch.rollback()
+        scratch.close()
+    assert incremental == rebuilt, (incremental, rebuilt)
+    return incremental
+
+def create_workout(db, user_id, name, exercises=()):
+    workout = Workout(name=name, user_id=user_id)
+    if exercises:
+        workout.muscle_groups = [MuscleGroup(name="Main", exercises=[
+            Exercise(name=exercise, record_weight=weight) for exercise, weight in exercises
+        ])]
+    db.add(workout)
+    db.flush()
+    workout_stats.record_workout_created(db, workout, [exercise for exercise, _ in exercises])
+    db.commit()
+    return workout
+
+db = SessionLocal()
+user = User(email="lifter@example.com")
+db.add(user)
+db.commit()
+
+# The first write finds no summary row and rebuilds it
+push = create_workout(db, user.id, "Push")
+pull = create_workout(db, user.id, "Pull")
+assert assert_in_sync(db, user.id)["total"] == 2
+
+# Exercises are added to the workouts, then progress is logged
+chest = MuscleGroup(name="Chest", workout_id=push.id)
+back = MuscleGroup(name="Back", workout_id=pull.id)
+db.add_all([chest, back])
+db.flush()
+bench = Exercise(name="Bench", muscle_group_id=chest.id, record_weight=0)
+db.add_all([bench, Exercise(name="Row", muscle_group_id=back.id, record_weight=0)])
+db.add(Exercise(name="Bench", muscle_group_id=back.id, record_weight=0))
+db.flush()
+workout_stats.refresh_exercise_stats(db, user.id, ["Bench", "Row"])
+db.commit()
+bench.current_weight = bench.record_weight = 100
+db.flush()
+workout_stats.refresh_exercise_stats(db, user.id, [bench.name])
+db.commit()
+state = assert_in_sync(db, user.id)
+assert state["most_frequent"] == "Bench"
+assert state["personal_bests"] == [{"exercise": "Bench", "weight": 100}]
+
+# Completing twice only counts once
+for _ in range(2):
+    was_completed = push.is_completed
+    push.complete()
+    db.flush()
+    workout_stats.record_workout_completed(db, push, was_completed)
+    db.commit()
+    assert assert_in_sync(db, user.id)["completed"] == 1
+
+exercise_names = [exercise.name for muscle_group in push.muscle_groups for exercise in muscle_group.exercises]
+db.delete(push)
+db.flush()
+workout_stats.record_workout_deleted(db, push, exercise_names)
+db.commit()
+state = assert_in_sync(db, user.id)
+assert (state["total"], state["completed"]) == (1, 0)
+assert state["exercises"] == [("Bench", 1, 0), ("Row", 1, 0)]
+
+# A workout created along with its exercises updates the per-exercise stats too
+create_workout(db, user.id, "Legs", [("Squat", 140), ("Bench", 0)])
+state = assert_in_sync(db, user.id)
+assert state["exercises"] == [("Bench", 2, 0), ("Row", 1, 0), ("Squat", 1, 140)]
+assert state["personal_bests"] == [{"exercise": "Squat", "weight": 140}]
+
+# Backfill: a user whose workouts predate the summary tables
+other = User(email="new@example.com")
+db.add(other)
+db.flush()
+db.add_all([Workout(name="Legs", user_id=other.id), Workout(name="Core", user_id=other.id, is_completed=True)])
+db.query(WorkoutStatsSummary).delete()
+db.query(ExerciseStatsSummary).delete()
+db.commit()
+
+assert rebuild_stats.rebuild_stats() == 2
+for user_id in (user.id, other.id):
+    assert_in_sync(db, user_id)
+assert snapshot(db, other.id)["total"] == 2
+assert snapshot(db, other.id)["completed"] == 1
+assert rebuild_stats.rebuild_stats(other.id) == 1
+db.close()
+print("ok")
+"""
+
+def test_workout_stats_stay_in_sync_and_rebuild(tmp_path):
+    result = subprocess.run(
+        [sys.executable, "-c", STATS_SCRIPT],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": BACKEND_DIR, "ENVIRONMENT": "development"},
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "ok"
@@ -0,0 +1,269 @@
+import json
+
+def make_workout(client, name, exercises=("Bench Press",)):
+    payload = {
+        "name": name,
+        "muscle_groups": [
+            {
+                "name": f"{name} Chest",
+                "exercises": [{"name": exercise, "sets": 3, "reps": 10} for exercise in exercises]
+            }
+        ]
+    }
+    response = client.post("/api/workouts", json=payload)
+    assert response.status_code == 200
+    return response.json()
+
+def test_get_workouts_returns_nested_tree(client):
+    make_workout(client, "Push", exercises=("Bench Press", "Dips"))
+
+    response = client.get("/api/workouts")
+    assert response.status_code == 200
+    workouts = response.json()
+    assert len(workouts) == 1
+    assert [e["name"] for e in workouts[0]["muscle_groups"][0]["exercises"]] == ["Bench Press", "Dips"]
+    assert "X-Next-Cursor" not in response.headers
+
+def test_get_workouts_cursor_pagination(client):
+    created = [make_workout(client, f"Workout {i}") for i in range(5)]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/workouts", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(w["id"] for w in page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert sorted(seen) == sorted(w["id"] for w in created)
+    assert len(seen) == len(set(seen))
+
+def test_get_workouts_rejects_bad_cursor(client):
+    response = client.get("/api/workouts", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+def test_get_workouts_caps_page_size(client):
+    response = client.get("/api/workouts", params={"limit": 10000})
+    assert response.status_code == 422
+
+def test_bulk_create_workouts(client):
+    payload = [
+        {
+            "name": f"Day {i}",
+            "muscle_groups": [
+                {"name": f"Day {i} Legs", "exercises": [{"name": "Squat", "sets": 5, "reps": 5}]},
+                {"name": f"Day {i} Back", "exercises": []}
+            ]
+        }
+        for i in range(3)
+    ]
+    response = client.post("/api/workouts/bulk", json=payload)
+    assert response.status_code == 200
+    created = response.json()
+    assert [w["name"] for w in created] == ["Day 0", "Day 1", "Day 2"]
+    for i, workout in enumerate(created):
+        assert [mg["name"] for mg in workout["muscle_groups"]] == [f"Day {i} Legs", f"Day {i} Back"]
+        squat = workout["muscle_groups"][0]["exercises"][0]
+        assert squat["muscle_group_id"] == workout["muscle_groups"][0]["id"]
+        assert squat["current_weight"] == 0
+
+    assert len(client.get("/api/workouts").json()) == 3
+
+def test_stream_exercise_history(client):
+    workout = make_workout(client, "Push")
+    exercise_id = workout["muscle_groups"][0]["exercises"][0]["id"]
+    for weight in (40, 45, 50):
+        response = client.put(
+            f"/api/workouts/{workout['id']}/exercises/{exercise_id}/progress",
+            json={"current_weight": weight}
+        )
+        assert response.status_code == 200
+
+    response = client.get(f"/api/exercises/{exercise_id}/history/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(row["weight"] for row in rows) == [40, 45, 50]
+
+    negotiated = client.get(
+        f"/api/exercises/{exercise_id}/history",
+        headers={"Accept": "application/x-ndjson"}
+    )
+    assert negotiated.text == response.text
+
+    assert client.get("/api/exercises/999999/history/stream").status_code == 404
+
+def test_get_workouts_conditional_requests(client):
+    workout = make_workout(client, "Push")
+
+    first = client.get("/api/workouts")
+    etag = first.headers["ETag"]
+    assert first.headers["Last-Modified"]
+
+    cached = client.get("/api/workouts", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    since = client.get("/api/workouts", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    assert since.status_code == 304
+
+    # A progress update changes the nested exercise, so the list must change too
+    exercise_id = workout["muscle_groups"][0]["exercises"][0]["id"]
+    client.put(
+        f"/api/workouts/{workout['id']}/exercises/{exercise_id}/progress",
+        json={"current_weight": 60}
+    )
+    fresh = client.get("/api/workouts", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+
+def test_get_exercise_history_conditional_requests(client):
+    workout = make_workout(client, "Pull")
+    exercise_id = workout["muscle_groups"][0]["exercises"][0]["id"]
+
+    first = client.get(f"/api/exercises/{exercise_id}/history")
+    cached = client.get(
+        f"/api/exercises/{exercise_id}/history",
+        headers={"If-None-Match": first.headers["ETag"]}
+    )
+    assert cached.status_code == 304
+
+def test_exercise_history_points(client, test_db):
+    from datetime import datetime, timedelta
+    from models.workout import ExerciseProgress
+
+    workout = make_workout(client, "Legs", exercises=("Squat",))
+    exercise_id = workout["muscle_groups"][0]["exercises"][0]["id"]
+
+    # Two entries a day for 60 days starting on a Monday
+    start = datetime(2024, 1, 1, 8)
+    test_db.add_all([
+        ExerciseProgress(exercise_id=exercise_id, weight=100 + day + half, date=start + timedelta(days=day, hours=half * 8))
+        for day in range(60)
+        for half in range(2)
+    ])
+    test_db.commit()
+
+    url = f"/api/exercises/{exercise_id}/history/points"
+    weekly = client.get(url, params={"bucket": "week"}).json()["points"]
+    assert len(weekly) == 9
+    assert weekly[0]["bucket_start"] == "2024-01-01T00:00:00"
+    assert weekly[0]["count"] == 14
+    assert weekly[0]["min_weight"] == 100
+    assert weekly[0]["max_weight"] == 107
+    assert weekly[0]["last_weight"] == 107
+
+    monthly = client.get(url, params={"bucket": "month", "from": "2024-02-01T00:00:00"}).json()["points"]
+    assert [p["bucket_start"] for p in monthly] == ["2024-02-01T00:00:00"]
+    assert monthly[0]["count"] == 58
+
+    raw = client.get(url, params={"max_points": 20}).json()["points"]
+    assert len(raw) == 20
+    assert raw[0]["bucket_start"] == "2024-01-01T08:00:00"
+    assert raw[-1]["last_weight"] == 160
+
+def test_batch_progress_update(client):
+    workout = make_workout(client, "Full Body", exercises=("Squat", "Bench Press"))
+    squat, bench = workout["muscle_groups"][0]["exercises"]
+    other = make_workout(client, "Other")["muscle_groups"][0]["exercises"][0]
+
+    response = client.put(f"/api/workouts/{workout['id']}/progress", json=[
+        {"exercise_id": squat["id"], "current_weight": 100},
+        {"exercise_id": bench["id"], "current_weight": 60, "record_weight": 80},
+        {"exercise_id": squat["id"], "current_weight": 90},
+    ])
+    assert response.status_code == 200
+    assert response.json()["updated"] == 2
+
+    exercises = {
+        e["id"]: e
+        for e in client.get("/api/workouts").json()[-1]["muscle_groups"][0]["exercises"]
+    }
+    assert exercises[squat["id"]]["current_weight"] == 90
+    assert exercises[squat["id"]]["last_weight"] == 100
+    assert exercises[squat["id"]]["record_weight"] == 100
+    assert exercises[bench["id"]]["record_weight"] == 80
+
+    history = client.get(f"/api/exercises/{squat['id']}/history").json()["history"]
+    assert sorted(h["weight"] for h in history) == [90, 100]
+
+    # Exercises from another workout are rejected and nothing is written
+    rejected = client.put(f"/api/workouts/{workout['id']}/progress", json=[
+        {"exercise_id": bench["id"], "current_weight": 70},
+        {"exercise_id": other["id"], "current_weight": 70},
+    ])
+    assert rejected.status_code == 404
+    history = client.get(f"/api/exercises/{bench['id']}/history").json()["history"]
+    assert [h["weight"] for h in history] == [60]
+
+def test_get_workouts_fast_path_keeps_openapi_schema(client):
+    schema = client.get("/openapi.json").json()
+    response_schema = schema["paths"]["/api/workouts"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert response_schema["items"]["$ref"].endswith("/WorkoutResponse")
+
+def test_get_workouts_matches_declared_schema(client):
+    created = make_workout(client, "Push", exercises=("Bench Press", "Dips"))
+    listed = client.get("/api/workouts").json()
+    assert listed == [created]
+
+def test_get_workouts_sparse_fieldsets(client):
+    make_workout(client, "Push", exercises=("Bench Press", "Dips"))
+    full = client.get("/api/workouts")
+
+    summary = client.get("/api/workouts", params={"fields": "id,name,created_at"})
+    assert summary.status_code == 200
+    assert summary.json() == [{key: full.json()[0][key] for key in ("id", "name", "created_at")}]
+    assert len(summary.content) * 4 < len(full.content)
+    assert summary.headers["ETag"] != full.headers["ETag"]
+
+    groups = client.get("/api/workouts", params={"include": "muscle_groups"}).json()[0]
+    assert groups["muscle_groups"][0].keys() == {"id", "name", "workout_id"}
+
+    weights = client.get("/api/workouts", params={"fields": "name,muscle_groups.exercises.current_weight"}).json()[0]
+    assert weights.keys() == {"name", "muscle_groups"}
+    assert weights["muscle_groups"][0]["exercises"] == [{"current_weight": 0}, {"current_weight": 0}]
+
+    assert client.get("/api/workouts", params={"fields": "password"}).status_code == 400
+    assert client.get("/api/workouts", params={"include": "users"}).status_code == 400
+    assert client.get("/api/workouts", params={"fields": "muscle_groups.name", "include": ""}).status_code == 400
+
+def test_get_scheduled_workouts(client):
+    def schedule(name, scheduled_date, recurrence_rule=None):
+        response = client.post("/api/workouts", json={
+            "name": name, "muscle_groups": [], "scheduled_date": scheduled_date, "recurrence_rule": recurrence_rule
+        })
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    one_off = schedule("Deload", "2026-03-04T07:00:00")
+    schedule("Next month", "2026-04-02T07:00:00")
+    weekly = schedule("Strength", "2026-01-05T18:00:00", "FREQ=WEEKLY;BYDAY=MO,TH")
+    schedule("Finished", "2026-01-01T08:00:00", "FREQ=DAILY;COUNT=3")
+    assert weekly["recurrence_rule"] == "FREQ=WEEKLY;BYDAY=MO,TH"
+
+    response = client.get("/api/workouts/scheduled", params={"from": "2026-03-01T00:00:00", "to": "2026-03-10T00:00:00"})
+    assert response.status_code == 200
+    assert [(w["name"], w["scheduled_date"], w["is_recurring"]) for w in response.json()] == [
+        ("Strength", "2026-03-02T18:00:00", True),
+        ("Deload", "2026-03-04T07:00:00", False),
+        ("Strength", "2026-03-05T18:00:00", True),
+        ("Strength", "2026-03-09T18:00:00", True),
+    ]
+    assert response.json()[1]["id"] == one_off["id"]
+
+    # Bounds with an offset are read as UTC; `to` alone defaults to its month
+    shifted = client.get("/api/workouts/scheduled", params={"from": "2026-03-04T09:00:00+02:00", "to": "2026-03-05T00:00:00Z"})
+    assert [w["name"] for w in shifted.json()] == ["Deload"]
+    assert len(client.get("/api/workouts/scheduled", params={"to": "2026-04-01T00:00:00"}).json()) == 10
+
+    assert client.get("/api/workouts/scheduled", params={"from": "2026-03-10T00:00:00", "to": "2026-03-01T00:00:00"}).status_code == 422
+    assert client.get("/api/workouts/scheduled", params={"from": "2026-01-01T00:00:00", "to": "2027-06-01T00:00:00"}).status_code == 422
+    assert client.post("/api/workouts", json={"name": "Bad", "muscle_groups": [], "recurrence_rule": "FREQ=YEARLY"}).status_code == 422
+    assert client.post("/api/workouts", json={"name": "Unanchored", "muscle_groups": [], "recurrence_rule": "FREQ=DAILY"}).status_code == 422
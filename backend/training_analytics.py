@@ -0,0 +1,156 @@
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Training analytics computed over whole histories at once. Rows come in as
+# (exercise_id, exercise_name, date, weight, sets, reps) sorted by exercise and
+# date; every metric is a NumPy pass over the flat arrays, with per-exercise
+# results taken from segment boundaries instead of a Python loop per exercise.
+
+SECONDS_PER_DAY = 86400.0
+BRZYCKI_MAX_REPS = 37
+
+def load_history(rows: Sequence[Tuple[int, str, datetime, float, int, int]]) -> Dict[str, np.ndarray]:
+    if not rows:
+        empty = np.array([], dtype=np.float64)
+        return {
+            "exercise_id": np.array([], dtype=np.int64),
+            "name": np.array([], dtype=object),
+            "date": np.array([], dtype="datetime64[us]"),
+            "weight": empty,
+            "sets": empty,
+            "reps": empty,
+        }
+
+    exercise_ids, names, dates, weights, sets, reps = zip(*rows)
+    return {
+        "exercise_id": np.array(exercise_ids, dtype=np.int64),
+        "name": np.array(names, dtype=object),
+        "date": np.array(dates, dtype="datetime64[us]"),
+        "weight": np.array(weights, dtype=np.float64),
+        "sets": np.array(sets, dtype=np.float64),
+        "reps": np.array(reps, dtype=np.float64),
+    }
+
+def volume(weight: np.ndarray, sets: np.ndarray, reps: np.ndarray) -> np.ndarray:
+    return weight * sets * reps
+
+def epley_1rm(weight: np.ndarray, reps: np.ndarray) -> np.ndarray:
+    return weight * (1 + reps / 30.0)
+
+def brzycki_1rm(weight: np.ndarray, reps: np.ndarray) -> np.ndarray:
+    # The formula diverges at 37 reps; those entries have no estimate
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(reps < BRZYCKI_MAX_REPS, weight * 36.0 / (37.0 - reps), np.nan)
+
+def segments(exercise_id: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Start offset of each exercise's run and the run index of every row
+    is_start = np.r_[True, exercise_id[1:] != exercise_id[:-1]]
+    return np.flatnonzero(is_start), np.cumsum(is_start) - 1
+
+def rolling_mean(values: np.ndarray, starts: np.ndarray, group: np.ndarray, window: int) -> np.ndarray:
+    index = np.arange(len(values))
+    window_start = np.maximum(starts[group], index - window + 1)
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    return (cumulative[index + 1] - cumulative[window_start]) / (index + 1 - window_start)
+
+def slopes_per_day(x: np.ndarray, y: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    # Ordinary least squares for every group at once from per-group sums
+    n = np.bincount(group, minlength=n_groups).astype(np.float64)
+    sx = np.bincount(group, weights=x, minlength=n_groups)
+    sy = np.bincount(group, weights=y, minlength=n_groups)
+    sxx = np.bincount(group, weights=x * x, minlength=n_groups)
+    sxy = np.bincount(group, weights=x * y, minlength=n_groups)
+    denominator = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, (n * sxy - sx * sy) / denominator, 0.0)
+
+def _float_or_none(value) -> Optional[float]:
+    return None if np.isnan(value) else float(value)
+
+def compute(history: Dict[str, np.ndarray], window: int = 5) -> Dict[str, np.ndarray]:
+    weight, sets, reps = history["weight"], history["sets"], history["reps"]
+    starts, group = segments(history["exercise_id"])
+
+    # Days since each exercise's first entry keeps the regression well conditioned
+    seconds = history["date"].astype("datetime64[s]").astype(np.float64)
+    days = (seconds - seconds[starts][group]) / SECONDS_PER_DAY
+
+    return {
+        "starts": starts,
+        "ends": np.r_[starts[1:], len(weight)] - 1,
+        "group": group,
+        "volume": volume(weight, sets, reps),
+        "epley_1rm": epley_1rm(weight, reps),
+        "brzycki_1rm": brzycki_1rm(weight, reps),
+        "rolling_average": rolling_mean(weight, starts, group, window),
+        "slope_per_day": slopes_per_day(days, weight, group, len(starts)),
+    }
+
+def summarize(history: Dict[str, np.ndarray], window: int = 5) -> List[dict]:
+    if len(history["weight"]) == 0:
+        return []
+
+    metrics = compute(history, window)
+    starts, ends = metrics["starts"], metrics["ends"]
+    brzycki = metrics["brzycki_1rm"]
+    # reduceat has no NaN-aware variant; -inf marks "no estimate"
+    best_brzycki = np.maximum.reduceat(np.where(np.isnan(brzycki), -np.inf, brzycki), starts)
+    best_brzycki[np.isinf(best_brzycki)] = np.nan
+
+    columns = {
+        "exercise_id": history["exercise_id"][starts],
+        "exercise_name": history["name"][starts],
+        "entries": ends - starts + 1,
+        "first_date": history["date"][starts],
+        "last_date": history["date"][ends],
+        "latest_weight": history["weight"][ends],
+        "max_weight": np.maximum.reduceat(history["weight"], starts),
+        "total_volume": np.add.reduceat(metrics["volume"], starts),
+        "best_epley_1rm": np.maximum.reduceat(metrics["epley_1rm"], starts),
+        "best_brzycki_1rm": best_brzycki,
+        "rolling_average": metrics["rolling_average"][ends],
+        "trend_per_week": metrics["slope_per_day"] * 7,
+    }
+
+    return [
+        {
+            "exercise_id": int(columns["exercise_id"][i]),
+            "exercise_name": columns["exercise_name"][i],
+            "entries": int(columns["entries"][i]),
+            "first_date": columns["first_date"][i].item(),
+            "last_date": columns["last_date"][i].item(),
+            "latest_weight": float(columns["latest_weight"][i]),
+            "max_weight": float(columns["max_weight"][i]),
+            "total_volume": float(columns["total_volume"][i]),
+            "best_epley_1rm": float(columns["best_epley_1rm"][i]),
+            "best_brzycki_1rm": _float_or_none(columns["best_brzycki_1rm"][i]),
+            "rolling_average": float(columns["rolling_average"][i]),
+            "trend_per_week": float(columns["trend_per_week"][i]),
+        }
+        for i in range(len(starts))
+    ]
+
+def series(history: Dict[str, np.ndarray], window: int = 5) -> List[dict]:
+    if len(history["weight"]) == 0:
+        return []
+
+    metrics = compute(history, window)
+    return [
+        {
+            "date": date,
+            "weight": weight,
+            "volume": volume_value,
+            "epley_1rm": epley,
+            "brzycki_1rm": None if np.isnan(brzycki) else brzycki,
+            "rolling_average": rolling,
+        }
+        for date, weight, volume_value, epley, brzycki, rolling in zip(
+            history["date"].tolist(),
+            history["weight"].tolist(),
+            metrics["volume"].tolist(),
+            metrics["epley_1rm"].tolist(),
+            metrics["brzycki_1rm"].tolist(),
+            metrics["rolling_average"].tolist(),
+        )
+    ]
@@ -11,15 +11,18 @@ const TrainingCalendar = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState(null);
     const [selectedDate, setSelectedDate] = useState(new Date());
+    const [visibleMonth, setVisibleMonth] = useState(new Date());
 
     useEffect(() => {
+        // One range request per month viewed; recurring workouts are expanded by the server
         const fetchEvents = async () => {
             try {
-                setLoading(true);
-                const workouts = await trainingService.getScheduledWorkouts();
+                const from = new Date(visibleMonth.getFullYear(), visibleMonth.getMonth(), 1);
+                const to = new Date(visibleMonth.getFullYear(), visibleMonth.getMonth() + 1, 1);
+                const workouts = await trainingService.getScheduledWorkouts(from, to);
                 setEvents(workouts.map(w => ({
                     ...w,
-                    date: new Date(w.scheduledDate)
+                    date: new Date(w.scheduled_date)
                 })));
             } catch (err) {
                 setError('Failed to load scheduled workouts');
@@ -30,7 +33,7 @@ const TrainingCalendar = () => {
         };
 
         fetchEvents();
-    }, []);
+    }, [visibleMonth]);
 
     const getEventsForDate = (date) => {
         return events.filter(event => 
@@ -60,6 +63,7 @@ const TrainingCalendar = () => {
                 <DateCalendar
                     value={selectedDate}
                     onChange={(newDate) => setSelectedDate(newDate)}
+                    onMonthChange={(month) => setVisibleMonth(month)}
                     sx={{
                         '& .MuiPickersDay-root.Mui-selected': {
                             backgroundColor: '#1976d2',
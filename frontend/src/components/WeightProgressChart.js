@@ -3,6 +3,9 @@ import { LineChart } from '@mui/x-charts';
 import { Box, Typography, CircularProgress } from '@mui/material';
 import trainingService from '../services/trainingService';
 
+// The chart is a few hundred pixels wide; the server downsamples to this many points
+const MAX_CHART_POINTS = 300;
+
 const WeightProgressChart = ({ exerciseId }) => {
     const [data, setData] = useState([]);
     const [loading, setLoading] = useState(true);
@@ -12,10 +15,12 @@ const WeightProgressChart = ({ exerciseId }) => {
         const fetchData = async () => {
             try {
                 setLoading(true);
-                const history = await trainingService.getExerciseHistory(exerciseId);
-                const formattedData = history.map(h => ({
-                    date: new Date(h.date),
-                    weight: h.weight
+                const history = await trainingService.getExerciseHistoryPoints(exerciseId, {
+                    max_points: MAX_CHART_POINTS
+                });
+                const formattedData = history.points.map(p => ({
+                    date: new Date(p.bucket_start),
+                    weight: p.last_weight
                 }));
                 setData(formattedData);
             } catch (err) {
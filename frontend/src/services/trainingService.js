@@ -37,11 +37,21 @@ api.interceptors.response.use(
 );
 
 const trainingService = {
-    // Get all workouts
-    getAllWorkouts: async () => {
+    // Get all workouts; params can narrow the payload, e.g.
+    // { fields: 'id,name,created_at' } or { include: 'muscle_groups' }.
+    // The list is paginated, so follow X-Next-Cursor until the last page.
+    getAllWorkouts: async (params = {}) => {
         try {
-            const response = await api.get('/workouts');
-            return response.data;
+            const workouts = [];
+            let cursor;
+            do {
+                const response = await api.get('/workouts', {
+                    params: { limit: 200, ...params, ...(cursor ? { cursor } : {}) },
+                });
+                workouts.push(...response.data);
+                cursor = response.headers['x-next-cursor'];
+            } while (cursor);
+            return workouts;
         } catch (error) {
             console.error('Error in getAllWorkouts:', error);
             throw error;
@@ -96,10 +106,24 @@ const trainingService = {
         }
     },
 
+    // Get downsampled exercise history (bucket: 'day' | 'week' | 'month')
+    getExerciseHistoryPoints: async (exerciseId, params = {}) => {
+        try {
+            const response = await api.get(`/exercises/${exerciseId}/history/points`, { params });
+            return response.data;
+        } catch (error) {
+            console.error('Error fetching exercise history points:', error);
+            throw error;
+        }
+    },
+
     // Get scheduled workouts for calendar
-    getScheduledWorkouts: async () => {
+    getScheduledWorkouts: async (from, to) => {
         try {
-            const response = await axios.get(`${API_URL}/workouts/scheduled`);
+            const params = {};
+            if (from) params.from = from.toISOString();
+            if (to) params.to = to.toISOString();
+            const response = await axios.get(`${API_URL}/workouts/scheduled`, { params });
             return response.data;
         } catch (error) {
             console.error('Error fetching scheduled workouts:', error);